@@ -1,55 +1,145 @@
-from typing import Optional, Protocol
-from collections import defaultdict
+from typing import Iterable, Optional, Protocol
 from ..domain.entities.location import Location
 from ..domain.entities.direction import Direction
 from .interfaces.map_repository import MapRepository
 from .usecases.location_management import LocationManagement, LocationRepository
-from .usecases.resource_management import ResourceManagement, ResourceRepository
+from .usecases.resource_management import ResourceManagement, ResourceRepository, RoutePlan
+from .usecases.resource_query import ResourceQuery, QueryPlan
 from .usecases.map_management import MapManagement, LocationProvider
+from .pathfinding.location_graph import LocationGraph
+from .pathfinding.strategy import PathStrategy
+from .pathfinding.distance_matrix import DistanceMatrix
+from .indexes.resource_bitmaps import ResourceBitmaps, members
+from .indexes.trigram_index import TrigramIndex
+from .indexes.prefix_index import PrefixIndex
+
+LANDMARKS_SUFFIX = "landmarks"
+MATRIX_SUFFIX = "matrix"
 
 class GameMapService(LocationRepository, ResourceRepository, LocationProvider):
     """Service that coordinates all map-related operations."""
 
     def __init__(self, map_repository: MapRepository):
         self.locations: dict[str, Location] = {}
-        self.resource_locations: dict[str, list[str]] = defaultdict(list)
+        self.resource_locations: dict[str, set[str]] = {}
+        self._indexed_resources: dict[str, list[str]] = {}
+        self.resource_bitmaps = ResourceBitmaps()
+        self.location_names = TrigramIndex()
+        self.resource_names = TrigramIndex()
+        self.location_prefixes = PrefixIndex()
+        self.resource_prefixes = PrefixIndex()
         self.current_location: Optional[str] = None
+        self.graph = LocationGraph()
+        self.map_version = 0
+        self.distance_matrix_mode = False
+        self.distance_matrix_workers: Optional[int] = None
         
         # Initialize use cases
         self.location_management = LocationManagement(self)
-        self.resource_management = ResourceManagement(self)
+        self.resource_management = ResourceManagement(self, self.graph)
         self.map_management = MapManagement(map_repository, self)
 
     # LocationRepository implementation
     def add_location(self, location: Location) -> None:
+        self.map_version += 1
         self.locations[location.name] = location
-        for resource in location.resources:
-            self.resource_locations[resource].append(location.name)
+        self.graph.add_location(location)
+        self.location_names.add(location.name)
+        self.location_prefixes.add(location.name)
+        self._index_resources(location)
 
     def get_location(self, name: str) -> Optional[Location]:
         return self.locations.get(name)
 
     def update_location(self, location: Location) -> None:
+        self.map_version += 1
         self.locations[location.name] = location
+        self.graph.update_location(location)
+        self._index_resources(location)
 
     def list_locations(self) -> dict[str, Location]:
         return self.locations
 
+    def get_resource_locations(self, resource: str) -> list[str]:
+        names = [name for name in self.resource_locations.get(resource, ()) if name in self.graph]
+        return sorted(names, key=lambda name: self.graph.id_of(name) or 0)
+
+    def count_resource_locations(self, resource: str) -> int:
+        return len(self.resource_locations.get(resource, ()))
+
+    def list_resources(self) -> dict[str, list[str]]:
+        return {resource: self.get_resource_locations(resource) for resource in sorted(self.resource_locations)}
+
+    def match_resources(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> list[str]:
+        bits = self.resource_bitmaps.match(len(self.graph), all_of, any_of, none_of)
+        names = self.graph.names
+        return [names[node] for node in members(bits)]
+
+    def _index_resources(self, location: Location) -> None:
+        """Bring the resource index up to date with a location's resources.
+
+        Locations are edited in place, so the resources last indexed for
+        each one are kept to tell what was added or removed.
+        """
+        previous = self._indexed_resources.get(location.name, [])
+        current = list(location.resources)
+        node = self.graph.id_of(location.name)
+        for resource in previous:
+            if resource not in current:
+                holders = self.resource_locations[resource]
+                holders.discard(location.name)
+                if not holders:
+                    del self.resource_locations[resource]
+                    self.resource_names.discard(resource)
+                    self.resource_prefixes.discard(resource)
+                if node is not None:
+                    self.resource_bitmaps.discard(resource, node)
+        for resource in current:
+            if resource not in previous:
+                self.resource_locations.setdefault(resource, set()).add(location.name)
+                self.resource_names.add(resource)
+                self.resource_prefixes.add(resource)
+                if node is not None:
+                    self.resource_bitmaps.add(resource, node)
+        self._indexed_resources[location.name] = current
+
+    def get_map_version(self) -> int:
+        """Get a counter that changes whenever locations, connections or resources change.
+
+        Every mutation (create, add_connection, add_resource, clear and
+        load) goes through add_location, update_location or clear_locations.
+        """
+        return self.map_version
+
     # LocationProvider implementation
     def get_current_location(self) -> Optional[str]:
         return self.current_location
 
     def set_current_location(self, location_name: Optional[str]) -> None:
         self.current_location = location_name
+        self.resource_management.set_tree_root(location_name)
 
     def clear_locations(self) -> None:
+        self.map_version += 1
         self.locations.clear()
         self.resource_locations.clear()
-        self.current_location = None
+        self._indexed_resources.clear()
+        self.resource_bitmaps.clear()
+        self.location_names.clear()
+        self.resource_names.clear()
+        self.location_prefixes.clear()
+        self.resource_prefixes.clear()
+        self.graph.clear()
+        self.set_current_location(None)
 
-    def add_connection(self, from_loc: str, to_loc: str, direction: str) -> None:
+    def add_connection(self, from_loc: str, to_loc: str, direction: str, cost: int = 1) -> None:
         direction_enum = Direction(direction.lower())
-        self.location_management.add_connection(from_loc, to_loc, direction_enum)
+        self.location_management.add_connection(from_loc, to_loc, direction_enum, cost)
 
     # High-level operations
     def create_location(self, name: str, resources: Optional[list[str]] = None) -> None:
@@ -60,11 +150,89 @@ class GameMapService(LocationRepository, ResourceRepository, LocationProvider):
         """Add a resource to an existing location."""
         self.resource_management.add_resource(location_name, resource)
 
-    def find_path_to_resource(self, resource: str) -> Optional[tuple[str, list[Direction]]]:
+    def find_path_to_resource(
+        self,
+        resource: str,
+        avoid_locations: Iterable[str] = (),
+        avoid_edges: Iterable[tuple[str, str]] = ()
+    ) -> Optional[tuple[str, list[Direction]]]:
         """Find the nearest location with a specific resource from current location."""
         if not self.current_location:
             raise ValueError("No current location set")
-        return self.resource_management.find_nearest_resource(resource, self.current_location)
+        return self.resource_management.find_nearest_resource(
+            resource, self.current_location, avoid_locations, avoid_edges
+        )
+
+    def set_path_strategy(self, strategy: str) -> None:
+        """Select the search algorithm used for point-to-point paths."""
+        try:
+            self.resource_management.path_strategy = PathStrategy(strategy.lower())
+        except ValueError:
+            options = ", ".join(s.value for s in PathStrategy)
+            raise ValueError(f"Unknown path strategy {strategy}. Choose one of: {options}")
+
+    def path_cache_stats(self) -> dict[str, int]:
+        """Get the path cache counters."""
+        return self.resource_management.cache_stats()
+
+    def distance_field_stats(self) -> dict[str, int]:
+        """Get the distance field counters."""
+        return self.resource_management.distance_field_stats()
+
+    def find_paths_to_resource(self, resource: str, k: int) -> list[tuple[str, int, list[Direction]]]:
+        """Find the k nearest locations with a resource from current location."""
+        if not self.current_location:
+            raise ValueError("No current location set")
+        return self.resource_management.find_k_nearest_resource(resource, self.current_location, k)
+
+    def find_locations_within(self, max_steps: int) -> list[tuple[int, list[str], list[str]]]:
+        """List locations within max_steps of the current location, grouped by distance."""
+        if not self.current_location:
+            raise ValueError("No current location set")
+        return self.resource_management.locations_within(self.current_location, max_steps)
+
+    def suggest_locations(self, name: str, n: int = 3) -> list[str]:
+        """Get up to n location names close to a misspelled one, best first."""
+        return self.location_names.search(name, n)
+
+    def suggest_resources(self, name: str, n: int = 3) -> list[str]:
+        """Get up to n resource names close to a misspelled one, best first."""
+        return self.resource_names.search(name, n)
+
+    def complete_locations(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """Get the location names starting with prefix, ignoring case, in sorted order."""
+        return self.location_prefixes.complete(prefix, limit)
+
+    def complete_resources(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """Get the resource names starting with prefix, ignoring case, in sorted order."""
+        return self.resource_prefixes.complete(prefix, limit)
+
+    def plan_query(self, query: ResourceQuery) -> QueryPlan:
+        """Plan a resource query, measuring distances from the current location by default."""
+        return self.resource_management.plan_query(query, self.current_location)
+
+    def plan_expedition(self, resources: list[str], return_to_start: bool = False) -> RoutePlan:
+        """Plan a short route from the current location that collects every resource."""
+        if not self.current_location:
+            raise ValueError("No current location set")
+        return self.resource_management.plan_route(self.current_location, resources, return_to_start)
+
+    def plan_forage(self, budget: int, weights: Optional[dict[str, float]] = None) -> RoutePlan:
+        """Plan a round trip from the current location that collects the most within budget steps."""
+        if not self.current_location:
+            raise ValueError("No current location set")
+        return self.resource_management.plan_forage(self.current_location, budget, weights)
+
+    def find_paths_to_locations(self, targets: list[str]) -> dict[str, Optional[list[Direction]]]:
+        """Find paths from the current location to many destinations at once."""
+        if not self.current_location:
+            raise ValueError("No current location set")
+        return self.resource_management.find_paths(self.current_location, targets)
+
+    def get_components(self) -> list[list[str]]:
+        """Get the names in each connected region of the map, largest first."""
+        names = self.graph.names
+        return [[names[node] for node in group] for group in self.graph.component_index().groups()]
 
     def get_location_info(self, location_name: str) -> dict:
         """Get detailed information about a location."""
@@ -75,17 +243,78 @@ class GameMapService(LocationRepository, ResourceRepository, LocationProvider):
         return {
             "name": location.name,
             "resources": location.resources,
-            "connections": {d.value: loc for d, loc in location.connections.items()}
+            "connections": {d.value: loc for d, loc in location.connections.items()},
+            "costs": {d.value: cost for d, cost in location.connection_costs.items()}
         }
 
     # Map management operations
     def save_map_to_file(self, filename: str) -> None:
-        """Save the current map state to a file."""
+        """Save the current map state to a file.
+
+        With the landmark strategy selected, the landmark distances are saved
+        next to it for later sessions, and likewise the distance matrix in
+        distance matrix mode.
+        """
         self.map_management.save_map(filename)
+        if self.resource_management.path_strategy is PathStrategy.LANDMARKS:
+            table = self.resource_management.landmark_table()
+            self.map_management.save_sidecar(filename, LANDMARKS_SUFFIX, table.to_bytes())
+        if self.distance_matrix_mode:
+            self._save_distance_matrix(filename)
 
     def load_map_from_file(self, filename: str) -> None:
-        """Load a map state from a file."""
+        """Load a map state from a file.
+
+        With the landmark strategy selected, landmark distances saved next to
+        the map are reused if they match it; otherwise they are computed now
+        and saved for the next session. Distance matrix mode does the same
+        with the matrix, which is memory-mapped from its file.
+        """
         self.map_management.load_map(filename)
+        if self.resource_management.path_strategy is PathStrategy.LANDMARKS:
+            data = self.map_management.load_sidecar(filename, LANDMARKS_SUFFIX)
+            if not self.resource_management.restore_landmarks(data):
+                table = self.resource_management.landmark_table()
+                self.map_management.save_sidecar(filename, LANDMARKS_SUFFIX, table.to_bytes())
+        if self.distance_matrix_mode:
+            path = self.map_management.sidecar_path(filename, MATRIX_SUFFIX)
+            matrix = DistanceMatrix.open(self.graph, path) if path else None
+            if matrix is not None:
+                self.resource_management.use_distance_matrix(matrix)
+            else:
+                try:
+                    self._save_distance_matrix(filename)
+                except ValueError:
+                    # Too large or weighted: keep answering with graph searches
+                    self.resource_management.use_distance_matrix(None)
+
+    def enable_distance_matrix(self, workers: Optional[int] = None) -> None:
+        """Answer path and nearest queries from a precomputed all-pairs matrix.
+
+        The matrix is computed now and saved next to the map on every save
+        and load. After an edit, queries use graph searches again until it is
+        recomputed by calling this again or by saving or loading the map.
+        Raises ValueError for maps with travel costs or too many locations.
+        """
+        self.distance_matrix_mode = True
+        self.distance_matrix_workers = workers
+        self.resource_management.use_distance_matrix(DistanceMatrix.build(self.graph, workers))
+
+    def disable_distance_matrix(self) -> None:
+        """Stop using the all-pairs distance matrix."""
+        self.distance_matrix_mode = False
+        self.resource_management.use_distance_matrix(None)
+
+    def _save_distance_matrix(self, filename: str) -> None:
+        """Write an up-to-date distance matrix next to a map file and map it back in."""
+        matrix = self.resource_management.distance_matrix()
+        if matrix is None:
+            matrix = DistanceMatrix.build(self.graph, self.distance_matrix_workers)
+        path = self.map_management.sidecar_path(filename, MATRIX_SUFFIX)
+        if path:
+            matrix.save(path)
+            matrix = DistanceMatrix.open(self.graph, path) or matrix
+        self.resource_management.use_distance_matrix(matrix)
 
     def get_available_maps(self) -> list[tuple[str, float, str]]:
         """List all available map files."""
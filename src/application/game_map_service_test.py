@@ -1,9 +1,12 @@
 import pytest
 from typing import Optional
 from .game_map_service import GameMapService
+from .usecases.resource_management import ResourceRepository
+from .usecases.resource_query import parse_query, INDEX
 from ..domain.entities.location import Location
 from ..domain.entities.direction import Direction
 from .interfaces.map_repository import MapRepository
+from ..infrastructure.persistence.json_map_repository import JsonMapRepository
 
 class MockMapRepository(MapRepository):
     def save_map(self, filename: str, locations: dict[str, Location]) -> None:
@@ -66,6 +69,27 @@ class TestGameMapService:
         assert location == "Beach"
         assert path == [Direction.SOUTH]
 
+    def test_find_path_to_resource_avoiding(self, populated_service: GameMapService) -> None:
+        """Test that avoid-lists reroute and bypass the cached tree."""
+        populated_service.create_location("Cove", ["sand"])
+        populated_service.create_location("Dune", [])
+        populated_service.add_connection("Forest", "Dune", "east")
+        populated_service.add_connection("Dune", "Cove", "south")
+
+        assert populated_service.find_path_to_resource("sand") == ("Beach", [Direction.SOUTH])
+        assert populated_service.find_path_to_resource("sand", avoid_locations=["Beach"]) == (
+            "Cove", [Direction.EAST, Direction.SOUTH]
+        )
+        assert populated_service.find_path_to_resource(
+            "sand", avoid_locations=["Beach"], avoid_edges=[("Dune", "Forest")]
+        ) is None
+        assert populated_service.find_path_to_resource("sand") == ("Beach", [Direction.SOUTH])
+
+    def test_find_path_avoiding_unknown_location(self, populated_service: GameMapService) -> None:
+        """Test that avoiding an unknown location is an error."""
+        with pytest.raises(ValueError, match="Location Cave does not exist"):
+            populated_service.resource_management.find_path("Forest", "Beach", avoid_locations=["Cave"])
+
     def test_get_location_info(self, populated_service: GameMapService) -> None:
         """Test getting detailed location information."""
         info = populated_service.get_location_info("Forest")
@@ -98,6 +122,81 @@ class TestGameMapService:
         populated_service.set_current_location(None)
         assert populated_service.get_current_location() is None
 
+    def test_resource_index(self, tmp_path) -> None:
+        """Test that the resource index matches a scan after every kind of edit."""
+        service = GameMapService(JsonMapRepository())
+
+        def assert_index_matches() -> None:
+            assert service.list_resources() == ResourceRepository.list_resources(service)
+            for resource in ["wood", "sand", "gold"]:
+                assert service.get_resource_locations(resource) == (
+                    ResourceRepository.get_resource_locations(service, resource)
+                )
+            for query in [(["wood"], [], []), ([], ["sand", "gold"], ["wood"]), (["sand", "wood"], [], [])]:
+                assert service.match_resources(*query) == ResourceRepository.match_resources(service, *query)
+
+        service.create_location("Forest", ["wood"])
+        service.create_location("Beach", ["sand", "wood"])
+        service.add_connection("Forest", "Beach", "south")
+        service.add_resource_to_location("Forest", "sand")
+        assert_index_matches()
+        assert service.resource_management.find_resource("wood") == ["Forest", "Beach"]
+        assert service.list_resources() == {"sand": ["Forest", "Beach"], "wood": ["Forest", "Beach"]}
+        assert service.resource_management.find_locations_matching(["sand"], none_of=["gold"]) == ["Forest", "Beach"]
+
+        filename = str(tmp_path / "world.json")
+        service.save_map_to_file(filename)
+        service.clear_locations()
+        assert service.list_resources() == {}
+        service.load_map_from_file(filename)
+        assert_index_matches()
+        assert service.resource_management.find_resource("gold") == []
+
+    def test_resource_query(self, populated_service: GameMapService) -> None:
+        """Test that queries measure from the current location and follow edits."""
+        plan = populated_service.plan_query(parse_query("water or wood within 3"))
+        assert plan.origin == "Forest"
+        # The current location's tree makes every match cheap to measure
+        assert plan.strategy == INDEX
+        assert list(populated_service.resource_management.run_query(plan)) == [("Forest", 0), ("Beach", 1)]
+
+        populated_service.create_location("Cave", ["water"])
+        populated_service.add_connection("Beach", "Cave", "east")
+        plan = populated_service.plan_query(parse_query("water and not sand within 5 of Beach"))
+        assert list(populated_service.resource_management.run_query(plan)) == [("Cave", 1)]
+
+    def test_name_suggestions(self, populated_service: GameMapService) -> None:
+        """Test that fuzzy name lookups follow added, removed and cleared names."""
+        assert populated_service.suggest_locations("forst") == ["Forest"]
+        assert populated_service.suggest_resources("watr") == ["water"]
+
+        beach = populated_service.get_location("Beach")
+        assert beach is not None
+        beach.resources.remove("water")
+        populated_service.update_location(beach)
+        populated_service.create_location("Bay", ["waterlily"])
+        assert "water" not in populated_service.suggest_resources("watr", n=5)
+        assert populated_service.suggest_resources("waterlilly") == ["waterlily"]
+        assert populated_service.suggest_locations("bayy") == ["Bay"]
+
+        populated_service.clear_locations()
+        assert populated_service.suggest_locations("forst") == []
+
+    def test_name_completion(self, populated_service: GameMapService) -> None:
+        """Test that prefix completion follows added, removed and cleared names."""
+        populated_service.create_location("Bay", ["wood"])
+        assert populated_service.complete_locations("b") == ["Bay", "Beach"]
+        assert populated_service.complete_resources("w") == ["water", "wood"]
+
+        beach = populated_service.get_location("Beach")
+        assert beach is not None
+        beach.resources.remove("water")
+        populated_service.update_location(beach)
+        assert populated_service.complete_resources("w", limit=5) == ["wood"]
+
+        populated_service.clear_locations()
+        assert populated_service.complete_locations("") == []
+
     def test_resource_tracking(self, populated_service: GameMapService) -> None:
         """Test resource tracking across locations."""
         result = populated_service.find_path_to_resource("water")
@@ -112,3 +211,318 @@ class TestGameMapService:
         location, path = result
         assert location == "Forest"  # Should find the closest location
         assert len(path) == 0
+
+    def test_graph_tracks_locations(self, populated_service: GameMapService) -> None:
+        """Test that the location graph follows location and connection changes."""
+        populated_service.create_location("Mountain", ["stone"])
+        populated_service.add_connection("Beach", "Mountain", "east")
+        graph = populated_service.graph
+        assert graph.names == ["Forest", "Beach", "Mountain"]
+        assert list(graph.neighbors(2)) == [(Direction.WEST, 1)]
+
+        populated_service.clear_locations()
+        assert len(populated_service.graph) == 0
+
+    def test_paths_from_current_location_reuse_tree(self, populated_service: GameMapService) -> None:
+        """Test that paths from the current location are answered from one tree."""
+        resources = populated_service.resource_management
+        tree = resources._tree
+        assert tree is not None
+
+        assert resources.find_path("Forest", "Beach") == [Direction.SOUTH]
+        assert populated_service.find_path_to_resource("sand") == ("Beach", [Direction.SOUTH])
+        assert resources._tree is tree
+
+        populated_service.create_location("Cave", ["gems"])
+        populated_service.add_connection("Beach", "Cave", "east")
+        assert resources.find_path("Forest", "Cave") == [Direction.SOUTH, Direction.EAST]
+        assert resources._tree is not tree
+
+    def test_tree_repaired_after_new_connections(self, game_service: GameMapService) -> None:
+        """Test that adding connections patches the current location's tree."""
+        names = [f"Room{i}" for i in range(8)]
+        for name in names:
+            game_service.create_location(name)
+        for a, b in zip(names, names[1:]):
+            game_service.add_connection(a, b, "east")
+        game_service.set_current_location("Room0")
+        resources = game_service.resource_management
+        tree = resources._tree
+
+        game_service.create_location("Cellar", ["wine"])
+        game_service.add_connection("Room1", "Cellar", "south")
+        assert game_service.find_path_to_resource("wine") == ("Cellar", [Direction.EAST, Direction.SOUTH])
+        assert resources._tree is tree
+
+    def test_set_current_location_moves_tree(self, populated_service: GameMapService) -> None:
+        """Test that changing location re-roots the shortest-path tree."""
+        populated_service.set_current_location("Beach")
+        tree = populated_service.resource_management._tree
+        assert tree is not None
+        assert tree.root == populated_service.graph.id_of("Beach")
+
+        populated_service.set_current_location(None)
+        assert populated_service.resource_management._tree is None
+
+    def test_path_cache_invalidated_by_edits(self, populated_service: GameMapService) -> None:
+        """Test that cached routes are dropped when the map changes."""
+        resources = populated_service.resource_management
+        assert resources.find_path("Beach", "Forest") == [Direction.NORTH]
+        assert resources.find_path("Beach", "Forest") == [Direction.NORTH]
+        assert populated_service.path_cache_stats()["hits"] == 1
+
+        version = populated_service.get_map_version()
+        populated_service.add_resource_to_location("Beach", "wood")
+        assert populated_service.get_map_version() > version
+        assert resources.find_nearest_resource("wood", "Forest") == ("Forest", [])
+        assert resources.find_nearest_resource("wood", "Beach") == ("Beach", [])
+
+        populated_service.create_location("Cave")
+        assert resources.find_path("Beach", "Cave") is None
+        populated_service.add_connection("Beach", "Cave", "east")
+        assert resources.find_path("Beach", "Cave") == [Direction.EAST]
+
+    def test_distance_fields_follow_edits(self, populated_service: GameMapService) -> None:
+        """Test that repeated nearest queries build a resource's field and reuse it after edits."""
+        resources = populated_service.resource_management
+        populated_service.create_location("Mountain")
+        populated_service.add_connection("Beach", "Mountain", "east")
+        populated_service.create_location("Dune", ["sand"])
+        populated_service.add_connection("Mountain", "Dune", "east")
+
+        # The current location is answered from its tree
+        assert resources.find_nearest_resource("sand", "Forest") == ("Beach", [Direction.SOUTH])
+        assert resources.find_nearest_resource("sand", "Mountain") == ("Beach", [Direction.WEST])
+        assert resources.find_nearest_resource("sand", "Dune") == ("Dune", [])
+        assert populated_service.distance_field_stats()["builds"] == 0
+        assert resources.find_nearest_resource("sand", "Beach") == ("Beach", [])
+        assert populated_service.distance_field_stats()["builds"] == 1
+
+        populated_service.add_resource_to_location("Mountain", "sand")
+        assert resources.find_nearest_resource("sand", "Mountain") == ("Mountain", [])
+        populated_service.create_location("Cave")
+        populated_service.add_connection("Dune", "Cave", "east")
+        assert resources.find_nearest_resource("sand", "Cave") == ("Dune", [Direction.WEST])
+        stats = populated_service.distance_field_stats()
+        assert stats["builds"] == 1
+        assert stats["updates"] == 2
+
+        assert resources.find_nearest_resource("sand", "Cave", avoid_locations=["Dune"]) is None
+        assert populated_service.distance_field_stats()["builds"] == 1
+
+    def test_locations_within(self, populated_service: GameMapService) -> None:
+        """Test radius queries from the current location, counting travel costs."""
+        populated_service.create_location("Mountain", ["stone"])
+        populated_service.create_location("Cave", ["iron", "stone"])
+        populated_service.add_connection("Beach", "Mountain", "east")
+        populated_service.add_connection("Forest", "Cave", "west", 2)
+        assert populated_service.find_locations_within(2) == [
+            (0, ["Forest"], ["berries", "wood"]),
+            (1, ["Beach"], ["sand", "water"]),
+            (2, ["Cave", "Mountain"], ["iron", "stone"])
+        ]
+
+        populated_service.set_current_location(None)
+        assert populated_service.resource_management.locations_within("Beach", 1) == [
+            (0, ["Beach"], ["sand", "water"]),
+            (1, ["Forest", "Mountain"], ["berries", "stone", "wood"])
+        ]
+        with pytest.raises(ValueError):
+            populated_service.find_locations_within(1)
+
+    def test_iter_by_distance(self, populated_service: GameMapService) -> None:
+        """Test streaming from the tracked tree and from a fresh search with travel costs."""
+        populated_service.create_location("Cave")
+        populated_service.create_location("Mountain")
+        populated_service.add_connection("Forest", "Cave", "west", 3)
+        populated_service.add_connection("Beach", "Mountain", "east")
+        resources = populated_service.resource_management
+        expected = [
+            ("Forest", 0, []),
+            ("Beach", 1, [Direction.SOUTH]),
+            ("Mountain", 2, [Direction.SOUTH, Direction.EAST]),
+            ("Cave", 3, [Direction.WEST])
+        ]
+        assert list(resources.iter_by_distance("Forest")) == expected
+
+        populated_service.set_current_location(None)
+        assert list(resources.iter_by_distance("Forest")) == expected
+        nearby = resources.iter_by_distance("Mountain")
+        assert [next(nearby) for _ in range(2)] == [("Mountain", 0, []), ("Beach", 1, [Direction.WEST])]
+
+    def test_plan_expedition(self, populated_service: GameMapService) -> None:
+        """Test planning a route that collects several resources and returns."""
+        populated_service.create_location("Mountain", ["stone"])
+        populated_service.create_location("Cave", ["stone"])
+        populated_service.add_connection("Beach", "Mountain", "east")
+        populated_service.add_connection("Forest", "Cave", "west", 3)
+        plan = populated_service.plan_expedition(["wood", "sand", "stone"])
+        assert plan.legs == [
+            ("Forest", ["wood"], []),
+            ("Beach", ["sand"], [Direction.SOUTH]),
+            ("Mountain", ["stone"], [Direction.EAST])
+        ]
+        assert plan.cost == 2 and plan.exact
+
+        plan = populated_service.plan_expedition(["stone"], return_to_start=True)
+        assert plan.legs == [
+            ("Mountain", ["stone"], [Direction.SOUTH, Direction.EAST]),
+            ("Forest", [], [Direction.WEST, Direction.NORTH])
+        ]
+        assert plan.cost == 4
+
+        with pytest.raises(ValueError, match="No reachable location has gold"):
+            populated_service.plan_expedition(["wood", "gold"])
+        with pytest.raises(ValueError):
+            populated_service.plan_expedition([])
+
+    def test_plan_forage(self, populated_service: GameMapService) -> None:
+        """Test planning a round trip that collects the most within a step budget."""
+        populated_service.create_location("Mountain", ["stone", "iron"])
+        populated_service.add_connection("Beach", "Mountain", "east")
+        plan = populated_service.plan_forage(2)
+        assert plan.legs == [
+            ("Forest", ["berries", "wood"], []),
+            ("Beach", ["sand", "water"], [Direction.SOUTH]),
+            ("Forest", [], [Direction.NORTH])
+        ]
+        assert plan.cost == 2 and plan.exact
+
+        plan = populated_service.plan_forage(4, {"iron": 3, "wood": 1})
+        assert [location for location, _, _ in plan.legs] == ["Forest", "Mountain", "Forest"]
+        assert plan.legs[1][1] == ["iron"]
+        assert plan.cost == 4
+
+        assert populated_service.plan_forage(0).legs == [("Forest", ["berries", "wood"], [])]
+        with pytest.raises(ValueError):
+            populated_service.plan_forage(-1)
+        with pytest.raises(ValueError):
+            populated_service.plan_forage(3, {"iron": -1})
+
+    def test_set_path_strategy(self, populated_service: GameMapService) -> None:
+        """Test switching to bidirectional search."""
+        populated_service.set_path_strategy("bidirectional")
+        resources = populated_service.resource_management
+        assert resources.find_path("Beach", "Forest") == [Direction.NORTH]
+
+        with pytest.raises(ValueError):
+            populated_service.set_path_strategy("teleport")
+
+    def test_astar_strategy_falls_back_on_conflicts(self, populated_service: GameMapService) -> None:
+        """Test A* paths and the fallback when the grid layout contradicts itself."""
+        populated_service.set_path_strategy("astar")
+        populated_service.create_location("Cave")
+        populated_service.add_connection("Beach", "Cave", "east")
+        resources = populated_service.resource_management
+        assert resources.find_path("Forest", "Cave") == [Direction.SOUTH, Direction.EAST]
+        assert resources.grid_embedding().conflicts == []
+
+        populated_service.add_connection("Cave", "Forest", "east")
+        assert resources.grid_embedding().conflicts
+        assert resources.find_path("Beach", "Forest") == [Direction.NORTH]
+
+    def test_hierarchical_strategy(self, populated_service: GameMapService) -> None:
+        """Test hierarchical paths and their upkeep across edits."""
+        populated_service.set_path_strategy("hierarchical")
+        populated_service.create_location("Cave")
+        populated_service.add_connection("Beach", "Cave", "east")
+        resources = populated_service.resource_management
+        assert resources.find_path("Cave", "Forest") == [Direction.WEST, Direction.NORTH]
+
+        populated_service.add_connection("Cave", "Forest", "north", 3)
+        assert resources.find_path("Cave", "Forest") == [Direction.WEST, Direction.NORTH]
+        assert resources.region_hierarchy().graph is populated_service.graph
+
+    def test_landmark_strategy(self, populated_service: GameMapService) -> None:
+        """Test ALT paths and recomputing landmarks after edits."""
+        populated_service.set_path_strategy("alt")
+        resources = populated_service.resource_management
+        resources.landmark_count = 1
+        assert resources.find_path("Beach", "Forest") == [Direction.NORTH]
+        table = resources.landmark_table()
+        assert len(table.landmarks) == 1
+
+        populated_service.create_location("Cave")
+        populated_service.add_connection("Beach", "Cave", "east", 2)
+        assert resources.find_path("Cave", "Forest") == [Direction.WEST, Direction.NORTH]
+        assert resources.landmark_table() is not table
+
+    def test_landmarks_saved_next_to_map(self, populated_service: GameMapService, tmp_path) -> None:
+        """Test that landmark distances are saved with the map and reused on load."""
+        filename = str(tmp_path / "world.json")
+        service = GameMapService(JsonMapRepository())
+        service.set_path_strategy("alt")
+        for name, location in populated_service.list_locations().items():
+            service.create_location(name, location.resources)
+        service.add_connection("Forest", "Beach", "south")
+        service.save_map_to_file(filename)
+        assert (tmp_path / "world.landmarks").exists()
+
+        reloaded = GameMapService(JsonMapRepository())
+        reloaded.set_path_strategy("alt")
+        data = (tmp_path / "world.landmarks").read_bytes()
+        reloaded.load_map_from_file(filename)
+        assert reloaded.resource_management.restore_landmarks(data)
+        assert reloaded.resource_management.find_path("Forest", "Beach") == [Direction.SOUTH]
+
+        # A stale sidecar is replaced by one computed for the loaded map
+        (tmp_path / "world.landmarks").write_bytes(b"{}\n")
+        reloaded.load_map_from_file(filename)
+        assert (tmp_path / "world.landmarks").read_bytes() == data
+
+    def test_distance_matrix_mode(self, populated_service: GameMapService, tmp_path) -> None:
+        """Test answering from the all-pairs matrix and falling back after edits."""
+        service = GameMapService(JsonMapRepository())
+        for name, location in populated_service.list_locations().items():
+            service.create_location(name, location.resources)
+        service.add_connection("Forest", "Beach", "south")
+        service.enable_distance_matrix(workers=1)
+        resources = service.resource_management
+        matrix = resources.distance_matrix()
+        assert matrix is not None
+        assert resources.find_path("Beach", "Forest") == [Direction.NORTH]
+        assert resources.find_nearest_resource("sand", "Forest") == ("Beach", [Direction.SOUTH])
+
+        service.create_location("Cave")
+        assert resources.distance_matrix() is None
+        service.add_connection("Beach", "Cave", "east")
+        assert resources.find_path("Forest", "Cave") == [Direction.SOUTH, Direction.EAST]
+
+        filename = str(tmp_path / "world.json")
+        service.save_map_to_file(filename)
+        assert (tmp_path / "world.matrix").exists()
+        saved = resources.distance_matrix()
+        assert saved is not None and isinstance(saved.values, memoryview)
+
+        reloaded = GameMapService(JsonMapRepository())
+        reloaded.enable_distance_matrix(workers=1)
+        reloaded.load_map_from_file(filename)
+        loaded = reloaded.resource_management.distance_matrix()
+        assert loaded is not None and isinstance(loaded.values, memoryview)
+        assert reloaded.resource_management.find_path("Cave", "Forest") == [Direction.WEST, Direction.NORTH]
+
+    def test_components(self, populated_service: GameMapService) -> None:
+        """Test listing connected regions and answering unreachable paths from them."""
+        populated_service.create_location("Island", ["gold"])
+        assert populated_service.get_components() == [["Forest", "Beach"], ["Island"]]
+        assert populated_service.resource_management.find_path("Forest", "Island") is None
+        assert populated_service.find_path_to_resource("gold") is None
+
+        populated_service.add_connection("Beach", "Island", "east")
+        assert populated_service.get_components() == [["Forest", "Beach", "Island"]]
+        assert populated_service.find_path_to_resource("gold") == ("Island", [Direction.SOUTH, Direction.EAST])
+
+    def test_weighted_connections(self, populated_service: GameMapService) -> None:
+        """Test that travel costs steer paths and the tree from the current location."""
+        service = populated_service
+        service.create_location("River", ["fish"])
+        service.create_location("Hill", ["fish"])
+        service.add_connection("Forest", "River", "east", 4)
+        service.add_connection("Beach", "Hill", "east")
+        assert service.get_location_info("Forest")["costs"] == {"east": 4}
+
+        # Forest -> River costs 4, Forest -> Beach -> Hill costs 2
+        assert service.find_path_to_resource("fish") == ("Hill", [Direction.SOUTH, Direction.EAST])
+        results = service.find_paths_to_resource("fish", 2)
+        assert [name for name, _, _ in results] == ["Hill", "River"]
+        assert service.resource_management.find_path("Beach", "River") == [Direction.NORTH, Direction.EAST]
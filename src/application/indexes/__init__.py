@@ -0,0 +1,7 @@
+"""In-memory indexes kept alongside the map for fast lookups."""
+
+from .resource_bitmaps import ResourceBitmaps
+from .trigram_index import TrigramIndex
+from .prefix_index import PrefixIndex
+
+__all__ = ['ResourceBitmaps', 'TrigramIndex', 'PrefixIndex']
@@ -0,0 +1,77 @@
+from bisect import bisect_left, insort
+from typing import Iterable, Optional
+
+# Pending names inserted one by one; larger batches are merged by sorting
+INSERT_LIMIT = 32
+
+class PrefixIndex:
+    """Sorted array of names for case-insensitive prefix lookups.
+
+    Names are kept as (lowercased name, name) pairs in sorted order, so the
+    names starting with a prefix form one run found by binary search.
+    Added names wait in a buffer until the next lookup, which inserts a
+    few in place and sorts bulk loads in one go.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._keys: list[tuple[str, str]] = []
+        self._pending: list[tuple[str, str]] = []
+        self._names: set[str] = set()
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def add(self, name: str) -> None:
+        """Index a name, ignoring names already indexed."""
+        if name not in self._names:
+            self._names.add(name)
+            self._pending.append((name.lower(), name))
+
+    def discard(self, name: str) -> None:
+        """Stop returning a name from lookups."""
+        if name not in self._names:
+            return
+        self._names.discard(name)
+        key = (name.lower(), name)
+        if key in self._pending:
+            self._pending.remove(key)
+            return
+        position = bisect_left(self._keys, key)
+        del self._keys[position]
+
+    def clear(self) -> None:
+        """Forget every name."""
+        self._keys.clear()
+        self._pending.clear()
+        self._names.clear()
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """Get the names starting with prefix, ignoring case, in sorted order.
+
+        At most limit names are returned when it is given.
+        """
+        if len(self._pending) <= INSERT_LIMIT:
+            for key in self._pending:
+                insort(self._keys, key)
+        else:
+            # Sorting a sorted list with a sorted tail appended merges the two runs
+            self._pending.sort()
+            self._keys.extend(self._pending)
+            self._keys.sort()
+        self._pending.clear()
+
+        lowered = prefix.lower()
+        keys = self._keys
+        position = bisect_left(keys, (lowered, ""))
+        names: list[str] = []
+        while position < len(keys) and keys[position][0].startswith(lowered):
+            if limit is not None and len(names) == limit:
+                break
+            names.append(keys[position][1])
+            position += 1
+        return names
@@ -0,0 +1,30 @@
+from src.application.indexes.prefix_index import PrefixIndex
+
+class TestPrefixIndex:
+    """Test cases for the sorted prefix index."""
+
+    def test_complete(self) -> None:
+        """Test case-insensitive prefix lookups in sorted order with a limit."""
+        index = PrefixIndex(["Forest", "fortress", "Beach", "Forge", "forest"])
+        assert index.complete("for") == ["Forest", "forest", "Forge", "fortress"]
+        assert index.complete("FORG") == ["Forge"]
+        assert index.complete("for", limit=2) == ["Forest", "forest"]
+        assert index.complete("x") == []
+        assert index.complete("") == ["Beach", "Forest", "forest", "Forge", "fortress"]
+
+    def test_add_discard_and_clear(self) -> None:
+        """Test that lookups follow names added and discarded between them."""
+        index = PrefixIndex(["Beach"])
+        assert index.complete("b") == ["Beach"]
+        index.add("Bay")
+        index.add("Bay")
+        assert len(index) == 2
+        assert index.complete("b") == ["Bay", "Beach"]
+        index.discard("Beach")
+        index.add("Bridge")
+        index.discard("Bridge")
+        index.discard("Cave")
+        assert "Beach" not in index
+        assert index.complete("b") == ["Bay"]
+        index.clear()
+        assert index.complete("") == []
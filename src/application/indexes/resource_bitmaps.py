@@ -0,0 +1,104 @@
+from typing import Iterable, Optional
+
+class ResourceBitmaps:
+    """Per-resource bitsets over location ids for boolean resource queries.
+
+    Resource names are interned to dense ids. Each resource keeps a
+    ``bytearray`` with bit ``i`` set when location ``i`` holds it, so
+    updates are O(1). Queries turn the bitsets they need into Python ints
+    once, caching them until the resource changes, and combine them with
+    bitwise operations.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self.names: list[str] = []
+        self._bits: list[bytearray] = []
+        self._ints: list[Optional[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, resource: str) -> int:
+        """Get the id of a resource, assigning one if it is new."""
+        resource_id = self._ids.get(resource)
+        if resource_id is None:
+            resource_id = self._ids[resource] = len(self.names)
+            self.names.append(resource)
+            self._bits.append(bytearray())
+            self._ints.append(0)
+        return resource_id
+
+    def add(self, resource: str, node: int) -> None:
+        """Mark a location as holding a resource."""
+        resource_id = self.intern(resource)
+        bits = self._bits[resource_id]
+        index = node >> 3
+        if index >= len(bits):
+            bits.extend(bytes(index + 1 - len(bits)))
+        bits[index] |= 1 << (node & 7)
+        self._ints[resource_id] = None
+
+    def discard(self, resource: str, node: int) -> None:
+        """Mark a location as no longer holding a resource."""
+        resource_id = self._ids.get(resource)
+        if resource_id is None:
+            return
+        bits = self._bits[resource_id]
+        index = node >> 3
+        if index < len(bits):
+            bits[index] &= ~(1 << (node & 7)) & 0xFF
+            self._ints[resource_id] = None
+
+    def clear(self) -> None:
+        """Forget all resources."""
+        self._ids.clear()
+        self.names.clear()
+        self._bits.clear()
+        self._ints.clear()
+
+    def bitmap(self, resource: str) -> int:
+        """Get the set of locations holding a resource as an int bitset."""
+        resource_id = self._ids.get(resource)
+        if resource_id is None:
+            return 0
+        value = self._ints[resource_id]
+        if value is None:
+            value = self._ints[resource_id] = int.from_bytes(self._bits[resource_id], 'little')
+        return value
+
+    def match(
+        self,
+        size: int,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> int:
+        """Get the bitset of locations below id size that match a condition.
+
+        A location matches if it holds every resource of all_of, at least
+        one of any_of unless that is empty, and none of none_of.
+        """
+        result = (1 << size) - 1
+        for resource in all_of:
+            result &= self.bitmap(resource)
+        any_of = list(any_of)
+        if any_of:
+            either = 0
+            for resource in any_of:
+                either |= self.bitmap(resource)
+            result &= either
+        for resource in none_of:
+            result &= ~self.bitmap(resource)
+        return result
+
+def members(bits: int) -> list[int]:
+    """List the positions of the set bits of a bitset in increasing order."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    nodes = []
+    for index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            nodes.append(index * 8 + low.bit_length() - 1)
+            byte ^= low
+    return nodes
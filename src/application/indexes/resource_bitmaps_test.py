@@ -0,0 +1,49 @@
+import random
+from src.application.indexes.resource_bitmaps import ResourceBitmaps, members
+
+class TestResourceBitmaps:
+    """Test cases for the per-resource location bitsets."""
+
+    def test_add_discard_and_clear(self) -> None:
+        """Test that bitsets follow edits, including after a cached query."""
+        bitmaps = ResourceBitmaps()
+        bitmaps.add("iron", 3)
+        bitmaps.add("iron", 17)
+        bitmaps.add("water", 3)
+        assert members(bitmaps.bitmap("iron")) == [3, 17]
+        bitmaps.discard("iron", 3)
+        bitmaps.discard("gold", 3)
+        bitmaps.discard("water", 100)
+        assert members(bitmaps.bitmap("iron")) == [17]
+        assert bitmaps.bitmap("gold") == 0
+        assert bitmaps.names == ["iron", "water"]
+        bitmaps.clear()
+        assert len(bitmaps) == 0
+        assert bitmaps.bitmap("iron") == 0
+
+    def test_match(self) -> None:
+        """Test all/any/none queries against a scan of random holdings."""
+        rng = random.Random(0)
+        size = 300
+        resources = ["iron", "water", "wood", "stone"]
+        holdings = [set(rng.sample(resources, rng.randrange(len(resources) + 1))) for _ in range(size)]
+        bitmaps = ResourceBitmaps()
+        for node, held in enumerate(holdings):
+            for resource in held:
+                bitmaps.add(resource, node)
+
+        queries = [
+            (["iron"], [], []),
+            (["iron", "water"], [], ["stone"]),
+            ([], ["wood", "stone"], ["iron"]),
+            ([], [], ["water"]),
+            (["gold"], [], []),
+            ([], [], [])
+        ]
+        for all_of, any_of, none_of in queries:
+            expected = [
+                node for node, held in enumerate(holdings)
+                if set(all_of) <= held and (not any_of or set(any_of) & held) and not set(none_of) & held
+            ]
+            assert members(bitmaps.match(size, all_of, any_of, none_of)) == expected
+        assert members(bitmaps.match(10, [], [], [])) == list(range(10))
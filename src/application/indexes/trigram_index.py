@@ -0,0 +1,95 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+
+# Trigram similarity a name needs to be considered at all
+MIN_SIMILARITY = 0.2
+# Candidates per requested match that are re-ranked by edit similarity
+RERANK_FACTOR = 8
+
+def trigrams(text: str) -> set[str]:
+    """Get the trigrams of a lowercased name, padded so short names have some."""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """Inverted index from name trigrams to names, for fuzzy lookups.
+
+    Every name gets an id and each of its trigrams lists the ids holding
+    it, so a lookup only reads the posting lists of the trigrams of the
+    text looked up. Ids are never reused: a discarded name is only
+    blanked out and skipped by later lookups.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[Optional[str]] = []
+        self._sizes: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def add(self, name: str) -> None:
+        """Index a name, ignoring names already indexed."""
+        if name in self._ids:
+            return
+        name_id = self._ids[name] = len(self._names)
+        self._names.append(name)
+        grams = trigrams(name)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(name_id)
+
+    def discard(self, name: str) -> None:
+        """Stop returning a name from lookups."""
+        name_id = self._ids.pop(name, None)
+        if name_id is not None:
+            self._names[name_id] = None
+
+    def clear(self) -> None:
+        """Forget every name."""
+        self._ids.clear()
+        self._names.clear()
+        self._sizes.clear()
+        self._postings.clear()
+
+    def search(self, text: str, n: int = 3, cutoff: float = 0.6) -> list[str]:
+        """Get up to n indexed names close to text, best first.
+
+        Names are first scored by the share of trigrams they have in common
+        with text. The best ``RERANK_FACTOR * n`` of those are then ranked
+        by ``difflib`` similarity of the lowercased names, the measure
+        ``difflib.get_close_matches`` uses, and kept from cutoff upwards.
+        """
+        if n <= 0 or not text:
+            return []
+        query = trigrams(text)
+        shared: Counter[int] = Counter()
+        for gram in query:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for name_id, common in shared.items():
+            score = common / (len(query) + self._sizes[name_id] - common)
+            if score >= MIN_SIMILARITY and self._names[name_id] is not None:
+                scored.append((-score, name_id))
+        scored.sort()
+
+        lowered = text.lower()
+        matcher = SequenceMatcher()
+        matcher.set_seq2(lowered)
+        ranked = []
+        for _, name_id in scored[:RERANK_FACTOR * n]:
+            name = self._names[name_id] or ""
+            matcher.set_seq1(name.lower())
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                ranked.append((-ratio, name_id, name))
+        ranked.sort()
+        return [name for _, _, name in ranked[:n]]
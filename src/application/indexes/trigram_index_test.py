@@ -0,0 +1,42 @@
+from src.application.indexes.trigram_index import TrigramIndex, trigrams
+
+class TestTrigramIndex:
+    """Test cases for the fuzzy name index."""
+
+    def test_trigrams(self) -> None:
+        """Test that names are lowercased and padded."""
+        assert trigrams("Ab") == {"  a", " ab", "ab "}
+
+    def test_search(self) -> None:
+        """Test ranking, cutoff and case handling of fuzzy lookups."""
+        index = TrigramIndex(["Forest", "Dark Forest", "Beach", "Mountain", "Fortress"])
+        assert index.search("forst")[0] == "Forest"
+        assert index.search("FOREST", n=1) == ["Forest"]
+        assert index.search("mountan") == ["Mountain"]
+        assert index.search("xyz") == []
+        assert index.search("forst", n=0) == []
+        assert set(index.search("forest", n=5, cutoff=0.3)) >= {"Forest", "Dark Forest"}
+
+    def test_add_discard_and_clear(self) -> None:
+        """Test that lookups follow added and discarded names."""
+        index = TrigramIndex()
+        index.add("Beach")
+        index.add("Beach")
+        assert len(index) == 1
+        assert index.search("beech") == ["Beach"]
+        index.discard("Beach")
+        index.discard("Cave")
+        assert "Beach" not in index
+        assert index.search("beech") == []
+        index.add("Beach")
+        assert index.search("beech") == ["Beach"]
+        index.clear()
+        assert len(index) == 0
+        assert index.search("beech") == []
+
+    def test_many_names(self) -> None:
+        """Test that a typo finds its name among many similar ones."""
+        index = TrigramIndex(f"Location {i}" for i in range(5000))
+        index.add("Crystal Caverns")
+        assert index.search("Crystl Cavern")[0] == "Crystal Caverns"
+        assert index.search("Location 4321")[0] == "Location 4321"
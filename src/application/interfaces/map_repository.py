@@ -31,6 +31,40 @@ class MapRepository(Protocol):
         """
         ...
 
+    def save_sidecar(self, filename: str, suffix: str, data: bytes) -> None:
+        """Store data derived from a map next to its file.
+
+        Args:
+            filename: Name of the map file the data belongs to
+            suffix: Kind of data, used as the sidecar file extension
+            data: Bytes to store
+        """
+        ...
+
+    def load_sidecar(self, filename: str, suffix: str) -> Optional[bytes]:
+        """Read data stored next to a map file with save_sidecar.
+
+        Args:
+            filename: Name of the map file the data belongs to
+            suffix: Kind of data, used as the sidecar file extension
+
+        Returns:
+            The stored bytes, or None if there are none
+        """
+        ...
+
+    def sidecar_path(self, filename: str, suffix: str) -> Optional[str]:
+        """Get the file path of a sidecar, for data that is memory-mapped.
+
+        Args:
+            filename: Name of the map file the data belongs to
+            suffix: Kind of data, used as the sidecar file extension
+
+        Returns:
+            The path, or None if the repository does not store files
+        """
+        ...
+
     @abstractmethod
     def list_available_maps(self) -> list[tuple[str, float, str]]:
         """List all available map files.
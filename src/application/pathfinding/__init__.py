@@ -0,0 +1,17 @@
+"""Graph traversal engines used by the application use cases."""
+
+from .location_graph import LocationGraph
+from .breadth_first import find_path, find_paths
+from .shortest_path_tree import ShortestPathTree
+from .path_cache import PathCache
+from .strategy import PathStrategy
+from .grid_embedding import GridEmbedding
+from .avoidance import Avoidance
+from .hierarchy import RegionHierarchy
+from .landmarks import LandmarkTable
+from .distance_matrix import DistanceMatrix
+from .distance_field import DistanceField, DistanceFields
+from .tour import Tour, plan_tour
+from .forage import plan_forage
+
+__all__ = ['LocationGraph', 'ShortestPathTree', 'PathCache', 'PathStrategy', 'GridEmbedding', 'Avoidance', 'RegionHierarchy', 'LandmarkTable', 'DistanceMatrix', 'DistanceField', 'DistanceFields', 'Tour', 'find_path', 'find_paths', 'plan_tour', 'plan_forage']
@@ -0,0 +1,53 @@
+import heapq
+from array import array
+from typing import Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DEGREE, NO_NODE
+from .grid_embedding import GridEmbedding
+from .breadth_first import new_parents, walk_back
+
+def find_path(graph: LocationGraph, embedding: GridEmbedding, source: int, target: int) -> Optional[list[Direction]]:
+    """Find a shortest path with A* guided by Manhattan distance on the grid layout.
+
+    The heuristic is only admissible when the component is consistent; the
+    caller must check ``embedding.is_consistent`` first. Ties on the
+    estimate prefer the node furthest from the source, so straight runs
+    toward the target are followed without widening the search.
+    """
+    if embedding.components[source] != embedding.components[target]:
+        return None
+
+    targets = graph.targets
+    xs, ys = embedding.xs, embedding.ys
+    target_x, target_y = xs[target], ys[target]
+    steps = array('i', [NO_NODE]) * len(graph)
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    steps[source] = 0
+    parents[source] = source
+    heap = [(abs(xs[source] - target_x) + abs(ys[source] - target_y), 0, source)]
+
+    while heap:
+        _, negative_steps, node = heapq.heappop(heap)
+        if node == target:
+            return walk_back(parents, codes, source, target)
+        distance = -negative_steps
+        if distance != steps[node]:
+            continue
+
+        distance += 1
+        base = node * DEGREE
+        for code in range(DEGREE):
+            neighbor = targets[base + code]
+            if neighbor == NO_NODE:
+                continue
+            known = steps[neighbor]
+            if known != NO_NODE and known <= distance:
+                continue
+            steps[neighbor] = distance
+            parents[neighbor] = node
+            codes[neighbor] = code
+            estimate = distance + abs(xs[neighbor] - target_x) + abs(ys[neighbor] - target_y)
+            heapq.heappush(heap, (estimate, -distance, neighbor))
+
+    return None
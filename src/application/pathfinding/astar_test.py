@@ -0,0 +1,64 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.grid_embedding import GridEmbedding
+from src.application.pathfinding import astar, breadth_first
+
+def grid_locations(width: int, height: int, holes: set[tuple[int, int]]) -> dict[str, Location]:
+    """Create a rectangular grid of locations with some cells left out."""
+    locations = {
+        f"{x},{y}": Location(f"{x},{y}")
+        for y in range(height) for x in range(width) if (x, y) not in holes
+    }
+    for y in range(height):
+        for x in range(width):
+            name = f"{x},{y}"
+            if name not in locations:
+                continue
+            east, north = f"{x + 1},{y}", f"{x},{y + 1}"
+            if east in locations:
+                locations[name].add_connection(Direction.EAST, east)
+                locations[east].add_connection(Direction.WEST, name)
+            if north in locations:
+                locations[name].add_connection(Direction.NORTH, north)
+                locations[north].add_connection(Direction.SOUTH, name)
+    return locations
+
+class TestAStar:
+    """Test cases for A* search on the grid layout."""
+
+    @pytest.fixture
+    def graph(self) -> LocationGraph:
+        """Create a grid with a wall that forces a detour."""
+        wall = {(3, y) for y in range(0, 7)}
+        return LocationGraph.from_locations(grid_locations(8, 8, wall))
+
+    def node(self, graph: LocationGraph, name: str) -> int:
+        node = graph.id_of(name)
+        assert node is not None
+        return node
+
+    def test_straight_path(self, graph: LocationGraph) -> None:
+        """Test a path along a clear row."""
+        embedding = GridEmbedding(graph)
+        path = astar.find_path(graph, embedding, self.node(graph, "0,7"), self.node(graph, "7,7"))
+        assert path == [Direction.EAST] * 7
+
+    def test_detour_is_shortest(self, graph: LocationGraph) -> None:
+        """Test that paths around obstacles are as short as breadth-first ones."""
+        embedding = GridEmbedding(graph)
+        assert embedding.conflicts == []
+        for source in ["0,0", "2,3", "1,6"]:
+            for target in ["4,0", "7,7", "5,2"]:
+                start, end = self.node(graph, source), self.node(graph, target)
+                path = astar.find_path(graph, embedding, start, end)
+                expected = breadth_first.find_path(graph, start, end)
+                assert path is not None and expected is not None
+                assert len(path) == len(expected)
+
+    def test_other_component(self, graph: LocationGraph) -> None:
+        """Test that a target in another component is unreachable."""
+        graph.add_location(Location("Island"))
+        embedding = GridEmbedding(graph)
+        assert astar.find_path(graph, embedding, 0, self.node(graph, "Island")) is None
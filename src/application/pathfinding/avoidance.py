@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Iterable
+from .location_graph import LocationGraph, DEGREE
+
+@dataclass(frozen=True)
+class Avoidance:
+    """Locations and connections a search must not use.
+
+    ``nodes`` holds excluded location ids and ``slots`` the adjacency slots
+    of excluded connections, in both directions. Searches consult these
+    while traversing instead of working on a filtered copy of the map.
+    """
+    nodes: frozenset[int] = frozenset()
+    slots: frozenset[int] = frozenset()
+
+    @classmethod
+    def from_names(
+        cls,
+        graph: LocationGraph,
+        locations: Iterable[str] = (),
+        edges: Iterable[tuple[str, str]] = ()
+    ) -> 'Avoidance':
+        """Resolve location names and (from, to) connection pairs against a graph."""
+        nodes = {cls._resolve(graph, name) for name in locations}
+        slots: set[int] = set()
+        for a, b in edges:
+            node_a, node_b = cls._resolve(graph, a), cls._resolve(graph, b)
+            for node, other in ((node_a, node_b), (node_b, node_a)):
+                base = node * DEGREE
+                slots.update(base + code for code in range(DEGREE) if graph.targets[base + code] == other)
+        return cls(frozenset(nodes), frozenset(slots))
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes or self.slots)
+
+    @staticmethod
+    def _resolve(graph: LocationGraph, name: str) -> int:
+        node = graph.id_of(name)
+        if node is None:
+            raise ValueError(f"Location {name} does not exist")
+        return node
@@ -0,0 +1,43 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph, DEGREE, DIRECTION_CODES
+from src.application.pathfinding.avoidance import Avoidance
+
+class TestAvoidance:
+    """Test cases for resolving avoid-lists against a graph."""
+
+    @pytest.fixture
+    def graph(self) -> LocationGraph:
+        """Create a graph with a single reciprocal connection."""
+        camp = Location("Camp")
+        lake = Location("Lake")
+        camp.add_connection(Direction.NORTH, "Lake")
+        lake.add_connection(Direction.SOUTH, "Camp")
+        return LocationGraph.from_locations({"Camp": camp, "Lake": lake})
+
+    def test_empty(self) -> None:
+        """Test that an empty avoid-list is falsy."""
+        assert not Avoidance()
+
+    def test_locations(self, graph: LocationGraph) -> None:
+        """Test that location names resolve to node ids."""
+        avoid = Avoidance.from_names(graph, locations=["Lake"])
+        assert avoid
+        assert avoid.nodes == {graph.id_of("Lake")}
+        assert not avoid.slots
+
+    def test_edges_block_both_directions(self, graph: LocationGraph) -> None:
+        """Test that an avoided connection blocks both of its slots."""
+        avoid = Avoidance.from_names(graph, edges=[("Lake", "Camp")])
+        camp, lake = graph.id_of("Camp"), graph.id_of("Lake")
+        assert camp is not None and lake is not None
+        assert avoid.slots == {
+            camp * DEGREE + DIRECTION_CODES[Direction.NORTH],
+            lake * DEGREE + DIRECTION_CODES[Direction.SOUTH]
+        }
+
+    def test_unknown_location(self, graph: LocationGraph) -> None:
+        """Test that unknown names are rejected."""
+        with pytest.raises(ValueError, match="Location Cave does not exist"):
+            Avoidance.from_names(graph, locations=["Cave"])
@@ -0,0 +1,105 @@
+from array import array
+from typing import Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DIRECTIONS, DEGREE, NO_NODE
+from .breadth_first import new_parents
+
+def find_path(graph: LocationGraph, source: int, target: int) -> Optional[list[Direction]]:
+    """Find a shortest path by searching from both endpoints until the frontiers meet.
+
+    Each round expands one full layer of the smaller frontier. The first
+    layer that touches the other side's visited set yields a shortest path,
+    since every earlier round proved the endpoints are further apart.
+
+    The backward search finds predecessors through the return connections
+    that add_connection always creates, so callers must only use it when
+    ``graph.one_way_edges`` is zero.
+    """
+    if source == target:
+        return []
+
+    targets = graph.targets
+    forward_parents = new_parents(graph)
+    forward_codes = bytearray(len(graph))
+    backward_next = new_parents(graph)
+    backward_codes = bytearray(len(graph))
+    forward_parents[source] = source
+    backward_next[target] = target
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        meeting = NO_NODE
+        if len(forward_frontier) <= len(backward_frontier):
+            next_frontier = []
+            for node in forward_frontier:
+                base = node * DEGREE
+                for code in range(DEGREE):
+                    neighbor = targets[base + code]
+                    if neighbor == NO_NODE or forward_parents[neighbor] != NO_NODE:
+                        continue
+                    forward_parents[neighbor] = node
+                    forward_codes[neighbor] = code
+                    if backward_next[neighbor] != NO_NODE:
+                        meeting = neighbor
+                        break
+                    next_frontier.append(neighbor)
+                if meeting != NO_NODE:
+                    break
+            forward_frontier = next_frontier
+        else:
+            next_frontier = []
+            for node in backward_frontier:
+                base = node * DEGREE
+                for code in range(DEGREE):
+                    neighbor = targets[base + code]
+                    if neighbor == NO_NODE or backward_next[neighbor] != NO_NODE:
+                        continue
+                    edge_code = _edge_code(targets, neighbor, node)
+                    if edge_code is None:
+                        continue
+                    backward_next[neighbor] = node
+                    backward_codes[neighbor] = edge_code
+                    if forward_parents[neighbor] != NO_NODE:
+                        meeting = neighbor
+                        break
+                    next_frontier.append(neighbor)
+                if meeting != NO_NODE:
+                    break
+            backward_frontier = next_frontier
+
+        if meeting != NO_NODE:
+            return _join(forward_parents, forward_codes, backward_next, backward_codes, source, target, meeting)
+
+    return None
+
+def _edge_code(targets: array, node: int, neighbor: int) -> Optional[int]:
+    """Get the direction code of the edge from node to neighbor, if any."""
+    base = node * DEGREE
+    for code in range(DEGREE):
+        if targets[base + code] == neighbor:
+            return code
+    return None
+
+def _join(
+    forward_parents: array,
+    forward_codes: bytearray,
+    backward_next: array,
+    backward_codes: bytearray,
+    source: int,
+    target: int,
+    meeting: int
+) -> list[Direction]:
+    """Combine the two half-paths through the meeting node."""
+    path = []
+    node = meeting
+    while node != source:
+        path.append(DIRECTIONS[forward_codes[node]])
+        node = forward_parents[node]
+    path.reverse()
+
+    node = meeting
+    while node != target:
+        path.append(DIRECTIONS[backward_codes[node]])
+        node = backward_next[node]
+    return path
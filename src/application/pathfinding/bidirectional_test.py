@@ -0,0 +1,73 @@
+import random
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph, DIRECTION_CODES
+from src.application.pathfinding import bidirectional, breadth_first
+
+def build_graph(connections: list[tuple[str, str, Direction]], names: list[str]) -> LocationGraph:
+    """Build a graph with reciprocal connections."""
+    locations = {name: Location(name) for name in names}
+    for from_loc, to_loc, direction in connections:
+        locations[from_loc].add_connection(direction, to_loc)
+        locations[to_loc].add_connection(Direction.get_opposite(direction), from_loc)
+    return LocationGraph.from_locations(locations)
+
+def follow(graph: LocationGraph, source: int, path: list[Direction]) -> int:
+    """Walk a list of directions from a node and return where it ends."""
+    node = source
+    for direction in path:
+        node = graph.targets[node * 4 + DIRECTION_CODES[direction]]
+        assert node >= 0
+    return node
+
+class TestBidirectional:
+    """Test cases for bidirectional breadth-first search."""
+
+    @pytest.fixture
+    def line(self) -> LocationGraph:
+        """Create a straight line of five locations plus an island."""
+        names = ["A", "B", "C", "D", "E", "Island"]
+        connections = [(a, b, Direction.EAST) for a, b in zip(names[:4], names[1:5])]
+        return build_graph(connections, names)
+
+    def test_path(self, line: LocationGraph) -> None:
+        """Test finding a path across the meeting point."""
+        assert bidirectional.find_path(line, 0, 4) == [Direction.EAST] * 4
+        assert bidirectional.find_path(line, 4, 1) == [Direction.WEST] * 3
+
+    def test_same_node(self, line: LocationGraph) -> None:
+        """Test that a path to the start is empty."""
+        assert bidirectional.find_path(line, 2, 2) == []
+
+    def test_unreachable(self, line: LocationGraph) -> None:
+        """Test that disconnected endpoints return None."""
+        assert bidirectional.find_path(line, 0, 5) is None
+
+    def test_matches_breadth_first_lengths(self) -> None:
+        """Test that path lengths equal plain BFS on random grid-like maps."""
+        rng = random.Random(7)
+        names = [f"L{i}" for i in range(60)]
+        connections = []
+        used: set[tuple[str, Direction]] = set()
+        for _ in range(120):
+            a, b = rng.sample(names, 2)
+            direction = rng.choice(list(Direction))
+            opposite = Direction.get_opposite(direction)
+            if (a, direction) in used or (b, opposite) in used:
+                continue
+            used.update({(a, direction), (b, opposite)})
+            connections.append((a, b, direction))
+        graph = build_graph(connections, names)
+        assert graph.one_way_edges == 0
+
+        for source in range(0, 60, 7):
+            for target in range(60):
+                expected = breadth_first.find_path(graph, source, target)
+                path = bidirectional.find_path(graph, source, target)
+                if expected is None:
+                    assert path is None
+                else:
+                    assert path is not None
+                    assert len(path) == len(expected)
+                    assert follow(graph, source, path) == target
@@ -0,0 +1,142 @@
+from array import array
+from typing import Callable, Iterable, Iterator, Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DIRECTIONS, DEGREE, NO_NODE
+from .avoidance import Avoidance
+from .dijkstra import expand_buckets
+
+NO_AVOIDANCE = Avoidance()
+
+def new_parents(graph: LocationGraph) -> array:
+    """Allocate a parent array with every node unvisited."""
+    return array('i', [NO_NODE]) * len(graph)
+
+def expand_layers(
+    graph: LocationGraph,
+    source: int,
+    parents: array,
+    codes: bytearray,
+    avoid: Avoidance = NO_AVOIDANCE
+) -> Iterator[list[int]]:
+    """Run a layered breadth-first search, yielding one distance layer at a time.
+
+    ``parents`` and ``codes`` are filled in as nodes are discovered; the
+    source is its own parent. Layers are expanded in name order so parents
+    are assigned exactly as a (distance, name) ordered Dijkstra would.
+    The search only advances as the caller pulls layers.
+
+    Avoided locations are marked as visited up front, so they cost nothing
+    per edge; avoided connections are only checked on edges that would
+    discover a new node.
+    """
+    targets = graph.targets
+    names = graph.names
+    blocked = avoid.slots
+    for node in avoid.nodes:
+        parents[node] = node
+    parents[source] = source
+    frontier = [source]
+
+    while frontier:
+        yield frontier
+        next_frontier: list[int] = []
+        for node in frontier:
+            base = node * DEGREE
+            for code in range(DEGREE):
+                neighbor = targets[base + code]
+                if neighbor == NO_NODE or parents[neighbor] != NO_NODE:
+                    continue
+                if blocked and base + code in blocked:
+                    continue
+                parents[neighbor] = node
+                codes[neighbor] = code
+                next_frontier.append(neighbor)
+        next_frontier.sort(key=names.__getitem__)
+        frontier = next_frontier
+
+def expand_from(
+    graph: LocationGraph,
+    source: int,
+    parents: array,
+    codes: bytearray,
+    avoid: Avoidance = NO_AVOIDANCE
+) -> Iterator[list[int]]:
+    """Yield groups of equidistant nodes in increasing distance from the source.
+
+    Unit-cost maps use the breadth-first layers; once any connection has a
+    travel cost, the groups come from Dijkstra's algorithm instead. Either
+    way a node's parent link is final once its group has been yielded.
+    """
+    if graph.weighted_edges:
+        return expand_buckets(graph, source, parents, codes, avoid)
+    return expand_layers(graph, source, parents, codes, avoid)
+
+def walk_back(parents: array, codes: bytearray, source: int, target: int) -> list[Direction]:
+    """Rebuild the directions from source to target from parent links."""
+    path = []
+    node = target
+    while node != source:
+        path.append(DIRECTIONS[codes[node]])
+        node = parents[node]
+    path.reverse()
+    return path
+
+def find_path(
+    graph: LocationGraph,
+    source: int,
+    target: int,
+    avoid: Avoidance = NO_AVOIDANCE
+) -> Optional[list[Direction]]:
+    """Find a shortest path between two nodes, stopping once the target is reached."""
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    for layer in expand_from(graph, source, parents, codes, avoid):
+        if target in layer:
+            return walk_back(parents, codes, source, target)
+    return None
+
+def find_paths(graph: LocationGraph, source: int, targets: list[int]) -> dict[int, Optional[list[Direction]]]:
+    """Find shortest paths from one node to many with a single search.
+
+    The search stops as soon as every target has been reached. Targets
+    that are never reached map to None.
+    """
+    remaining = set(targets)
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    for layer in expand_from(graph, source, parents, codes):
+        remaining.difference_update(layer)
+        if not remaining:
+            break
+    return {
+        target: None if target in remaining else walk_back(parents, codes, source, target)
+        for target in targets
+    }
+
+def first_matches(layers: Iterable[list[int]], predicate: Callable[[int], bool], limit: int) -> list[int]:
+    """Collect up to ``limit`` matching nodes from distance layers, closest first.
+
+    Matches within a layer are taken in id order, which is map insertion
+    order. Layers are consumed lazily, so a search behind them stops at the
+    layer that completes the result.
+    """
+    matches: list[int] = []
+    for layer in layers:
+        hits = sorted(node for node in layer if predicate(node))
+        matches.extend(hits[:limit - len(matches)])
+        if len(matches) >= limit:
+            break
+    return matches
+
+def find_k_nearest(
+    graph: LocationGraph,
+    source: int,
+    predicate: Callable[[int], bool],
+    k: int,
+    avoid: Avoidance = NO_AVOIDANCE
+) -> list[tuple[int, list[Direction]]]:
+    """Find the k closest nodes matching a predicate with one incremental search."""
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    matches = first_matches(expand_from(graph, source, parents, codes, avoid), predicate, k)
+    return [(node, walk_back(parents, codes, source, node)) for node in matches]
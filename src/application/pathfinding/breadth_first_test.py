@@ -0,0 +1,96 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.avoidance import Avoidance
+from src.application.pathfinding.breadth_first import find_k_nearest, find_path, find_paths
+
+def connect(locations: dict[str, Location], from_loc: str, to_loc: str, direction: Direction) -> None:
+    """Add a reciprocal connection between two locations."""
+    locations[from_loc].add_connection(direction, to_loc)
+    locations[to_loc].add_connection(Direction.get_opposite(direction), from_loc)
+
+class TestBreadthFirst:
+    """Test cases for the breadth-first search engine."""
+
+    @pytest.fixture
+    def diamond(self) -> dict[str, Location]:
+        """Create a diamond-shaped map with two equidistant routes."""
+        locations = {
+            name: Location(name)
+            for name in ["Start", "West", "East", "Goal", "Far", "Island"]
+        }
+        connect(locations, "Start", "West", Direction.WEST)
+        connect(locations, "Start", "East", Direction.EAST)
+        connect(locations, "West", "Goal", Direction.SOUTH)
+        connect(locations, "East", "Goal", Direction.SOUTH)
+        connect(locations, "Goal", "Far", Direction.SOUTH)
+        return locations
+
+    @pytest.fixture
+    def graph(self, diamond: dict[str, Location]) -> LocationGraph:
+        """Create a graph over the diamond map."""
+        return LocationGraph.from_locations(diamond)
+
+    def node(self, graph: LocationGraph, name: str) -> int:
+        node = graph.id_of(name)
+        assert node is not None
+        return node
+
+    def test_find_path(self, graph: LocationGraph) -> None:
+        """Test that equal-length routes go through the alphabetically first parent."""
+        path = find_path(graph, self.node(graph, "Start"), self.node(graph, "Far"))
+        assert path == [Direction.EAST, Direction.SOUTH, Direction.SOUTH]
+
+    def test_find_path_to_self(self, graph: LocationGraph) -> None:
+        """Test that a path to the start location is empty."""
+        start = self.node(graph, "Start")
+        assert find_path(graph, start, start) == []
+
+    def test_find_path_unreachable(self, graph: LocationGraph) -> None:
+        """Test that an unreachable target returns None."""
+        assert find_path(graph, self.node(graph, "Start"), self.node(graph, "Island")) is None
+
+    def test_find_path_avoiding_location(self, graph: LocationGraph) -> None:
+        """Test that an avoided location forces the other route."""
+        avoid = Avoidance.from_names(graph, locations=["East"])
+        path = find_path(graph, self.node(graph, "Start"), self.node(graph, "Far"), avoid)
+        assert path == [Direction.WEST, Direction.SOUTH, Direction.SOUTH]
+
+    def test_find_path_avoiding_edges(self, graph: LocationGraph) -> None:
+        """Test that avoided connections can cut off a target."""
+        avoid = Avoidance.from_names(graph, edges=[("Goal", "West"), ("East", "Goal")])
+        assert find_path(graph, self.node(graph, "Start"), self.node(graph, "Far"), avoid) is None
+
+    def test_find_k_nearest_avoiding(self, graph: LocationGraph) -> None:
+        """Test that avoided locations are never matched or crossed."""
+        avoid = Avoidance.from_names(graph, locations=["West"])
+        far = self.node(graph, "Far")
+        matches = find_k_nearest(graph, self.node(graph, "Start"), lambda node: node == far, 1, avoid)
+        assert matches == [(far, [Direction.EAST, Direction.SOUTH, Direction.SOUTH])]
+
+    def test_find_paths(self, graph: LocationGraph) -> None:
+        """Test finding paths to several targets in one search."""
+        start, west, far, island = (self.node(graph, name) for name in ["Start", "West", "Far", "Island"])
+        paths = find_paths(graph, start, [far, west, island, start])
+        assert paths == {
+            far: [Direction.EAST, Direction.SOUTH, Direction.SOUTH],
+            west: [Direction.WEST],
+            island: None,
+            start: []
+        }
+
+    def test_match_at_start(self, graph: LocationGraph) -> None:
+        """Test that a matching start location returns an empty path."""
+        start = self.node(graph, "Start")
+        assert find_k_nearest(graph, start, lambda node: node == start, 1) == [(start, [])]
+
+    def test_equidistant_matches_use_insertion_order(self, graph: LocationGraph) -> None:
+        """Test that equidistant matches resolve to the earliest inserted location."""
+        candidates = {self.node(graph, "West"), self.node(graph, "East")}
+        result = find_k_nearest(graph, self.node(graph, "Start"), candidates.__contains__, 1)
+        assert result == [(self.node(graph, "West"), [Direction.WEST])]
+
+    def test_no_match(self, graph: LocationGraph) -> None:
+        """Test that a search without matches returns None."""
+        assert find_k_nearest(graph, self.node(graph, "Start"), lambda node: False, 1) == []
@@ -0,0 +1,59 @@
+from array import array
+
+class ComponentIndex:
+    """Union-find over location ids for constant-time reachability checks.
+
+    Components only ever merge here, so the owner rebuilds the index after a
+    connection is removed. Connections are treated as undirected: nodes in
+    different components can never reach each other.
+    """
+
+    def __init__(self) -> None:
+        self._parents = array('i')
+        self._sizes = array('i')
+        self.count = 0
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def add(self) -> int:
+        """Add a new singleton component, returning its node id."""
+        node = len(self._parents)
+        self._parents.append(node)
+        self._sizes.append(1)
+        self.count += 1
+        return node
+
+    def find(self, node: int) -> int:
+        """Get the representative of a node's component."""
+        parents = self._parents
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    def union(self, a: int, b: int) -> None:
+        """Merge the components of two nodes."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self._sizes[root_a] < self._sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parents[root_b] = root_a
+        self._sizes[root_a] += self._sizes[root_b]
+        self.count -= 1
+
+    def connected(self, a: int, b: int) -> bool:
+        """Check whether two nodes are in the same component."""
+        return self.find(a) == self.find(b)
+
+    def size(self, node: int) -> int:
+        """Get the number of nodes in a node's component."""
+        return self._sizes[self.find(node)]
+
+    def groups(self) -> list[list[int]]:
+        """Get the nodes of every component, largest component first."""
+        members: dict[int, list[int]] = {}
+        for node in range(len(self._parents)):
+            members.setdefault(self.find(node), []).append(node)
+        return sorted(members.values(), key=len, reverse=True)
@@ -0,0 +1,35 @@
+import pytest
+from src.application.pathfinding.components import ComponentIndex
+
+class TestComponentIndex:
+    """Test cases for the union-find component index."""
+
+    @pytest.fixture
+    def index(self) -> ComponentIndex:
+        """Create an index with five singleton components."""
+        index = ComponentIndex()
+        for _ in range(5):
+            index.add()
+        return index
+
+    def test_singletons(self, index: ComponentIndex) -> None:
+        """Test that new nodes start in their own component."""
+        assert len(index) == 5
+        assert index.count == 5
+        assert not index.connected(0, 1)
+        assert index.size(3) == 1
+
+    def test_union(self, index: ComponentIndex) -> None:
+        """Test merging components."""
+        index.union(0, 1)
+        index.union(3, 1)
+        index.union(0, 3)
+        assert index.connected(3, 0)
+        assert not index.connected(0, 2)
+        assert index.size(1) == 3
+        assert index.count == 3
+
+    def test_groups(self, index: ComponentIndex) -> None:
+        """Test listing components, largest first."""
+        index.union(2, 4)
+        assert index.groups() == [[2, 4], [0], [1], [3]]
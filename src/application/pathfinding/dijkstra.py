@@ -0,0 +1,66 @@
+import heapq
+from array import array
+from typing import Iterator
+from .location_graph import LocationGraph, DEGREE, NO_NODE
+from .avoidance import Avoidance
+
+def expand_buckets(
+    graph: LocationGraph,
+    source: int,
+    parents: array,
+    codes: bytearray,
+    avoid: Avoidance = Avoidance()
+) -> Iterator[list[int]]:
+    """Run Dijkstra's algorithm over travel costs, yielding nodes settled at each cost.
+
+    Tentative nodes are kept in buckets keyed by their exact cost, with a
+    small heap over the distinct bucket keys. Travel costs are small
+    positive integers, so there are few distinct keys and every node is
+    moved with a list append instead of a heap push. Each yielded group
+    holds all nodes at one cost, in name order, like a breadth-first layer.
+    Avoided locations are given cost 0 up front so they are never relaxed.
+    """
+    targets = graph.targets
+    weights = graph.weights
+    names = graph.names
+    blocked = avoid.slots
+    costs = array('q', [-1]) * len(graph)
+    for node in avoid.nodes:
+        costs[node] = 0
+    costs[source] = 0
+    parents[source] = source
+    buckets: dict[int, list[int]] = {0: [source]}
+    keys = [0]
+
+    while keys:
+        cost = heapq.heappop(keys)
+        settled = sorted(
+            (node for node in buckets.pop(cost) if costs[node] == cost),
+            key=names.__getitem__
+        )
+        if not settled:
+            continue
+        yield settled
+
+        for node in settled:
+            base = node * DEGREE
+            for code in range(DEGREE):
+                slot = base + code
+                neighbor = targets[slot]
+                if neighbor == NO_NODE:
+                    continue
+                next_cost = cost + weights[slot]
+                known = costs[neighbor]
+                if known != -1 and known <= next_cost:
+                    continue
+                if blocked and slot in blocked:
+                    continue
+                costs[neighbor] = next_cost
+                parents[neighbor] = node
+                codes[neighbor] = code
+                bucket = buckets.get(next_cost)
+                if bucket is None:
+                    buckets[next_cost] = [neighbor]
+                    heapq.heappush(keys, next_cost)
+                else:
+                    bucket.append(neighbor)
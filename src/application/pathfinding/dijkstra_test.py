@@ -0,0 +1,51 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.breadth_first import find_path, new_parents
+from src.application.pathfinding.dijkstra import expand_buckets
+
+class TestDijkstra:
+    """Test cases for the bucket-queue Dijkstra search."""
+
+    @pytest.fixture
+    def graph(self) -> LocationGraph:
+        """Create a square where the direct river crossing is expensive."""
+        locations = {name: Location(name) for name in ["Camp", "River", "Bridge", "Farm"]}
+
+        def connect(a: str, b: str, direction: Direction, cost: int = 1) -> None:
+            locations[a].add_connection(direction, b, cost)
+            locations[b].add_connection(Direction.get_opposite(direction), a, cost)
+
+        connect("Camp", "River", Direction.EAST, 5)
+        connect("Camp", "Bridge", Direction.NORTH)
+        connect("Bridge", "Farm", Direction.EAST)
+        connect("Farm", "River", Direction.SOUTH)
+        return LocationGraph.from_locations(locations)
+
+    def test_weighted_edges_counted(self, graph: LocationGraph) -> None:
+        """Test that the graph reports connections with travel costs."""
+        assert graph.weighted_edges == 2
+
+    def test_cheapest_path_avoids_expensive_edge(self, graph: LocationGraph) -> None:
+        """Test that a longer but cheaper route is preferred."""
+        assert find_path(graph, 0, 1) == [Direction.NORTH, Direction.EAST, Direction.SOUTH]
+
+    def test_groups_in_cost_order(self, graph: LocationGraph) -> None:
+        """Test that nodes are settled in nondecreasing cost order."""
+        parents = new_parents(graph)
+        codes = bytearray(len(graph))
+        groups = list(expand_buckets(graph, 0, parents, codes))
+        assert groups == [[0], [2], [3], [1]]
+
+    def test_unit_costs_keep_breadth_first(self, graph: LocationGraph) -> None:
+        """Test that removing the travel costs restores the direct route."""
+        camp, river = Location("Camp"), Location("River")
+        camp.add_connection(Direction.EAST, "River")
+        camp.add_connection(Direction.NORTH, "Bridge")
+        river.add_connection(Direction.WEST, "Camp")
+        river.add_connection(Direction.NORTH, "Farm")
+        graph.update_location(camp)
+        graph.update_location(river)
+        assert graph.weighted_edges == 0
+        assert find_path(graph, 0, 1) == [Direction.EAST]
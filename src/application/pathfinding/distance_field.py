@@ -0,0 +1,301 @@
+import heapq
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DIRECTIONS, DEGREE, NO_NODE
+
+DEFAULT_FIELDS = 8
+# Searches for a resource before a field is built for it
+BUILD_AFTER = 3
+
+class IncomingIndex:
+    """The slots pointing at each location, kept current from the graph journal."""
+
+    def __init__(self, graph: LocationGraph):
+        self.graph = graph
+        self.version = graph.version
+        self.slots: list[list[int]] = []
+        self._build()
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the graph has changed since the index was updated."""
+        return self.version == self.graph.version
+
+    def refresh(self) -> None:
+        """Catch up on slot changes, rebuilding if the edit history is gone."""
+        graph = self.graph
+        if self.is_current:
+            return
+        changes = graph.changes_since(self.version)
+        if changes is None or len(graph) < len(self.slots):
+            self._build()
+            return
+        self.slots.extend([] for _ in range(len(graph) - len(self.slots)))
+        oldest: dict[int, int] = {}
+        for _, slot, previous, _ in changes:
+            oldest.setdefault(slot, previous)
+        for slot, previous in oldest.items():
+            target = graph.targets[slot]
+            if previous == target:
+                continue
+            if previous != NO_NODE:
+                self.slots[previous].remove(slot)
+            if target != NO_NODE:
+                self.slots[target].append(slot)
+        self.version = graph.version
+
+    def _build(self) -> None:
+        """Collect the incoming slots of every location."""
+        self.version = self.graph.version
+        self.slots = [[] for _ in range(len(self.graph))]
+        for slot, target in enumerate(self.graph.targets):
+            if target != NO_NODE:
+                self.slots[target].append(slot)
+
+class DistanceField:
+    """Cost from every location to the nearest holder of one resource.
+
+    ``costs[v]`` is the cost of the cheapest route from ``v`` to any
+    holder (-1 if none is reachable), ``nearest[v]`` that holder and
+    ``codes[v]`` the direction of the first step. Equally cheap holders
+    resolve to the lowest id, as in a nearest search, and equally good
+    first steps to the neighbour with the lowest name, then the lowest
+    direction code, the rule find_path uses to pick parents. Following the
+    codes from any location walks a shortest route to exactly
+    ``nearest[v]`` in O(length). As the rule is applied from the holder's
+    end, on rare maps that route is a different, equally cheap one than
+    find_path takes.
+
+    The field is computed with one multi-source search over incoming
+    connections. New holders and added or cheaper connections only lower
+    labels, so they are patched in by continuing that search from the
+    nodes they improve; removed, redirected or costlier connections need
+    a rebuild.
+    """
+
+    def __init__(self, graph: LocationGraph, holders: Iterable[int], incoming: IncomingIndex):
+        self.graph = graph
+        self.version = graph.version
+        self.costs = array('q', [-1]) * len(graph)
+        self.nearest = array('i', [NO_NODE]) * len(graph)
+        self.codes = bytearray(len(graph))
+        self._pending: set[int] = set()
+        heap: list[tuple[int, int, int]] = []
+        for holder in holders:
+            self._add_holder(holder, heap)
+        self._spread(heap, incoming)
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the field reflects the graph and every known holder."""
+        return self.version == self.graph.version and not self._pending
+
+    def add_holder(self, node: int) -> None:
+        """Record a new holder, to be patched in by the next update."""
+        self._pending.add(node)
+
+    def update(self, incoming: IncomingIndex, holds: Callable[[int], bool]) -> bool:
+        """Patch in new holders, new locations and added connections.
+
+        holds tells whether a location added since the last update holds
+        the resource. incoming must already be current. Returns False if
+        connections were removed, redirected or made costlier, or the edit
+        history is gone; the field must then be rebuilt.
+        """
+        graph = self.graph
+        if self.is_current:
+            return True
+        changes = graph.changes_since(self.version)
+        if changes is None or len(graph) < len(self.costs):
+            return False
+
+        targets = graph.targets
+        weights = graph.weights
+        oldest: dict[int, tuple[int, int]] = {}
+        for _, slot, previous, previous_weight in changes:
+            oldest.setdefault(slot, (previous, previous_weight))
+        added = []
+        for slot, (previous, previous_weight) in oldest.items():
+            target = targets[slot]
+            if previous != NO_NODE and (previous != target or weights[slot] > previous_weight):
+                return False
+            if target != NO_NODE:
+                added.append(slot)
+
+        known = len(self.costs)
+        grown = len(graph) - known
+        self.costs.extend([-1] * grown)
+        self.nearest.extend([NO_NODE] * grown)
+        self.codes.extend(bytes(grown))
+        heap: list[tuple[int, int, int]] = []
+        for node in range(known, len(graph)):
+            if holds(node):
+                self._add_holder(node, heap)
+        for node in self._pending:
+            self._add_holder(node, heap)
+        self._pending.clear()
+        for slot in added:
+            self._offer(slot, heap)
+        self._spread(heap, incoming)
+        self.version = graph.version
+        return True
+
+    def route(self, source: int) -> Optional[tuple[int, list[Direction]]]:
+        """Get the nearest holder from a location and the directions to it."""
+        if self.costs[source] == -1:
+            return None
+        targets = self.graph.targets
+        costs = self.costs
+        codes = self.codes
+        path = []
+        node = source
+        while costs[node]:
+            code = codes[node]
+            path.append(DIRECTIONS[code])
+            node = targets[node * DEGREE + code]
+        return (node, path)
+
+    def _add_holder(self, node: int, heap: list[tuple[int, int, int]]) -> None:
+        """Make a location a source of the search."""
+        if self.costs[node] == 0:
+            return
+        self.costs[node] = 0
+        self.nearest[node] = node
+        heapq.heappush(heap, (0, node, node))
+
+    def _offer(self, slot: int, heap: list[tuple[int, int, int]]) -> None:
+        """Offer a connection as the first step of its source, queueing it if that helps."""
+        neighbor = self.graph.targets[slot]
+        cost = self.costs[neighbor]
+        if cost == -1:
+            return
+        graph = self.graph
+        node = slot // DEGREE
+        label = (cost + graph.weights[slot], self.nearest[neighbor])
+        known = (self.costs[node], self.nearest[node])
+        if known[0] != -1 and label >= known:
+            if label != known:
+                return
+            # Equally good steps go to the neighbour find_path would settle first
+            names = graph.names
+            step = self.codes[node]
+            current = graph.targets[node * DEGREE + step]
+            if (names[neighbor], slot % DEGREE) < (names[current], step):
+                self.codes[node] = slot % DEGREE
+            return
+        self.costs[node], self.nearest[node] = label
+        self.codes[node] = slot % DEGREE
+        heapq.heappush(heap, (label[0], label[1], node))
+
+    def _spread(self, heap: list[tuple[int, int, int]], incoming: IncomingIndex) -> None:
+        """Settle queued locations, offering their incoming connections in turn."""
+        costs = self.costs
+        nearest = self.nearest
+        slots = incoming.slots
+        while heap:
+            cost, holder, node = heapq.heappop(heap)
+            if cost != costs[node] or holder != nearest[node]:
+                continue
+            for slot in slots[node]:
+                self._offer(slot, heap)
+
+class DistanceFields:
+    """Distance fields for the most recently queried resources.
+
+    A field costs a search of the whole map, so one is only built once a
+    resource has been asked for ``build_after`` times; until then callers
+    fall back to their own searches. At most ``capacity`` fields are kept;
+    the least recently used one is dropped to make room, so memory stays
+    at about 13 bytes per location per field. A capacity of 0 disables them.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_FIELDS, build_after: int = BUILD_AFTER):
+        if capacity < 0:
+            raise ValueError("Field capacity must not be negative")
+        if build_after < 1:
+            raise ValueError("Fields must be built after at least one query")
+        self.capacity = capacity
+        self.build_after = build_after
+        self.builds = 0
+        self.updates = 0
+        self.evictions = 0
+        self._incoming: Optional[IncomingIndex] = None
+        self._fields: OrderedDict[str, DistanceField] = OrderedDict()
+        self._queries: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def get(
+        self,
+        graph: LocationGraph,
+        resource: str,
+        holders: Callable[[], Iterable[int]],
+        holds: Callable[[int], bool]
+    ) -> Optional[DistanceField]:
+        """Get the current field of a resource, building or updating it as needed.
+
+        holders lists every holder for a build; holds tells whether a newly
+        added location is one. Returns None when fields are disabled or the
+        resource has not been asked for often enough yet.
+        """
+        if self.capacity == 0:
+            return None
+        field = self._fields.get(resource)
+        if field is not None and field.graph is not graph:
+            self.clear()
+            field = None
+        if field is None:
+            queries = self._queries[resource] = self._queries.get(resource, 0) + 1
+            if queries < self.build_after:
+                return None
+        if field is not None and field.is_current:
+            self._fields.move_to_end(resource)
+            return field
+
+        incoming = self._incoming_index(graph)
+        if field is not None and field.update(incoming, holds):
+            self.updates += 1
+            self._fields.move_to_end(resource)
+            return field
+
+        field = DistanceField(graph, holders(), incoming)
+        self.builds += 1
+        self._fields[resource] = field
+        self._fields.move_to_end(resource)
+        if len(self._fields) > self.capacity:
+            evicted, _ = self._fields.popitem(last=False)
+            # An evicted resource has to be asked for often again to get a field back
+            self._queries.pop(evicted, None)
+            self.evictions += 1
+        return field
+
+    def add_holder(self, resource: str, node: int) -> None:
+        """Tell the field of a resource, if kept, about a new holder."""
+        field = self._fields.get(resource)
+        if field is not None:
+            field.add_holder(node)
+
+    def clear(self) -> None:
+        """Drop all fields and query counts."""
+        self._fields.clear()
+        self._queries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get build, update and eviction counters for sizing."""
+        return {
+            "builds": self.builds,
+            "updates": self.updates,
+            "evictions": self.evictions,
+            "size": len(self._fields),
+            "capacity": self.capacity
+        }
+
+    def _incoming_index(self, graph: LocationGraph) -> IncomingIndex:
+        """Get the incoming connections of a graph."""
+        if self._incoming is None or self._incoming.graph is not graph:
+            self._incoming = IncomingIndex(graph)
+        self._incoming.refresh()
+        return self._incoming
@@ -0,0 +1,116 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.distance_field import DistanceFields
+from src.application.pathfinding.astar_test import grid_locations
+from src.application.pathfinding.hierarchy_test import path_cost
+from src.application.pathfinding import breadth_first
+
+class TestDistanceFields:
+    """Test cases for per-resource distance fields."""
+
+    @pytest.fixture
+    def locations(self) -> dict[str, Location]:
+        """Create a grid with a wall, a costly and a one-way connection and an island."""
+        locations = grid_locations(5, 5, {(2, y) for y in range(0, 4)})
+        locations["1,4"].connection_costs[Direction.EAST] = 3
+        locations["0,0"].add_connection(Direction.NORTH, "4,0")
+        locations["Island"] = Location("Island")
+        return locations
+
+    @pytest.fixture
+    def graph(self, locations: dict[str, Location]) -> LocationGraph:
+        return LocationGraph.from_locations(locations)
+
+    def assert_matches_search(self, graph: LocationGraph, fields: DistanceFields, holders: set[int]) -> None:
+        """Check the route from every location against a nearest search."""
+        field = fields.get(graph, "ore", lambda: holders, holders.__contains__)
+        assert field is not None
+        for source in range(len(graph)):
+            expected = breadth_first.find_k_nearest(graph, source, holders.__contains__, 1)
+            route = field.route(source)
+            if not expected:
+                assert route is None
+                continue
+            assert route is not None
+            node, path = route
+            assert node == expected[0][0]
+            assert path_cost(graph, source, path) == path_cost(graph, source, expected[0][1])
+
+    def test_routes(self, graph: LocationGraph) -> None:
+        """Test that every location reaches its nearest holder, ties by lowest id."""
+        holders = {graph.id_of(name) for name in ["4,0", "0,4", "3,3"]}
+        self.assert_matches_search(graph, DistanceFields(build_after=1), {node for node in holders if node is not None})
+
+    def test_equal_first_steps(self) -> None:
+        """Test that equally good first steps go to the neighbour with the lowest name."""
+        graph = LocationGraph.from_locations(grid_locations(3, 3, set()))
+        corner = graph.id_of("0,0") or 0
+        field = DistanceFields(build_after=1).get(graph, "ore", lambda: [corner], lambda node: False)
+        assert field is not None
+        assert field.route(graph.id_of("1,1") or 0) == (corner, [Direction.WEST, Direction.SOUTH])
+        assert field.route(graph.id_of("2,2") or 0) == (
+            corner, [Direction.WEST, Direction.WEST, Direction.SOUTH, Direction.SOUTH]
+        )
+
+    def test_updates_after_edits(self, graph: LocationGraph, locations: dict[str, Location]) -> None:
+        """Test patching in new holders, locations and connections without a rebuild."""
+        fields = DistanceFields(build_after=1)
+        holders = {graph.id_of("4,4") or 0}
+        self.assert_matches_search(graph, fields, holders)
+
+        holders.add(graph.id_of("0,3") or 0)
+        fields.add_holder("ore", graph.id_of("0,3") or 0)
+        self.assert_matches_search(graph, fields, holders)
+
+        locations["Cave"] = Location("Cave")
+        locations["Cave"].add_connection(Direction.WEST, "Island")
+        graph.add_location(locations["Cave"])
+        holders.add(graph.id_of("Cave") or 0)
+        locations["0,0"].add_connection(Direction.WEST, "Cave", 2)
+        graph.update_location(locations["0,0"])
+        self.assert_matches_search(graph, fields, holders)
+        assert fields.stats()["builds"] == 1
+        assert fields.stats()["updates"] == 2
+
+        del locations["0,0"].connections[Direction.WEST]
+        graph.update_location(locations["0,0"])
+        self.assert_matches_search(graph, fields, holders)
+        assert fields.stats()["builds"] == 2
+
+    def test_least_recently_used_eviction(self, graph: LocationGraph) -> None:
+        """Test that only capacity fields are kept and the oldest is dropped."""
+        fields = DistanceFields(capacity=2, build_after=1)
+        first = fields.get(graph, "ore", lambda: [0], lambda node: False)
+        fields.get(graph, "wood", lambda: [1], lambda node: False)
+        assert fields.get(graph, "ore", lambda: [0], lambda node: False) is first
+        fields.get(graph, "stone", lambda: [2], lambda node: False)
+        assert len(fields) == 2
+        assert fields.stats()["evictions"] == 1
+        assert fields.get(graph, "ore", lambda: [0], lambda node: False) is first
+        fields.get(graph, "wood", lambda: [1], lambda node: False)
+        assert fields.stats()["builds"] == 4
+
+    def test_built_after_repeated_queries(self, graph: LocationGraph) -> None:
+        """Test that a field is only built once its resource has been asked for enough times."""
+        fields = DistanceFields(capacity=1, build_after=3)
+        assert fields.get(graph, "ore", lambda: [0], lambda node: False) is None
+        assert fields.get(graph, "ore", lambda: [0], lambda node: False) is None
+        assert fields.get(graph, "wood", lambda: [1], lambda node: False) is None
+        assert fields.get(graph, "ore", lambda: [0], lambda node: False) is not None
+        assert fields.stats()["builds"] == 1
+
+        # Eviction starts the count over
+        for _ in range(3):
+            fields.get(graph, "wood", lambda: [1], lambda node: False)
+        assert fields.stats()["evictions"] == 1
+        assert fields.get(graph, "ore", lambda: [0], lambda node: False) is None
+
+    def test_disabled(self, graph: LocationGraph) -> None:
+        """Test that a capacity of 0 keeps no fields and bad settings are rejected."""
+        assert DistanceFields(capacity=0).get(graph, "ore", lambda: [0], lambda node: False) is None
+        with pytest.raises(ValueError):
+            DistanceFields(capacity=-1)
+        with pytest.raises(ValueError):
+            DistanceFields(build_after=0)
@@ -0,0 +1,187 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Union
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DIRECTIONS, DEGREE, NO_NODE
+from .distance_field import IncomingIndex
+
+MATRIX_LIMIT = 20000
+POOL_THRESHOLD = 2000
+UNREACHABLE = 0xFFFF
+HEADER_SIZE = 256
+
+class DistanceMatrix:
+    """Hop distances between every pair of locations in one uint16 block.
+
+    ``values[source * size + target]`` holds the number of steps from
+    source to target, or ``UNREACHABLE``. Rows are computed with one
+    breadth-first search per source, spread over worker processes for
+    larger maps. Directions are rebuilt backwards from the target, each
+    step coming from the neighbour one step closer to the source with the
+    lowest name, then direction code, so a path costs O(length) lookups
+    and is the route the breadth-first search takes.
+
+    The block can be saved after a short header and memory-mapped back,
+    so later sessions do not hold a second copy in memory. The header
+    records the content hash of the map, and a file made for another map
+    is never reused. Only unit-cost maps are supported, and sizes up to
+    ``MATRIX_LIMIT`` locations keep the block in the hundreds of megabytes.
+    """
+
+    def __init__(self, graph: LocationGraph, values: Union[array, memoryview]):
+        self.graph = graph
+        self.version = graph.version
+        self.size = len(graph)
+        self.values = values
+        self._incoming: Optional[IncomingIndex] = None
+
+    @classmethod
+    def build(cls, graph: LocationGraph, workers: Optional[int] = None) -> 'DistanceMatrix':
+        """Compute the matrix, using worker processes on larger maps.
+
+        workers defaults to the CPU count once the map has at least
+        ``POOL_THRESHOLD`` locations and to 1 below that.
+        """
+        size = len(graph)
+        if size > MATRIX_LIMIT:
+            raise ValueError(f"Distance matrix supports at most {MATRIX_LIMIT} locations")
+        if graph.weighted_edges:
+            raise ValueError("Distance matrix does not support travel costs")
+        if workers is None:
+            workers = (os.cpu_count() or 1) if size >= POOL_THRESHOLD else 1
+
+        targets = graph.targets.tobytes()
+        if workers <= 1 or size < 2:
+            return cls(graph, _distance_rows(targets, size, 0, size))
+
+        chunk = -(-size // (workers * 4))
+        values = array('H')
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_distance_rows, targets, size, start, min(start + chunk, size))
+                for start in range(0, size, chunk)
+            ]
+            for future in futures:
+                values.extend(future.result())
+        return cls(graph, values)
+
+    @classmethod
+    def open(cls, graph: LocationGraph, path: str) -> Optional['DistanceMatrix']:
+        """Memory-map a saved matrix, or return None if it is missing or for another map."""
+        try:
+            with open(path, 'rb') as f:
+                header = cls._read_header(f.read(HEADER_SIZE))
+                if header != cls._header(graph):
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        values = memoryview(mapped)[HEADER_SIZE:].cast('H')
+        if len(values) != len(graph) * len(graph):
+            return None
+        return cls(graph, values)
+
+    def save(self, path: str) -> None:
+        """Write the matrix after a header identifying the map.
+
+        The file is replaced rather than overwritten, so matrices already
+        mapped from it stay valid.
+        """
+        if not self.is_current:
+            raise ValueError("Distance matrix is out of date")
+        header = json.dumps(self._header(self.graph)).encode('utf-8')
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE - 1) + b"\n")
+            f.write(self.values if isinstance(self.values, memoryview) else self.values.tobytes())
+        os.replace(temporary, path)
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the graph has changed since the matrix was computed."""
+        return self.version == self.graph.version
+
+    def distance(self, source: int, target: int) -> Optional[int]:
+        """Get the number of steps between two locations, or None if unreachable."""
+        steps = self.values[source * self.size + target]
+        return None if steps == UNREACHABLE else steps
+
+    def path(self, source: int, target: int) -> Optional[list[Direction]]:
+        """Rebuild the directions between two locations from the matrix and adjacency."""
+        values = self.values
+        row = source * self.size
+        remaining = values[row + target]
+        if remaining == UNREACHABLE:
+            return None
+        if self._incoming is None:
+            self._incoming = IncomingIndex(self.graph)
+        slots = self._incoming.slots
+        names = self.graph.names
+        path = []
+        node = target
+        while remaining:
+            remaining -= 1
+            # The search settles a layer in name order, so the first parent found has the lowest name
+            slot = min(
+                (slot for slot in slots[node] if values[row + slot // DEGREE] == remaining),
+                key=lambda slot: (names[slot // DEGREE], slot % DEGREE)
+            )
+            path.append(DIRECTIONS[slot % DEGREE])
+            node = slot // DEGREE
+        path.reverse()
+        return path
+
+    def nearest_k(self, source: int, candidates: Iterable[int], k: int) -> list[tuple[int, list[Direction]]]:
+        """Find the k closest candidates; equidistant ones resolve to the lowest id."""
+        row = source * self.size
+        values = self.values
+        reachable = sorted(
+            (values[row + node], node) for node in candidates if values[row + node] != UNREACHABLE
+        )
+        return [(node, self.path(source, node) or []) for _, node in reachable[:k]]
+
+    @staticmethod
+    def _header(graph: LocationGraph) -> dict:
+        """Describe the map and memory layout a saved matrix belongs to."""
+        return {"graph": graph.content_hash(), "size": len(graph), "byteorder": sys.byteorder}
+
+    @staticmethod
+    def _read_header(data: bytes) -> dict:
+        """Parse a saved header, raising ValueError if it is malformed."""
+        if len(data) != HEADER_SIZE:
+            raise ValueError("Truncated distance matrix header")
+        header = json.loads(data)
+        if not isinstance(header, dict):
+            raise ValueError("Malformed distance matrix header")
+        return header
+
+def _distance_rows(targets_bytes: bytes, size: int, start: int, stop: int) -> array:
+    """Compute the matrix rows for sources start..stop-1 with breadth-first searches."""
+    targets = array('i')
+    targets.frombytes(targets_bytes)
+    adjacency = [
+        tuple(neighbor for neighbor in targets[base:base + DEGREE] if neighbor != NO_NODE)
+        for base in range(0, size * DEGREE, DEGREE)
+    ]
+    rows = array('H')
+    blank = [UNREACHABLE] * size
+    for source in range(start, stop):
+        row = blank.copy()
+        row[source] = 0
+        frontier = [source]
+        steps = 0
+        while frontier:
+            steps += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adjacency[node]:
+                    if row[neighbor] == UNREACHABLE:
+                        row[neighbor] = steps
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        rows.extend(row)
+    return rows
@@ -0,0 +1,78 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.distance_matrix import DistanceMatrix
+from src.application.pathfinding.astar_test import grid_locations
+from src.application.pathfinding import breadth_first
+
+class TestDistanceMatrix:
+    """Test cases for the all-pairs hop distance matrix."""
+
+    @pytest.fixture
+    def locations(self) -> dict[str, Location]:
+        """Create a grid with a wall, an island and a one-way connection."""
+        locations = grid_locations(5, 5, {(2, y) for y in range(0, 4)})
+        locations["1,4"].add_connection(Direction.SOUTH, "4,0")
+        locations["Island"] = Location("Island")
+        return locations
+
+    @pytest.fixture
+    def graph(self, locations: dict[str, Location]) -> LocationGraph:
+        return LocationGraph.from_locations(locations)
+
+    def assert_matches_search(self, graph: LocationGraph, matrix: DistanceMatrix) -> None:
+        """Check every pair of locations against the flat search."""
+        for source in range(len(graph)):
+            for target in range(len(graph)):
+                expected = breadth_first.find_path(graph, source, target)
+                path = matrix.path(source, target)
+                if expected is None:
+                    assert path is None
+                    assert matrix.distance(source, target) is None
+                else:
+                    assert path == expected
+                    assert matrix.distance(source, target) == len(expected)
+
+    def test_paths(self, graph: LocationGraph) -> None:
+        """Test that distances and rebuilt directions, ties included, match breadth-first search."""
+        self.assert_matches_search(graph, DistanceMatrix.build(graph, workers=1))
+
+    def test_worker_processes(self, graph: LocationGraph) -> None:
+        """Test that rows computed by a process pool match the serial ones."""
+        serial = DistanceMatrix.build(graph, workers=1)
+        pooled = DistanceMatrix.build(graph, workers=2)
+        assert pooled.values == serial.values
+
+    def test_nearest_k(self, graph: LocationGraph) -> None:
+        """Test ranking candidates by distance, ties by id."""
+        matrix = DistanceMatrix.build(graph, workers=1)
+        source = graph.id_of("0,0")
+        candidates = [graph.id_of(name) for name in ["1,1", "0,2", "Island", "0,0"]]
+        ranked = matrix.nearest_k(source or 0, [node for node in candidates if node is not None], 3)
+        assert [graph.names[node] for node, _ in ranked] == ["0,0", "1,1", "0,2"]
+
+    def test_save_and_open(self, graph: LocationGraph, locations: dict[str, Location], tmp_path) -> None:
+        """Test memory-mapping a saved matrix and rejecting it for another map."""
+        path = str(tmp_path / "map.matrix")
+        matrix = DistanceMatrix.build(graph, workers=1)
+        matrix.save(path)
+
+        mapped = DistanceMatrix.open(graph, path)
+        assert mapped is not None
+        assert isinstance(mapped.values, memoryview)
+        self.assert_matches_search(graph, mapped)
+
+        # Saving over a mapped file leaves the mapping usable
+        mapped.save(path)
+        assert mapped.values.tolist() == matrix.values.tolist()
+
+        locations["Island"].add_connection(Direction.NORTH, "0,0")
+        assert DistanceMatrix.open(LocationGraph.from_locations(locations), path) is None
+        assert DistanceMatrix.open(graph, str(tmp_path / "missing.matrix")) is None
+
+    def test_rejects_travel_costs(self, locations: dict[str, Location]) -> None:
+        """Test that maps with travel costs are refused."""
+        locations["0,0"].add_connection(Direction.EAST, "1,0", 3)
+        with pytest.raises(ValueError):
+            DistanceMatrix.build(LocationGraph.from_locations(locations))
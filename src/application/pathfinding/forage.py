@@ -0,0 +1,118 @@
+import time
+from .location_graph import LocationGraph, DEGREE
+from .breadth_first import expand_from, new_parents
+from .tour import Tour, distance_table, group_mask, CANDIDATES_PER_GROUP, DEFAULT_TIME_LIMIT
+
+def plan_forage(
+    graph: LocationGraph,
+    source: int,
+    groups: list[set[int]],
+    values: list[float],
+    budget: int,
+    time_limit: float = DEFAULT_TIME_LIMIT
+) -> Tour:
+    """Find a round trip from source of at most budget that collects the most value.
+
+    Visiting any node of a group collects its value once. The trip with
+    the highest total value wins, then the cheapest among those. Only the
+    ``CANDIDATES_PER_GROUP`` nodes of each group closest to the source
+    are considered, and only within budget of it, so the search never
+    leaves that radius.
+
+    Stop sequences are searched depth first, most value per step first,
+    and a branch is cut once even every group still reachable from it
+    could not beat the best trip so far. When time_limit seconds run out
+    the best trip found so far is returned. ``exact`` tells whether the
+    search finished over every node of every group.
+    """
+    deadline = time.monotonic() + time_limit
+    covered = group_mask(groups, source)
+    candidates, pruned = _candidates(graph, source, groups, budget)
+    nodes = [source] + candidates
+    covers = [group_mask(groups, node) for node in nodes]
+    table = distance_table(graph, nodes, budget)
+    # Drop stops the trip could not get back from in time
+    feasible = [i for i in range(1, len(nodes)) if table[0][i] + table[i][0] <= budget]
+
+    known_values: dict[int, float] = {}
+
+    def value_of(mask: int) -> float:
+        value = known_values.get(mask)
+        if value is None:
+            value = known_values[mask] = sum(worth for bit, worth in enumerate(values) if mask & (1 << bit))
+        return value
+
+    best_order: list[int] = []
+    best_value = value_of(covered)
+    best_cost = 0.0
+    finished = True
+
+    def visit(last: int, mask: int, spent: float, order: list[int]) -> None:
+        nonlocal best_order, best_value, best_cost, finished
+        if time.monotonic() >= deadline:
+            finished = False
+            return
+        value = value_of(mask)
+        cost = spent + table[last][0]
+        if value > best_value or (value == best_value and cost < best_cost):
+            best_order, best_value, best_cost = list(order), value, cost
+
+        row = table[last]
+        options = []
+        reachable = mask
+        for stop in feasible:
+            gained = covers[stop] & ~mask
+            if not gained or spent + row[stop] + table[stop][0] > budget:
+                continue
+            reachable |= gained
+            options.append((-value_of(gained) / row[stop], stop))
+        bound = value_of(reachable)
+        if bound < best_value or (bound == best_value and spent >= best_cost):
+            return
+
+        for _, stop in sorted(options):
+            order.append(stop)
+            visit(stop, mask | covers[stop], spent + row[stop], order)
+            order.pop()
+            if not finished:
+                return
+
+    visit(0, covered, 0, [])
+    return Tour(tuple(nodes[i] for i in best_order), int(best_cost), finished and not pruned)
+
+def _candidates(graph: LocationGraph, source: int, groups: list[set[int]], budget: int) -> tuple[list[int], bool]:
+    """Pick the closest nodes of every group within budget of the source.
+
+    Returns the candidates and whether any group had more nodes in reach
+    than were kept.
+    """
+    found = [0] * len(groups)
+    candidates: list[int] = []
+    pruned = False
+    weights = graph.weights
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    costs = {source: 0}
+    for layer in expand_from(graph, source, parents, codes):
+        first = layer[0]
+        if first != source:
+            parent = parents[first]
+            costs[first] = costs[parent] + weights[parent * DEGREE + codes[first]]
+        distance = costs[first]
+        if distance > budget:
+            break
+        for node in layer:
+            costs[node] = distance
+            if node == source:
+                continue
+            kept = False
+            for bit, group in enumerate(groups):
+                if node in group:
+                    if found[bit] < CANDIDATES_PER_GROUP:
+                        found[bit] += 1
+                        kept = True
+                    else:
+                        pruned = True
+            if kept:
+                candidates.append(node)
+    return candidates, pruned
@@ -0,0 +1,51 @@
+import pytest
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.forage import plan_forage
+from src.application.pathfinding.tour import Tour, distance_table
+from src.application.pathfinding.astar_test import grid_locations
+
+class TestPlanForage:
+    """Test cases for the step-budgeted foraging search."""
+
+    @pytest.fixture
+    def graph(self) -> LocationGraph:
+        """Create a grid with a wall and a costly connection."""
+        locations = grid_locations(5, 5, {(2, y) for y in range(1, 5)})
+        locations["0,0"].connection_costs[Direction.NORTH] = 3
+        locations["0,1"].connection_costs[Direction.SOUTH] = 3
+        return LocationGraph.from_locations(locations)
+
+    def ids(self, graph: LocationGraph, *names: str) -> set[int]:
+        return {graph.id_of(name) or 0 for name in names}
+
+    def round_trip(self, graph: LocationGraph, source: int, stops: tuple[int, ...]) -> int:
+        """Add up the legs of a trip that ends back at the source."""
+        nodes = [source, *stops, source]
+        table = distance_table(graph, nodes)
+        return int(sum(table[i][i + 1] for i in range(len(nodes) - 1)))
+
+    def test_most_distinct_groups_within_budget(self, graph: LocationGraph) -> None:
+        """Test that the trip collects as many groups as the budget allows, as cheaply as possible."""
+        source = graph.id_of("0,0") or 0
+        groups = [self.ids(graph, "1,0"), self.ids(graph, "0,1"), self.ids(graph, "4,4"), self.ids(graph, "1,1")]
+        planned = plan_forage(graph, source, groups, [1, 1, 1, 1], 6)
+        assert set(planned.stops) == self.ids(graph, "1,0", "1,1", "0,1")
+        assert planned.cost == 6 == self.round_trip(graph, source, planned.stops)
+        assert planned.exact
+
+        assert plan_forage(graph, source, groups, [1, 1, 1, 1], 1) == Tour((), 0, True)
+
+    def test_weights(self, graph: LocationGraph) -> None:
+        """Test that a valuable group far away beats several cheap ones nearby."""
+        source = graph.id_of("0,0") or 0
+        groups = [self.ids(graph, "1,0"), self.ids(graph, "1,1"), self.ids(graph, "4,0")]
+        planned = plan_forage(graph, source, groups, [1, 1, 5], 8)
+        assert self.ids(graph, "4,0") <= set(planned.stops)
+        assert planned.cost <= 8
+
+    def test_time_limit(self, graph: LocationGraph) -> None:
+        """Test that an interrupted search returns its best trip so far, marked inexact."""
+        source = graph.id_of("0,0") or 0
+        planned = plan_forage(graph, source, [self.ids(graph, "1,0")], [1], 4, time_limit=0)
+        assert planned == Tour((), 0, False)
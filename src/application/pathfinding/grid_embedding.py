@@ -0,0 +1,75 @@
+from array import array
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DIRECTIONS, DEGREE, NO_NODE
+
+OFFSETS: dict[Direction, tuple[int, int]] = {
+    Direction.NORTH: (0, 1),
+    Direction.SOUTH: (0, -1),
+    Direction.EAST: (1, 0),
+    Direction.WEST: (-1, 0)
+}
+_CODE_OFFSETS = [OFFSETS[direction] for direction in DIRECTIONS]
+
+class GridEmbedding:
+    """Grid coordinates inferred from the directions of connections.
+
+    Each connected component is laid out by walking its connections from
+    the first location at (0, 0): going north adds one to y, going east adds
+    one to x. A connection whose endpoints do not end up exactly one step
+    apart in its direction is a conflict, and marks its component as
+    inconsistent. In a consistent component the Manhattan distance between
+    two locations never exceeds the number of steps between them.
+    """
+
+    def __init__(self, graph: LocationGraph):
+        self.graph = graph
+        self.version = graph.version
+        size = len(graph)
+        self.xs = array('i', [0]) * size
+        self.ys = array('i', [0]) * size
+        self.components = array('i', [NO_NODE]) * size
+        self.conflicts: list[tuple[int, int]] = []
+        self.inconsistent_components: set[int] = set()
+        self._build()
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the graph has changed since the layout was built."""
+        return self.version == self.graph.version
+
+    def coordinates(self, node: int) -> tuple[int, int]:
+        """Get the (x, y) position of a node."""
+        return (self.xs[node], self.ys[node])
+
+    def is_consistent(self, node: int) -> bool:
+        """Check whether the component of a node has no conflicts."""
+        return self.components[node] not in self.inconsistent_components
+
+    def _build(self) -> None:
+        """Lay out every component with a breadth-first walk."""
+        targets = self.graph.targets
+        xs, ys, components = self.xs, self.ys, self.components
+        for root in range(len(self.graph)):
+            if components[root] != NO_NODE:
+                continue
+            components[root] = root
+            frontier = [root]
+            while frontier:
+                next_frontier = []
+                for node in frontier:
+                    base = node * DEGREE
+                    for code in range(DEGREE):
+                        neighbor = targets[base + code]
+                        if neighbor == NO_NODE:
+                            continue
+                        dx, dy = _CODE_OFFSETS[code]
+                        x, y = xs[node] + dx, ys[node] + dy
+                        if components[neighbor] == NO_NODE:
+                            components[neighbor] = root
+                            xs[neighbor] = x
+                            ys[neighbor] = y
+                            next_frontier.append(neighbor)
+                        elif xs[neighbor] != x or ys[neighbor] != y:
+                            self.conflicts.append((node, neighbor))
+                            self.inconsistent_components.add(root)
+                frontier = next_frontier
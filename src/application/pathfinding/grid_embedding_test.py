@@ -0,0 +1,50 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.grid_embedding import GridEmbedding
+
+class TestGridEmbedding:
+    """Test cases for grid coordinate inference."""
+
+    @pytest.fixture
+    def graph(self, basic_map: dict[str, Location]) -> LocationGraph:
+        """Create a graph over the basic map plus an isolated location."""
+        graph = LocationGraph.from_locations(basic_map)
+        graph.add_location(Location("Island"))
+        return graph
+
+    def test_coordinates(self, graph: LocationGraph) -> None:
+        """Test that coordinates follow connection directions."""
+        embedding = GridEmbedding(graph)
+        assert embedding.coordinates(0) == (0, 0)
+        assert embedding.coordinates(1) == (0, -1)
+        assert embedding.coordinates(2) == (1, -1)
+        assert embedding.conflicts == []
+        assert embedding.is_consistent(0)
+
+    def test_components(self, graph: LocationGraph) -> None:
+        """Test that each component is laid out from its own origin."""
+        embedding = GridEmbedding(graph)
+        assert embedding.components.tolist() == [0, 0, 0, 3]
+        assert embedding.coordinates(3) == (0, 0)
+
+    def test_conflict(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test that a loop that does not close on the grid is flagged."""
+        # Mountain is south-east of Forest, so an east link between them contradicts the layout
+        basic_map["Forest"].add_connection(Direction.EAST, "Mountain")
+        basic_map["Mountain"].add_connection(Direction.WEST, "Forest")
+        graph.update_location(basic_map["Forest"])
+        graph.update_location(basic_map["Mountain"])
+
+        embedding = GridEmbedding(graph)
+        assert embedding.conflicts
+        assert not embedding.is_consistent(0)
+        assert embedding.is_consistent(3)
+
+    def test_is_current(self, graph: LocationGraph) -> None:
+        """Test that the layout goes stale when the graph changes."""
+        embedding = GridEmbedding(graph)
+        assert embedding.is_current
+        graph.add_location(Location("Cave"))
+        assert not embedding.is_current
@@ -0,0 +1,374 @@
+import heapq
+from array import array
+from typing import AbstractSet, Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DIRECTIONS, DEGREE, NO_NODE
+
+DEFAULT_CLUSTER_SIZE = 256
+
+class RegionHierarchy:
+    """Two-level map of clusters for path queries on very large maps.
+
+    Locations are partitioned into clusters of at most ``cluster_size``
+    nodes, grown breadth-first in id order. An entrance is a location with
+    a connection to or from another cluster. For each cluster the distances
+    between its entrances, staying inside the cluster, form the abstract
+    graph; these tables are computed the first time a search reaches the
+    cluster and are dropped only for clusters touched by an edit.
+
+    A query searches inside the start and end clusters, runs Dijkstra over
+    the abstract graph and refines each abstract hop by a search inside a
+    single cluster. Every path decomposes into such in-cluster segments
+    joined by crossing connections, so the result is an exact shortest path
+    (travel costs included). Among equally short routes it may pick a
+    different one than the flat search does.
+    """
+
+    def __init__(self, graph: LocationGraph, cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        if cluster_size < 1:
+            raise ValueError("Cluster size must be at least 1")
+        self.graph = graph
+        self.cluster_size = cluster_size
+        self.version = graph.version
+        self.cluster_of = array('i')
+        self.members: list[list[int]] = []
+        self._boundary: list[set[int]] = []
+        self._tables: dict[int, dict[int, list[tuple[int, int, int]]]] = {}
+        self._partitioned = 0
+        self._build()
+
+    def refresh(self) -> set[int]:
+        """Catch up with graph edits, returning the clusters that were invalidated.
+
+        Connection changes only invalidate the clusters at either end.
+        New locations join a neighbouring cluster with room; once a quarter
+        of the map has been added since the partition was made, or if the
+        edit history is gone, the whole map is partitioned again.
+        """
+        graph = self.graph
+        if self.version == graph.version:
+            return set()
+        changes = graph.changes_since(self.version)
+        added = len(graph) - len(self.cluster_of)
+        if changes is None or added < 0 or len(graph) - self._partitioned > self._partitioned // 4:
+            self._build()
+            return set(range(len(self.members)))
+
+        affected = set()
+        for node in range(len(self.cluster_of), len(graph)):
+            affected.add(self._place(node))
+
+        cluster_of = self.cluster_of
+        targets = graph.targets
+        changed_slots = set()
+        for _, slot, previous, _ in changes:
+            affected.add(cluster_of[slot // DEGREE])
+            self._boundary[cluster_of[slot // DEGREE]].discard(slot)
+            if previous != NO_NODE:
+                affected.add(cluster_of[previous])
+                self._boundary[cluster_of[previous]].discard(slot)
+            changed_slots.add(slot)
+        for slot in changed_slots:
+            target = targets[slot]
+            if target != NO_NODE:
+                affected.add(cluster_of[target])
+                self._mark_crossing(slot, target)
+
+        for cluster in affected:
+            self._tables.pop(cluster, None)
+        self.version = graph.version
+        return affected
+
+    def find_path(self, source: int, target: int) -> Optional[list[Direction]]:
+        """Find a shortest path between two locations, or None if unreachable."""
+        self.refresh()
+        cluster_of = self.cluster_of
+        source_cluster = cluster_of[source]
+        target_cluster = cluster_of[target]
+
+        source_costs, source_parents, _ = self._local_search(source, source_cluster)
+        to_target = self._reverse_costs(target, target_cluster)
+
+        best = source_costs.get(target, -1) if source_cluster == target_cluster else -1
+        best_via = NO_NODE
+        costs: dict[int, int] = {}
+        # How each entrance was reached: None from the source, else (previous entrance, crossing slot or -1)
+        reached: dict[int, Optional[tuple[int, int]]] = {}
+        heap: list[tuple[int, int]] = []
+        for entrance in self._entrances(source_cluster):
+            cost = source_costs.get(entrance)
+            if cost is not None:
+                costs[entrance] = cost
+                reached[entrance] = None
+                heap.append((cost, entrance))
+        heapq.heapify(heap)
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > costs[node]:
+                continue
+            if best != -1 and cost >= best:
+                break
+            if node in to_target and cluster_of[node] == target_cluster:
+                total = cost + to_target[node]
+                if best == -1 or total < best:
+                    best, best_via = total, node
+            for other, weight, slot in self._table(cluster_of[node])[node]:
+                other_cost = cost + weight
+                known = costs.get(other)
+                if known is None or other_cost < known:
+                    costs[other] = other_cost
+                    reached[other] = (node, slot)
+                    heapq.heappush(heap, (other_cost, other))
+
+        if best == -1:
+            return None
+        if best_via == NO_NODE:
+            return self._walk(source_parents, source, target)
+
+        _, final_parents, _ = self._local_search(best_via, target_cluster)
+        segments = [self._walk(final_parents, best_via, target)]
+        node = best_via
+        while True:
+            step = reached[node]
+            if step is None:
+                segments.append(self._walk(source_parents, source, node))
+                break
+            previous, slot = step
+            if slot == -1:
+                _, parents, _ = self._local_search(previous, cluster_of[previous])
+                segments.append(self._walk(parents, previous, node))
+            else:
+                segments.append([DIRECTIONS[slot % DEGREE]])
+            node = previous
+        return [direction for segment in reversed(segments) for direction in segment]
+
+    def _build(self) -> None:
+        """Partition the whole graph into clusters."""
+        graph = self.graph
+        self.version = graph.version
+        self.cluster_of = array('i', [NO_NODE]) * len(graph)
+        self.members = []
+        self._boundary = []
+        self._tables = {}
+        self._partitioned = len(graph)
+
+        targets = graph.targets
+        cluster_of = self.cluster_of
+        for seed in range(len(graph)):
+            if cluster_of[seed] != NO_NODE:
+                continue
+            cluster = len(self.members)
+            group = [seed]
+            cluster_of[seed] = cluster
+            index = 0
+            while index < len(group) and len(group) < self.cluster_size:
+                base = group[index] * DEGREE
+                index += 1
+                for code in range(DEGREE):
+                    neighbor = targets[base + code]
+                    if neighbor != NO_NODE and cluster_of[neighbor] == NO_NODE:
+                        cluster_of[neighbor] = cluster
+                        group.append(neighbor)
+                        if len(group) == self.cluster_size:
+                            break
+            self.members.append(group)
+            self._boundary.append(set())
+
+        for slot, target in enumerate(targets):
+            if target != NO_NODE:
+                self._mark_crossing(slot, target)
+
+    def _place(self, node: int) -> int:
+        """Put a new location in the cluster of a neighbour with room, or its own."""
+        targets = self.graph.targets
+        cluster_of = self.cluster_of
+        cluster_of.append(NO_NODE)
+        base = node * DEGREE
+        for code in range(DEGREE):
+            neighbor = targets[base + code]
+            if neighbor != NO_NODE and neighbor < node:
+                cluster = cluster_of[neighbor]
+                if len(self.members[cluster]) < self.cluster_size:
+                    break
+        else:
+            cluster = len(self.members)
+            self.members.append([])
+            self._boundary.append(set())
+        cluster_of[node] = cluster
+        self.members[cluster].append(node)
+        return cluster
+
+    def _mark_crossing(self, slot: int, target: int) -> None:
+        """Record a slot on the boundary of both clusters if it crosses between them."""
+        cluster = self.cluster_of[slot // DEGREE]
+        other = self.cluster_of[target]
+        if cluster != other:
+            self._boundary[cluster].add(slot)
+            self._boundary[other].add(slot)
+
+    def _entrances(self, cluster: int) -> list[int]:
+        """Get the locations of a cluster with a connection across its boundary."""
+        targets = self.graph.targets
+        cluster_of = self.cluster_of
+        entrances = set()
+        for slot in self._boundary[cluster]:
+            node = slot // DEGREE
+            entrances.add(node if cluster_of[node] == cluster else targets[slot])
+        return sorted(entrances)
+
+    def _table(self, cluster: int) -> dict[int, list[tuple[int, int, int]]]:
+        """Get the abstract edges leaving the entrances of a cluster.
+
+        Each entrance maps to (entrance, cost, slot) moves: in-cluster
+        distances to the other entrances with slot -1, and its connections
+        into other clusters with their slot. A distance is left out when
+        some shortest route for it passes through a third entrance, since
+        the abstract search can then take the two shorter hops instead.
+        Costs are positive, so the omitted distances are always covered by
+        the ones that are kept.
+        """
+        table = self._tables.get(cluster)
+        if table is None:
+            targets = self.graph.targets
+            weights = self.graph.weights
+            cluster_of = self.cluster_of
+            entrances = self._entrances(cluster)
+            members = set(entrances)
+            table = {}
+            for entrance in entrances:
+                costs, _, through = self._local_search(entrance, cluster, members)
+                moves = [
+                    (other, costs[other], -1)
+                    for other in entrances
+                    if other != entrance and other in costs and other not in through
+                ]
+                base = entrance * DEGREE
+                for slot in range(base, base + DEGREE):
+                    neighbor = targets[slot]
+                    if neighbor != NO_NODE and cluster_of[neighbor] != cluster:
+                        moves.append((neighbor, weights[slot], slot))
+                table[entrance] = moves
+            self._tables[cluster] = table
+        return table
+
+    def _local_search(
+        self,
+        source: int,
+        cluster: int,
+        entrances: AbstractSet[int] = frozenset()
+    ) -> tuple[dict[int, int], dict[int, int], set[int]]:
+        """Run Dijkstra from a location without leaving its cluster.
+
+        Returns the cost to every reached location, the slot each one was
+        entered through and the locations with a shortest route from the
+        source through one of the given entrances. Unit-cost maps use a
+        breadth-first search instead.
+        """
+        if not self.graph.weighted_edges:
+            return self._local_layers(source, cluster, entrances)
+        targets = self.graph.targets
+        weights = self.graph.weights
+        cluster_of = self.cluster_of
+        costs = {source: 0}
+        parents: dict[int, int] = {}
+        through: set[int] = set()
+        heap = [(0, source)]
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > costs[node]:
+                continue
+            passes = node in through or (node != source and node in entrances)
+            base = node * DEGREE
+            for code in range(DEGREE):
+                neighbor = targets[base + code]
+                if neighbor == NO_NODE or cluster_of[neighbor] != cluster:
+                    continue
+                next_cost = cost + weights[base + code]
+                known = costs.get(neighbor)
+                if known is None or next_cost < known:
+                    costs[neighbor] = next_cost
+                    parents[neighbor] = base + code
+                    heapq.heappush(heap, (next_cost, neighbor))
+                    if passes:
+                        through.add(neighbor)
+                    else:
+                        through.discard(neighbor)
+                elif next_cost == known and passes:
+                    through.add(neighbor)
+        return costs, parents, through
+
+    def _local_layers(
+        self,
+        source: int,
+        cluster: int,
+        entrances: AbstractSet[int]
+    ) -> tuple[dict[int, int], dict[int, int], set[int]]:
+        """Breadth-first version of _local_search for unit-cost maps."""
+        targets = self.graph.targets
+        cluster_of = self.cluster_of
+        costs = {source: 0}
+        parents: dict[int, int] = {}
+        through: set[int] = set()
+        frontier = [source]
+        cost = 0
+        while frontier:
+            cost += 1
+            next_frontier = []
+            for node in frontier:
+                passes = node in through or (node != source and node in entrances)
+                base = node * DEGREE
+                for code in range(DEGREE):
+                    neighbor = targets[base + code]
+                    if neighbor == NO_NODE or cluster_of[neighbor] != cluster:
+                        continue
+                    known = costs.get(neighbor)
+                    if known is None:
+                        costs[neighbor] = cost
+                        parents[neighbor] = base + code
+                        next_frontier.append(neighbor)
+                        if passes:
+                            through.add(neighbor)
+                    elif known == cost and passes:
+                        through.add(neighbor)
+            frontier = next_frontier
+        return costs, parents, through
+
+    def _reverse_costs(self, target: int, cluster: int) -> dict[int, int]:
+        """Get the in-cluster cost from every location of a cluster to a target."""
+        targets = self.graph.targets
+        weights = self.graph.weights
+        cluster_of = self.cluster_of
+        incoming: dict[int, list[tuple[int, int]]] = {}
+        for node in self.members[cluster]:
+            base = node * DEGREE
+            for code in range(DEGREE):
+                neighbor = targets[base + code]
+                if neighbor != NO_NODE and cluster_of[neighbor] == cluster:
+                    incoming.setdefault(neighbor, []).append((node, weights[base + code]))
+
+        costs = {target: 0}
+        heap = [(0, target)]
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > costs[node]:
+                continue
+            for previous, weight in incoming.get(node, ()):
+                next_cost = cost + weight
+                known = costs.get(previous)
+                if known is None or next_cost < known:
+                    costs[previous] = next_cost
+                    heapq.heappush(heap, (next_cost, previous))
+        return costs
+
+    @staticmethod
+    def _walk(parents: dict[int, int], source: int, target: int) -> list[Direction]:
+        """Rebuild directions from the entry slots of a local search."""
+        path = []
+        node = target
+        while node != source:
+            slot = parents[node]
+            path.append(DIRECTIONS[slot % DEGREE])
+            node = slot // DEGREE
+        path.reverse()
+        return path
@@ -0,0 +1,97 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph, DIRECTION_CODES, DEGREE
+from src.application.pathfinding.hierarchy import RegionHierarchy
+from src.application.pathfinding.astar_test import grid_locations
+from src.application.pathfinding import breadth_first
+
+def path_cost(graph: LocationGraph, source: int, path: list[Direction]) -> tuple[int, int]:
+    """Follow a path, returning the node it ends at and its total cost."""
+    node, total = source, 0
+    for direction in path:
+        slot = node * DEGREE + DIRECTION_CODES[direction]
+        total += graph.weights[slot]
+        node = graph.targets[slot]
+    return node, total
+
+class TestRegionHierarchy:
+    """Test cases for cluster-based hierarchical path search."""
+
+    @pytest.fixture
+    def locations(self) -> dict[str, Location]:
+        """Create a grid with a wall that forces a detour."""
+        return grid_locations(6, 6, {(2, y) for y in range(0, 5)})
+
+    @pytest.fixture
+    def graph(self, locations: dict[str, Location]) -> LocationGraph:
+        return LocationGraph.from_locations(locations)
+
+    def assert_exact(self, graph: LocationGraph, hierarchy: RegionHierarchy) -> None:
+        """Check every pair of locations against the flat search."""
+        for source in range(len(graph)):
+            for target in range(len(graph)):
+                expected = breadth_first.find_path(graph, source, target)
+                path = hierarchy.find_path(source, target)
+                if expected is None:
+                    assert path is None
+                else:
+                    assert path is not None
+                    assert path_cost(graph, source, path) == path_cost(graph, source, expected)
+
+    def test_clusters_are_bounded(self, graph: LocationGraph) -> None:
+        """Test that every location is placed in a cluster of bounded size."""
+        hierarchy = RegionHierarchy(graph, 4)
+        assert all(0 < len(members) <= 4 for members in hierarchy.members)
+        assert sorted(node for members in hierarchy.members for node in members) == list(range(len(graph)))
+
+    def test_paths_are_exact(self, graph: LocationGraph) -> None:
+        """Test that hierarchical paths are as short as flat ones."""
+        self.assert_exact(graph, RegionHierarchy(graph, 4))
+
+    def test_travel_costs_and_one_way_connections(self, locations: dict[str, Location]) -> None:
+        """Test exactness with costly and one-way connections."""
+        locations["0,0"].add_connection(Direction.EAST, "1,0", 5)
+        locations["1,5"].add_connection(Direction.SOUTH, "5,0")
+        graph = LocationGraph.from_locations(locations)
+        self.assert_exact(graph, RegionHierarchy(graph, 3))
+
+    def test_unreachable(self) -> None:
+        """Test that disconnected locations have no path."""
+        graph = LocationGraph.from_locations({"Camp": Location("Camp"), "Island": Location("Island")})
+        assert RegionHierarchy(graph).find_path(0, 1) is None
+        assert RegionHierarchy(graph).find_path(0, 0) == []
+
+    def test_edit_rebuilds_only_touched_clusters(self, graph: LocationGraph, locations: dict[str, Location]) -> None:
+        """Test that a new connection invalidates just the clusters it joins."""
+        hierarchy = RegionHierarchy(graph, 4)
+        hierarchy.find_path(0, len(graph) - 1)
+
+        locations["1,0"].add_connection(Direction.EAST, "3,0")
+        locations["3,0"].add_connection(Direction.WEST, "1,0")
+        graph.update_location(locations["1,0"])
+        graph.update_location(locations["3,0"])
+        affected = hierarchy.refresh()
+
+        ends = {hierarchy.cluster_of[graph.id_of(name) or 0] for name in ("1,0", "3,0")}
+        assert affected == ends
+        self.assert_exact(graph, hierarchy)
+
+    def test_new_locations(self, graph: LocationGraph, locations: dict[str, Location]) -> None:
+        """Test that added locations are placed without repartitioning."""
+        hierarchy = RegionHierarchy(graph, 4)
+        clusters = len(hierarchy.members)
+        cellar = Location("Cellar")
+        cellar.add_connection(Direction.NORTH, "0,0")
+        locations["0,0"].add_connection(Direction.SOUTH, "Cellar")
+        graph.add_location(cellar)
+        graph.update_location(locations["0,0"])
+
+        hierarchy.refresh()
+        assert len(hierarchy.cluster_of) == len(graph)
+        assert len(hierarchy.members) in (clusters, clusters + 1)
+        self.assert_exact(graph, hierarchy)
+
+    def test_invalid_cluster_size(self, graph: LocationGraph) -> None:
+        with pytest.raises(ValueError):
+            RegionHierarchy(graph, 0)
@@ -0,0 +1,224 @@
+import heapq
+import json
+import sys
+from array import array
+from typing import Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DEGREE, NO_NODE
+from .breadth_first import expand_from, new_parents, walk_back
+
+DEFAULT_LANDMARKS = 8
+UNREACHABLE = 0xFFFFFFFF
+
+class LandmarkTable:
+    """Distances to and from a few landmark locations, for A* lower bounds.
+
+    For every landmark ``L`` the table keeps ``forward[i][v]``, the cost
+    from ``L`` to ``v``, and ``backward[i][v]``, the cost from ``v`` to
+    ``L``, as ``array('I')`` indexed by location id with ``UNREACHABLE``
+    for no route. On maps without one-way connections or travel costs both
+    directions are the same array. By the triangle inequality
+    ``forward[i][t] - forward[i][v]`` and ``backward[i][v] - backward[i][t]``
+    never exceed the cost from ``v`` to ``t``, so their maximum over all
+    landmarks is an admissible and consistent A* heuristic.
+
+    Landmarks are picked in the largest connected region, one at a time as
+    the location furthest from the ones already chosen, which spreads them
+    over the rim of the map. Elsewhere the bound is 0 and the search falls
+    back to plain Dijkstra.
+    """
+
+    def __init__(self, graph: LocationGraph, landmarks: list[int], forward: list[array], backward: list[array]):
+        self.graph = graph
+        self.version = graph.version
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    @classmethod
+    def build(cls, graph: LocationGraph, count: int = DEFAULT_LANDMARKS) -> 'LandmarkTable':
+        """Pick up to count landmarks and compute their distance arrays."""
+        if count < 1:
+            raise ValueError("Landmark count must be at least 1")
+        symmetric = graph.one_way_edges == 0 and graph.weighted_edges == 0
+        landmarks: list[int] = []
+        forward: list[array] = []
+        backward: list[array] = []
+        size = len(graph)
+        if not size:
+            return cls(graph, landmarks, forward, backward)
+
+        # Start from the location furthest from one in the largest component
+        seed = graph.component_index().groups()[0][0]
+        closest = array('I', (0 if d == UNREACHABLE else d for d in _distances_from(graph, seed)))
+        while len(landmarks) < min(count, size):
+            landmark = max(range(size), key=closest.__getitem__)
+            if landmarks and closest[landmark] == 0:
+                break
+            distances = _distances_from(graph, landmark)
+            landmarks.append(landmark)
+            forward.append(distances)
+            backward.append(distances if symmetric else _distances_to(graph, landmark))
+            closest = array('I', map(min, closest, distances))
+            closest[landmark] = 0
+        return cls(graph, landmarks, forward, backward)
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the graph has changed since the table was built."""
+        return self.version == self.graph.version
+
+    @property
+    def symmetric(self) -> bool:
+        """Check whether the distances to and from each landmark are shared."""
+        return all(forward is backward for forward, backward in zip(self.forward, self.backward))
+
+    def lower_bound(self, node: int, target: int) -> int:
+        """Get a lower bound on the cost of travelling from node to target."""
+        bound = 0
+        for forward, backward in zip(self.forward, self.backward):
+            to_target, to_node = forward[target], forward[node]
+            if to_target != UNREACHABLE and to_node != UNREACHABLE and to_target - to_node > bound:
+                bound = to_target - to_node
+            from_node, from_target = backward[node], backward[target]
+            if from_node != UNREACHABLE and from_target != UNREACHABLE and from_node - from_target > bound:
+                bound = from_node - from_target
+        return bound
+
+    def to_bytes(self) -> bytes:
+        """Serialize the table with a header identifying the graph it belongs to."""
+        symmetric = self.symmetric
+        header = {
+            "graph": self.graph.content_hash(),
+            "size": len(self.graph),
+            "byteorder": sys.byteorder,
+            "landmarks": [self.graph.names[landmark] for landmark in self.landmarks],
+            "symmetric": symmetric
+        }
+        arrays = self.forward if symmetric else self.forward + self.backward
+        return json.dumps(header).encode('utf-8') + b"\n" + b"".join(values.tobytes() for values in arrays)
+
+    @classmethod
+    def from_bytes(cls, graph: LocationGraph, data: bytes) -> Optional['LandmarkTable']:
+        """Restore a serialized table, or return None if it was made for another map."""
+        header_bytes, _, body = data.partition(b"\n")
+        try:
+            header = json.loads(header_bytes)
+        except ValueError:
+            return None
+        if (
+            not isinstance(header, dict)
+            or header.get("graph") != graph.content_hash()
+            or header.get("size") != len(graph)
+            or header.get("byteorder") != sys.byteorder
+            or not isinstance(header.get("landmarks"), list)
+            or not all(isinstance(name, str) for name in header["landmarks"])
+            or not isinstance(header.get("symmetric"), bool)
+        ):
+            return None
+
+        landmarks = [graph.id_of(name) for name in header["landmarks"]]
+        arrays = []
+        width = len(graph) * array('I').itemsize
+        for offset in range(0, len(body), width):
+            values = array('I')
+            values.frombytes(body[offset:offset + width])
+            arrays.append(values)
+        expected = len(landmarks) * (1 if header["symmetric"] else 2)
+        if None in landmarks or len(arrays) != expected:
+            return None
+        forward = arrays[:len(landmarks)]
+        backward = forward if header["symmetric"] else arrays[len(landmarks):]
+        return cls(graph, [landmark for landmark in landmarks if landmark is not None], forward, backward)
+
+def find_path(graph: LocationGraph, table: LandmarkTable, source: int, target: int) -> Optional[list[Direction]]:
+    """Find a shortest path with A* guided by landmark lower bounds.
+
+    Works with travel costs and one-way connections. As in the grid A*,
+    ties on the estimate prefer the node furthest from the source.
+    """
+    targets = graph.targets
+    weights = graph.weights
+    bounds = [
+        (forward, backward, forward[target], backward[target])
+        for forward, backward in zip(table.forward, table.backward)
+    ]
+
+    def estimate(node: int) -> int:
+        bound = 0
+        for forward, backward, to_target, from_target in bounds:
+            to_node = forward[node]
+            if to_target != UNREACHABLE and to_node != UNREACHABLE and to_target - to_node > bound:
+                bound = to_target - to_node
+            from_node = backward[node]
+            if from_node != UNREACHABLE and from_target != UNREACHABLE and from_node - from_target > bound:
+                bound = from_node - from_target
+        return bound
+
+    costs = array('q', [-1]) * len(graph)
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    costs[source] = 0
+    parents[source] = source
+    heap = [(estimate(source), 0, source)]
+
+    while heap:
+        _, negative_cost, node = heapq.heappop(heap)
+        if node == target:
+            return walk_back(parents, codes, source, target)
+        cost = -negative_cost
+        if cost != costs[node]:
+            continue
+
+        base = node * DEGREE
+        for code in range(DEGREE):
+            neighbor = targets[base + code]
+            if neighbor == NO_NODE:
+                continue
+            next_cost = cost + weights[base + code]
+            known = costs[neighbor]
+            if known != -1 and known <= next_cost:
+                continue
+            costs[neighbor] = next_cost
+            parents[neighbor] = node
+            codes[neighbor] = code
+            heapq.heappush(heap, (next_cost + estimate(neighbor), -next_cost, neighbor))
+
+    return None
+
+def _distances_from(graph: LocationGraph, source: int) -> array:
+    """Get the cost from a location to every other one."""
+    weights = graph.weights
+    distances = array('I', [UNREACHABLE]) * len(graph)
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    distances[source] = 0
+    for group in expand_from(graph, source, parents, codes):
+        for node in group:
+            if node != source:
+                parent = parents[node]
+                distances[node] = distances[parent] + weights[parent * DEGREE + codes[node]]
+    return distances
+
+def _distances_to(graph: LocationGraph, target: int) -> array:
+    """Get the cost from every location to a target by searching connections backwards."""
+    targets = graph.targets
+    weights = graph.weights
+    incoming: list[list[tuple[int, int]]] = [[] for _ in range(len(graph))]
+    for slot, neighbor in enumerate(targets):
+        if neighbor != NO_NODE:
+            incoming[neighbor].append((slot // DEGREE, weights[slot]))
+
+    distances = array('I', [UNREACHABLE]) * len(graph)
+    distances[target] = 0
+    heap = [(0, target)]
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if cost != distances[node]:
+            continue
+        for previous, weight in incoming[node]:
+            next_cost = cost + weight
+            if next_cost < distances[previous]:
+                distances[previous] = next_cost
+                heapq.heappush(heap, (next_cost, previous))
+    return distances
@@ -0,0 +1,97 @@
+import json
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.landmarks import LandmarkTable, UNREACHABLE, find_path
+from src.application.pathfinding.astar_test import grid_locations
+from src.application.pathfinding.hierarchy_test import path_cost
+from src.application.pathfinding import breadth_first
+
+class TestLandmarks:
+    """Test cases for landmark distance tables and ALT search."""
+
+    @pytest.fixture
+    def locations(self) -> dict[str, Location]:
+        """Create a grid with a wall that forces a detour."""
+        return grid_locations(6, 6, {(2, y) for y in range(0, 5)})
+
+    @pytest.fixture
+    def graph(self, locations: dict[str, Location]) -> LocationGraph:
+        return LocationGraph.from_locations(locations)
+
+    def assert_exact(self, graph: LocationGraph, table: LandmarkTable) -> None:
+        """Check every pair of locations against the flat search."""
+        for source in range(len(graph)):
+            for target in range(len(graph)):
+                expected = breadth_first.find_path(graph, source, target)
+                path = find_path(graph, table, source, target)
+                if expected is None:
+                    assert path is None
+                else:
+                    assert path is not None
+                    cost = path_cost(graph, source, expected)
+                    assert path_cost(graph, source, path) == cost
+                    assert table.lower_bound(source, target) <= cost[1]
+
+    def test_build(self, graph: LocationGraph) -> None:
+        """Test that landmarks are distinct and their distances are filled in."""
+        table = LandmarkTable.build(graph, 4)
+        assert len(set(table.landmarks)) == 4
+        assert table.symmetric
+        for landmark, distances in zip(table.landmarks, table.forward):
+            assert distances[landmark] == 0
+            assert UNREACHABLE not in distances
+
+    def test_paths_are_exact(self, graph: LocationGraph) -> None:
+        """Test that ALT paths are as short as flat ones."""
+        self.assert_exact(graph, LandmarkTable.build(graph, 3))
+
+    def test_travel_costs_and_one_way_connections(self, locations: dict[str, Location]) -> None:
+        """Test exactness with costly and one-way connections."""
+        locations["0,0"].add_connection(Direction.EAST, "1,0", 5)
+        locations["1,5"].add_connection(Direction.SOUTH, "5,0")
+        graph = LocationGraph.from_locations(locations)
+        table = LandmarkTable.build(graph, 3)
+        assert not table.symmetric
+        self.assert_exact(graph, table)
+
+    def test_landmarks_in_largest_region(self, locations: dict[str, Location]) -> None:
+        """Test that small disconnected regions do not use up landmarks."""
+        locations.update({name: Location(name) for name in ["Island", "Rock"]})
+        graph = LocationGraph.from_locations(locations)
+        table = LandmarkTable.build(graph, 2)
+        assert graph.id_of("Island") not in table.landmarks
+        assert find_path(graph, table, graph.id_of("Island") or 0, 0) is None
+
+    def test_round_trip(self, graph: LocationGraph) -> None:
+        """Test restoring a serialized table."""
+        table = LandmarkTable.build(graph, 3)
+        restored = LandmarkTable.from_bytes(graph, table.to_bytes())
+        assert restored is not None
+        assert restored.landmarks == table.landmarks
+        assert restored.forward == table.forward
+        assert restored.symmetric
+
+    def test_rejects_other_map(self, graph: LocationGraph, locations: dict[str, Location]) -> None:
+        """Test that a table saved for a different map is not reused."""
+        data = LandmarkTable.build(graph, 3).to_bytes()
+        locations["0,0"].add_connection(Direction.EAST, "1,0", 2)
+        assert LandmarkTable.from_bytes(LocationGraph.from_locations(locations), data) is None
+        assert LandmarkTable.from_bytes(graph, b"not a table") is None
+
+    def test_rejects_malformed_header(self, graph: LocationGraph) -> None:
+        """Test that a header that is not a complete table description is not used."""
+        data = LandmarkTable.build(graph, 3).to_bytes()
+        header, _, body = data.partition(b"\n")
+        fields = json.loads(header)
+        assert LandmarkTable.from_bytes(graph, b"[1]\n" + body) is None
+        for key in ("landmarks", "symmetric"):
+            broken = {name: value for name, value in fields.items() if name != key}
+            assert LandmarkTable.from_bytes(graph, json.dumps(broken).encode() + b"\n" + body) is None
+        broken = dict(fields, landmarks=[["0,0"]])
+        assert LandmarkTable.from_bytes(graph, json.dumps(broken).encode() + b"\n" + body) is None
+
+    def test_invalid_count(self, graph: LocationGraph) -> None:
+        with pytest.raises(ValueError):
+            LandmarkTable.build(graph, 0)
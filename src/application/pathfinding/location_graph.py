@@ -0,0 +1,275 @@
+import hashlib
+from array import array
+from typing import Iterator, Optional
+from ...domain.entities.location import Location
+from ...domain.entities.direction import Direction
+from .components import ComponentIndex
+
+DIRECTIONS: tuple[Direction, ...] = tuple(Direction)
+DIRECTION_CODES: dict[Direction, int] = {d: code for code, d in enumerate(DIRECTIONS)}
+DEGREE = len(DIRECTIONS)
+NO_NODE = -1
+JOURNAL_LIMIT = 4096
+
+class LocationGraph:
+    """Integer-indexed adjacency of the location map.
+
+    Location names are mapped to dense ids in insertion order. Since a
+    location has at most one connection per direction, the adjacency is a
+    fixed-stride CSR: the edges of node ``i`` live in ``targets[i * DEGREE:
+    (i + 1) * DEGREE]`` and the slot offset is the direction code. Missing
+    connections hold ``NO_NODE``. This keeps updates O(1) while traversals
+    only touch flat integer arrays.
+
+    ``version`` increases on every change to the set of locations or their
+    connections, so derived structures can tell when they are stale.
+    ``one_way_edges`` counts connections without a return connection;
+    searches that walk edges backwards rely on it being zero. A union-find
+    component index is merged as connections are added and rebuilt only
+    after a connection has been removed or redirected.
+
+    ``weights`` holds the travel cost of each slot (1 by default) and
+    ``weighted_edges`` counts slots with any other cost, so searches can
+    keep the unit-cost fast path while it is zero.
+
+    Slot changes are also kept in a bounded journal so derived structures
+    can catch up on a few edits instead of being rebuilt; ``changes_since``
+    returns None once the edits they missed are no longer all recorded.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self.names: list[str] = []
+        self.targets = array('i')
+        self.weights = array('I')
+        self.weighted_edges = 0
+        self.version = 0
+        self.one_way_edges = 0
+        self._components = ComponentIndex()
+        self._components_split = False
+        # Connections whose target location has not been added yet
+        self._pending: dict[int, str] = {}
+        self._waiting: dict[str, set[int]] = {}
+        # (version, slot, previous target, previous weight) per slot change
+        self._journal: list[tuple[int, int, int, int]] = []
+        self._journal_floor = 0
+
+    @classmethod
+    def from_locations(cls, locations: dict[str, Location]) -> 'LocationGraph':
+        """Build a graph from a name -> location mapping in one pass."""
+        graph = cls()
+        graph.names = list(locations)
+        graph._ids = {name: node for node, name in enumerate(graph.names)}
+        targets = array('i', [NO_NODE]) * (len(graph.names) * DEGREE)
+        weights = array('I', [1]) * len(targets)
+        for node, location in enumerate(locations.values()):
+            base = node * DEGREE
+            for direction, target in location.connections.items():
+                slot = base + DIRECTION_CODES[direction]
+                cost = location.connection_costs.get(direction, 1)
+                if cost != 1:
+                    weights[slot] = cost
+                    graph.weighted_edges += 1
+                target_id = graph._ids.get(target)
+                if target_id is None:
+                    graph._pending[slot] = target
+                    graph._waiting.setdefault(target, set()).add(slot)
+                else:
+                    targets[slot] = target_id
+        graph.targets = targets
+        graph.weights = weights
+
+        for slot, target_id in enumerate(targets):
+            node = slot // DEGREE
+            if target_id not in (NO_NODE, node) and node not in targets[target_id * DEGREE:(target_id + 1) * DEGREE]:
+                graph.one_way_edges += 1
+        graph._components_split = True
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Get the id of a location, or None if it is not in the graph."""
+        return self._ids.get(name)
+
+    def add_location(self, location: Location) -> int:
+        """Add a location and its connections, returning its id."""
+        node = self._ids.get(location.name)
+        if node is None:
+            node = len(self.names)
+            self._ids[location.name] = node
+            self.names.append(location.name)
+            self.targets.extend([NO_NODE] * DEGREE)
+            self.weights.extend([1] * DEGREE)
+            self._components.add()
+            self.version += 1
+            for slot in self._waiting.pop(location.name, ()):
+                del self._pending[slot]
+                self._assign(slot, node)
+        self.update_location(location)
+        return node
+
+    def update_location(self, location: Location) -> None:
+        """Re-read the connections of an existing location."""
+        base = self._ids[location.name] * DEGREE
+        connections = location.connections
+        for direction, code in DIRECTION_CODES.items():
+            slot = base + code
+            target = connections.get(direction)
+            if target is None and self.targets[slot] == NO_NODE and slot not in self._pending:
+                continue
+            self._set_slot(slot, target)
+            self._set_weight(slot, location.connection_costs.get(direction, 1) if target else 1)
+
+    def content_hash(self) -> str:
+        """Get a digest of the location names, connections and travel costs.
+
+        Structures saved alongside a map use it to tell whether they still
+        match the graph they were computed from.
+        """
+        digest = hashlib.sha256()
+        digest.update("\0".join(self.names).encode('utf-8'))
+        digest.update(self.targets.tobytes())
+        digest.update(self.weights.tobytes())
+        return digest.hexdigest()
+
+    def changes_since(self, version: int) -> Optional[list[tuple[int, int, int, int]]]:
+        """Get the slot changes made after a version, oldest first.
+
+        Each entry is (version, slot, previous target, previous weight); the
+        current target and weight are read from the arrays. Returns None if
+        the journal no longer reaches back to the version or the graph has
+        been cleared since.
+        """
+        if version < self._journal_floor:
+            return None
+        journal = self._journal
+        start = len(journal)
+        while start and journal[start - 1][0] > version:
+            start -= 1
+        return journal[start:]
+
+    def component_index(self) -> ComponentIndex:
+        """Get the connected-component index, rebuilding it if edges were removed."""
+        if self._components_split:
+            components = ComponentIndex()
+            for _ in range(len(self.names)):
+                components.add()
+            for slot, target_id in enumerate(self.targets):
+                if target_id != NO_NODE:
+                    components.union(slot // DEGREE, target_id)
+            self._components = components
+            self._components_split = False
+        return self._components
+
+    def neighbors(self, node: int) -> Iterator[tuple[Direction, int]]:
+        """Yield (direction, neighbor id) pairs for a node."""
+        base = node * DEGREE
+        for code in range(DEGREE):
+            neighbor = self.targets[base + code]
+            if neighbor != NO_NODE:
+                yield DIRECTIONS[code], neighbor
+
+    def path_cost(self, source: int, path: list[Direction]) -> int:
+        """Add up the travel costs of following a path from a node."""
+        node, total = source, 0
+        for direction in path:
+            slot = node * DEGREE + DIRECTION_CODES[direction]
+            total += self.weights[slot]
+            node = self.targets[slot]
+        return total
+
+    def clear(self) -> None:
+        """Remove all locations and connections."""
+        self._ids.clear()
+        self.names.clear()
+        self.targets = array('i')
+        self.weights = array('I')
+        self.weighted_edges = 0
+        self._pending.clear()
+        self._waiting.clear()
+        self.one_way_edges = 0
+        self._components = ComponentIndex()
+        self._components_split = False
+        self.version += 1
+        self._journal.clear()
+        self._journal_floor = self.version
+
+    def _set_slot(self, slot: int, target: Optional[str]) -> None:
+        """Point an adjacency slot at a location name, or clear it."""
+        previous = self._pending.pop(slot, None)
+        if previous is not None:
+            waiting = self._waiting[previous]
+            waiting.discard(slot)
+            if not waiting:
+                del self._waiting[previous]
+
+        if target is None:
+            self._assign(slot, NO_NODE)
+            return
+
+        target_id = self._ids.get(target)
+        if target_id is None:
+            target_id = NO_NODE
+            self._pending[slot] = target
+            self._waiting.setdefault(target, set()).add(slot)
+        self._assign(slot, target_id)
+
+    def _set_weight(self, slot: int, cost: int) -> None:
+        """Store the travel cost of a slot."""
+        previous = self.weights[slot]
+        if previous == cost:
+            return
+        self.weighted_edges += (cost != 1) - (previous != 1)
+        self.weights[slot] = cost
+        self.version += 1
+        self._record(slot, self.targets[slot], previous)
+
+    def _assign(self, slot: int, target_id: int) -> None:
+        """Store a slot target, keeping version and one-way count current."""
+        targets = self.targets
+        previous = targets[slot]
+        if previous == target_id:
+            return
+        node = slot // DEGREE
+        delta = 0
+        if previous != NO_NODE:
+            delta -= self._one_way_between(node, previous)
+        if target_id != NO_NODE:
+            delta -= self._one_way_between(node, target_id)
+        targets[slot] = target_id
+        if previous != NO_NODE:
+            delta += self._one_way_between(node, previous)
+        if target_id != NO_NODE:
+            delta += self._one_way_between(node, target_id)
+        self.one_way_edges += delta
+        self.version += 1
+        self._record(slot, previous, self.weights[slot])
+        if previous != NO_NODE:
+            self._components_split = True
+        if target_id != NO_NODE and not self._components_split:
+            self._components.union(node, target_id)
+
+    def _record(self, slot: int, previous_target: int, previous_weight: int) -> None:
+        """Journal a slot change, dropping the older half once it is full."""
+        journal = self._journal
+        journal.append((self.version, slot, previous_target, previous_weight))
+        if len(journal) > JOURNAL_LIMIT:
+            half = len(journal) // 2
+            self._journal_floor = journal[half - 1][0]
+            del journal[:half]
+
+    def _one_way_between(self, node: int, other: int) -> int:
+        """Count connections between two nodes that have no return connection."""
+        if node == other:
+            return 0
+        targets = self.targets
+        outgoing = targets[node * DEGREE:(node + 1) * DEGREE].count(other)
+        incoming = targets[other * DEGREE:(other + 1) * DEGREE].count(node)
+        if outgoing and incoming:
+            return 0
+        return outgoing + incoming
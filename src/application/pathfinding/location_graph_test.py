@@ -0,0 +1,128 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph, DEGREE, DIRECTION_CODES, NO_NODE
+
+class TestLocationGraph:
+    """Test cases for the integer-indexed location graph."""
+
+    @pytest.fixture
+    def graph(self, basic_map: dict[str, Location]) -> LocationGraph:
+        """Create a graph over the basic map."""
+        return LocationGraph.from_locations(basic_map)
+
+    def test_ids_follow_insertion_order(self, graph: LocationGraph) -> None:
+        """Test that location ids are dense and in insertion order."""
+        assert len(graph) == 3
+        assert graph.names == ["Forest", "Beach", "Mountain"]
+        assert graph.id_of("Beach") == 1
+        assert graph.id_of("Nowhere") is None
+        assert "Mountain" in graph
+
+    def test_neighbors(self, graph: LocationGraph) -> None:
+        """Test reading connections back from the adjacency arrays."""
+        assert list(graph.neighbors(1)) == [(Direction.NORTH, 0), (Direction.EAST, 2)]
+        assert list(graph.neighbors(2)) == [(Direction.WEST, 1)]
+
+    def test_update_location(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test that updated connections replace the stored adjacency."""
+        mountain = basic_map["Mountain"]
+        mountain.add_connection(Direction.NORTH, "Forest")
+        graph.update_location(mountain)
+        assert list(graph.neighbors(2)) == [(Direction.NORTH, 0), (Direction.WEST, 1)]
+
+    def test_connection_to_location_added_later(self) -> None:
+        """Test that connections to not-yet-added locations are resolved on arrival."""
+        graph = LocationGraph()
+        forest = Location("Forest")
+        forest.add_connection(Direction.SOUTH, "Beach")
+        graph.add_location(forest)
+        assert list(graph.neighbors(0)) == []
+
+        beach = Location("Beach")
+        beach.add_connection(Direction.NORTH, "Forest")
+        graph.add_location(beach)
+        assert list(graph.neighbors(0)) == [(Direction.SOUTH, 1)]
+        assert list(graph.neighbors(1)) == [(Direction.NORTH, 0)]
+
+    def test_pending_connection_replaced(self) -> None:
+        """Test that a replaced pending connection is not resolved later."""
+        graph = LocationGraph()
+        forest = Location("Forest")
+        forest.add_connection(Direction.SOUTH, "Beach")
+        graph.add_location(forest)
+        forest.connections.clear()
+        graph.update_location(forest)
+
+        graph.add_location(Location("Beach"))
+        assert graph.targets[0:4].tolist() == [NO_NODE] * 4
+
+    def test_one_way_edges(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test counting connections without a return connection."""
+        assert graph.one_way_edges == 0
+
+        forest = basic_map["Forest"]
+        forest.add_connection(Direction.SOUTH, "Mountain")
+        graph.update_location(forest)
+        # Forest -> Mountain has no return, and Beach -> Forest lost its return
+        assert graph.one_way_edges == 2
+        assert LocationGraph.from_locations(basic_map).one_way_edges == 2
+
+        mountain = basic_map["Mountain"]
+        mountain.add_connection(Direction.NORTH, "Forest")
+        graph.update_location(mountain)
+        assert graph.one_way_edges == 1
+
+    def test_component_index(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test that components merge on new connections and split on removals."""
+        graph.add_location(Location("Island"))
+        components = graph.component_index()
+        assert components.connected(0, 2)
+        assert not components.connected(0, 3)
+
+        island = Location("Island")
+        island.add_connection(Direction.NORTH, "Mountain")
+        graph.update_location(island)
+        assert graph.component_index().connected(0, 3)
+
+        beach = basic_map["Beach"]
+        del beach.connections[Direction.EAST]
+        graph.update_location(beach)
+        mountain = basic_map["Mountain"]
+        mountain.connections.clear()
+        graph.update_location(mountain)
+        island.connections.clear()
+        graph.update_location(island)
+        assert not graph.component_index().connected(0, 2)
+
+    def test_clear(self, graph: LocationGraph) -> None:
+        """Test clearing the graph."""
+        graph.clear()
+        assert len(graph) == 0
+        assert len(graph.targets) == 0
+        assert "Forest" not in graph
+
+    def test_changes_since(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test that slot changes are journaled with their previous values."""
+        version = graph.version
+        assert graph.changes_since(version) == []
+
+        mountain = basic_map["Mountain"]
+        mountain.add_connection(Direction.NORTH, "Forest", 3)
+        graph.update_location(mountain)
+
+        slot = 2 * DEGREE + DIRECTION_CODES[Direction.NORTH]
+        changes = graph.changes_since(version)
+        assert changes is not None
+        assert [(changed, target, weight) for _, changed, target, weight in changes] == [
+            (slot, NO_NODE, 1),
+            (slot, 0, 1)
+        ]
+        assert graph.changes_since(graph.version) == []
+
+    def test_changes_since_after_clear(self, graph: LocationGraph) -> None:
+        """Test that history before a clear is reported as unavailable."""
+        version = graph.version
+        graph.clear()
+        assert graph.changes_since(version) is None
+        assert graph.changes_since(graph.version) == []
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class PathCache:
+    """Bounded LRU cache for route query results tied to a map version.
+
+    Every lookup passes the current map version. When it differs from the
+    version the cached entries were computed against, the cache is emptied
+    first, so a stale route can never be returned.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 0:
+            raise ValueError("Cache capacity must not be negative")
+        self.capacity = capacity
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, version: int, key: Hashable) -> tuple[bool, Any]:
+        """Look up a result, returning (found, value)."""
+        self._sync(version)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return (False, None)
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return (True, value)
+
+    def put(self, version: int, key: Hashable, value: Any) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        if self.capacity == 0:
+            return
+        self._sync(version)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get cache counters for sizing."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "capacity": self.capacity
+        }
+
+    def _sync(self, version: int) -> None:
+        """Empty the cache if the map version has moved on."""
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
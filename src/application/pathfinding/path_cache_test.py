@@ -0,0 +1,49 @@
+import pytest
+from src.application.pathfinding.path_cache import PathCache
+
+class TestPathCache:
+    """Test cases for the version-keyed LRU path cache."""
+
+    def test_hit_and_miss(self) -> None:
+        """Test counting hits and misses."""
+        cache = PathCache(2)
+        assert cache.get(1, "a") == (False, None)
+        cache.put(1, "a", [1])
+        assert cache.get(1, "a") == (True, [1])
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "capacity": 2}
+
+    def test_cached_none(self) -> None:
+        """Test that a cached None result counts as a hit."""
+        cache = PathCache(2)
+        cache.put(1, "a", None)
+        assert cache.get(1, "a") == (True, None)
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted."""
+        cache = PathCache(2)
+        cache.put(1, "a", 1)
+        cache.put(1, "b", 2)
+        cache.get(1, "a")
+        cache.put(1, "c", 3)
+        assert cache.get(1, "b") == (False, None)
+        assert cache.get(1, "a") == (True, 1)
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_version_change_invalidates(self) -> None:
+        """Test that entries from an older map version are never returned."""
+        cache = PathCache(2)
+        cache.put(1, "a", 1)
+        assert cache.get(2, "a") == (False, None)
+        assert len(cache) == 0
+
+    def test_zero_capacity(self) -> None:
+        """Test that a zero-capacity cache stores nothing."""
+        cache = PathCache(0)
+        cache.put(1, "a", 1)
+        assert cache.get(1, "a") == (False, None)
+
+    def test_negative_capacity(self) -> None:
+        """Test that a negative capacity is rejected."""
+        with pytest.raises(ValueError):
+            PathCache(-1)
@@ -0,0 +1,160 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Callable, Optional
+from ...domain.entities.direction import Direction
+from .location_graph import LocationGraph, DEGREE, NO_NODE
+from .breadth_first import expand_from, first_matches, new_parents, walk_back
+
+class ShortestPathTree:
+    """Shortest-path tree rooted at one location.
+
+    The tree is built once and answers any path query from its root by
+    walking parent pointers, in time proportional to the path length. It
+    records the graph version it was built against and must not be used
+    once ``is_current`` is False, unless ``repair`` brings it up to date.
+
+    ``costs`` holds the distance of every reached node (-1 elsewhere) and
+    ``layers`` the reached nodes grouped by distance, each group in name
+    order. Among equally short routes a node's parent is the one with the
+    lowest (cost, name, direction), which is the choice the breadth-first
+    and Dijkstra expansions make.
+    """
+
+    def __init__(self, graph: LocationGraph, root: int):
+        self.graph = graph
+        self.root = root
+        self.version = graph.version
+        self.parents = new_parents(graph)
+        self.codes = bytearray(len(graph))
+        self.costs = array('q', [-1]) * len(graph)
+        self.layers: list[list[int]] = []
+        weights = graph.weights
+        for layer in expand_from(graph, root, self.parents, self.codes):
+            for node in layer:
+                parent = self.parents[node]
+                self.costs[node] = 0 if node == root else self.costs[parent] + weights[parent * DEGREE + self.codes[node]]
+            self.layers.append(layer)
+        self._layer_costs = [self.costs[layer[0]] for layer in self.layers]
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the graph has changed since the tree was built."""
+        return self.version == self.graph.version
+
+    def repair(self) -> bool:
+        """Bring the tree up to date after connections were added.
+
+        Only nodes whose distance drops, or that gain an equally short
+        parent ranked before their current one, are revisited. Returns False
+        if connections were also removed, redirected or made costlier since,
+        if the edit history is gone, or if so much of the tree moves that a
+        rebuild is cheaper; the tree must then be rebuilt.
+        """
+        graph = self.graph
+        if self.is_current:
+            return True
+        changes = graph.changes_since(self.version)
+        if changes is None or len(graph) < len(self.parents):
+            return False
+
+        targets = graph.targets
+        weights = graph.weights
+        oldest: dict[int, tuple[int, int]] = {}
+        for _, slot, previous, previous_weight in changes:
+            oldest.setdefault(slot, (previous, previous_weight))
+        added = []
+        for slot, (previous, previous_weight) in oldest.items():
+            target = targets[slot]
+            if previous != NO_NODE and (previous != target or weights[slot] > previous_weight):
+                return False
+            if target != NO_NODE:
+                added.append(slot)
+
+        grown = len(graph) - len(self.parents)
+        self.parents.extend([NO_NODE] * grown)
+        self.codes.extend(bytes(grown))
+        self.costs.extend([-1] * grown)
+
+        moved: dict[int, int] = {}
+        heap: list[tuple[int, int]] = []
+        budget = len(graph) // 4
+        for slot in added:
+            self._relax(slot, moved, heap)
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost != self.costs[node]:
+                continue
+            if len(moved) > budget:
+                self.version = -1
+                return False
+            base = node * DEGREE
+            for slot in range(base, base + DEGREE):
+                if targets[slot] != NO_NODE:
+                    self._relax(slot, moved, heap)
+
+        self._regroup(moved)
+        self.version = graph.version
+        return True
+
+    def path_to(self, node: int) -> Optional[list[Direction]]:
+        """Get the directions from the root to a node, or None if unreachable."""
+        if self.parents[node] == NO_NODE:
+            return None
+        return walk_back(self.parents, self.codes, self.root, node)
+
+    def nearest_k(self, predicate: Callable[[int], bool], k: int) -> list[tuple[int, list[Direction]]]:
+        """Find the k closest nodes matching a predicate, closest first.
+
+        Equidistant matches resolve to the lowest id, as in a fresh search.
+        """
+        matches = first_matches(self.layers, predicate, k)
+        return [(node, walk_back(self.parents, self.codes, self.root, node)) for node in matches]
+
+    def _relax(self, slot: int, moved: dict[int, int], heap: list[tuple[int, int]]) -> None:
+        """Offer a connection as a parent link, queueing its target if it got closer."""
+        node = slot // DEGREE
+        cost = self.costs[node]
+        neighbor = self.graph.targets[slot]
+        if cost == -1 or neighbor == self.root:
+            return
+        next_cost = cost + self.graph.weights[slot]
+        known = self.costs[neighbor]
+        code = slot % DEGREE
+        if known == -1 or next_cost < known:
+            moved.setdefault(neighbor, known)
+            self.costs[neighbor] = next_cost
+            self.parents[neighbor] = node
+            self.codes[neighbor] = code
+            heapq.heappush(heap, (next_cost, neighbor))
+        elif next_cost == known:
+            names = self.graph.names
+            parent = self.parents[neighbor]
+            if (cost, names[node], code) < (self.costs[parent], names[parent], self.codes[neighbor]):
+                self.parents[neighbor] = node
+                self.codes[neighbor] = code
+
+    def _regroup(self, moved: dict[int, int]) -> None:
+        """Move nodes whose distance changed to the layer of their new distance."""
+        names = self.graph.names
+        touched = set()
+        for node, previous in moved.items():
+            if previous != -1:
+                self._layer_at(previous).remove(node)
+            layer = self._layer_at(self.costs[node])
+            layer.append(node)
+            touched.add(id(layer))
+        for layer in self.layers:
+            if id(layer) in touched:
+                layer.sort(key=names.__getitem__)
+        if any(not layer for layer in self.layers):
+            self.layers = [layer for layer in self.layers if layer]
+            self._layer_costs = [self.costs[layer[0]] for layer in self.layers]
+
+    def _layer_at(self, cost: int) -> list[int]:
+        """Get the layer of nodes at a distance, adding an empty one if needed."""
+        index = bisect_left(self._layer_costs, cost)
+        if index == len(self._layer_costs) or self._layer_costs[index] != cost:
+            self._layer_costs.insert(index, cost)
+            self.layers.insert(index, [])
+        return self.layers[index]
@@ -0,0 +1,80 @@
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.shortest_path_tree import ShortestPathTree
+
+class TestShortestPathTree:
+    """Test cases for the shortest-path tree."""
+
+    @pytest.fixture
+    def graph(self, basic_map: dict[str, Location]) -> LocationGraph:
+        """Create a graph over the basic map plus an isolated location."""
+        graph = LocationGraph.from_locations(basic_map)
+        graph.add_location(Location("Island"))
+        return graph
+
+    def test_path_to(self, graph: LocationGraph) -> None:
+        """Test answering paths from the root."""
+        tree = ShortestPathTree(graph, 0)
+        assert tree.path_to(0) == []
+        assert tree.path_to(2) == [Direction.SOUTH, Direction.EAST]
+        assert tree.path_to(3) is None
+
+    def test_layers(self, graph: LocationGraph) -> None:
+        """Test that nodes are grouped by distance from the root."""
+        tree = ShortestPathTree(graph, 0)
+        assert tree.layers == [[0], [1], [2]]
+
+    def test_nearest(self, graph: LocationGraph) -> None:
+        """Test finding the closest matching node from the tree."""
+        tree = ShortestPathTree(graph, 2)
+        assert tree.nearest_k(lambda node: node in (0, 1), 1) == [(1, [Direction.WEST])]
+        assert tree.nearest_k(lambda node: node == 3, 1) == []
+
+    def test_is_current(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test that the tree goes stale when connections change."""
+        tree = ShortestPathTree(graph, 0)
+        assert tree.is_current
+
+        graph.update_location(basic_map["Forest"])
+        assert tree.is_current
+
+        basic_map["Forest"].add_connection(Direction.EAST, "Island")
+        graph.update_location(basic_map["Forest"])
+        assert not tree.is_current
+
+    def test_repair_added_connection(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test patching a new connection into the tree instead of rebuilding it."""
+        tree = ShortestPathTree(graph, 0)
+        island = Location("Island")
+        island.add_connection(Direction.WEST, "Mountain")
+        basic_map["Mountain"].add_connection(Direction.EAST, "Island")
+        graph.update_location(island)
+        graph.update_location(basic_map["Mountain"])
+
+        assert tree.repair()
+        assert tree.is_current
+        assert tree.path_to(3) == [Direction.SOUTH, Direction.EAST, Direction.EAST]
+        fresh = ShortestPathTree(graph, 0)
+        assert tree.layers == fresh.layers == [[0], [1], [2], [3]]
+        assert list(tree.costs) == list(fresh.costs)
+
+    def test_repair_new_location(self, graph: LocationGraph) -> None:
+        """Test that locations added after the tree was built are covered."""
+        tree = ShortestPathTree(graph, 0)
+        cellar = Location("Cellar")
+        cellar.add_connection(Direction.NORTH, "Forest")
+        graph.add_location(cellar)
+
+        assert tree.repair()
+        assert tree.path_to(4) is None
+        assert len(tree.parents) == len(graph)
+
+    def test_repair_refuses_removed_connection(self, graph: LocationGraph, basic_map: dict[str, Location]) -> None:
+        """Test that removals are left to a rebuild."""
+        tree = ShortestPathTree(graph, 0)
+        beach = basic_map["Beach"]
+        del beach.connections[Direction.EAST]
+        graph.update_location(beach)
+        assert not tree.repair()
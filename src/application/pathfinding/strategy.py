@@ -0,0 +1,9 @@
+from enum import Enum
+
+class PathStrategy(Enum):
+    """Search algorithm used for point-to-point path queries."""
+    BREADTH_FIRST = "bfs"
+    BIDIRECTIONAL = "bidirectional"
+    ASTAR = "astar"
+    HIERARCHICAL = "hierarchical"
+    LANDMARKS = "alt"
@@ -0,0 +1,311 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from .location_graph import LocationGraph, DEGREE
+from .breadth_first import expand_from, new_parents
+
+EXACT_GROUPS = 8
+CANDIDATES_PER_GROUP = 5
+DEFAULT_TIME_LIMIT = 1.0
+RESTARTS = 30
+UNREACHABLE = float('inf')
+
+@dataclass(frozen=True)
+class Tour:
+    """Stops of a planned tour, its total travel cost and whether it is known to be optimal."""
+    stops: tuple[int, ...]
+    cost: int
+    exact: bool
+
+def plan_tour(
+    graph: LocationGraph,
+    source: int,
+    groups: list[set[int]],
+    return_to_source: bool = False,
+    time_limit: float = DEFAULT_TIME_LIMIT
+) -> Optional[Tour]:
+    """Find a short tour from source visiting at least one node of every group.
+
+    Only the ``CANDIDATES_PER_GROUP`` nodes of each group closest to the
+    source are considered as stops. Up to ``EXACT_GROUPS`` groups the tour
+    is the cheapest over those candidates, by dynamic programming over
+    (covered groups, last stop) states; it is marked exact when no
+    candidate was left out. Larger sets start from a greedy tour that is
+    improved by dropping, reversing, moving and replacing stops, then
+    perturbed and improved again while that keeps paying off and
+    time_limit seconds have not passed. Returns None if some group cannot
+    be reached.
+    """
+    deadline = time.monotonic() + time_limit
+    full = (1 << len(groups)) - 1
+    covered = group_mask(groups, source)
+    candidates, pruned = _candidates(graph, source, groups, covered)
+    if candidates is None:
+        return None
+    if covered == full:
+        return Tour((), 0, True)
+
+    nodes = [source] + candidates
+    covers = [group_mask(groups, node) for node in nodes]
+    table = distance_table(graph, nodes)
+    if len(groups) <= EXACT_GROUPS:
+        found = _exact(table, covers, full, return_to_source)
+        if found is None:
+            return None
+        order, cost = found
+        return Tour(tuple(nodes[i] for i in order), cost, not pruned)
+
+    greedy = _greedy(table, covers, full)
+    if greedy is None:
+        return None
+    order = _search(table, covers, full, greedy, return_to_source, deadline)
+    return Tour(tuple(nodes[i] for i in order), int(_tour_cost(table, order, return_to_source)), False)
+
+def group_mask(groups: list[set[int]], node: int) -> int:
+    """Get the bitmask of groups a node belongs to."""
+    mask = 0
+    for bit, group in enumerate(groups):
+        if node in group:
+            mask |= 1 << bit
+    return mask
+
+def _candidates(
+    graph: LocationGraph,
+    source: int,
+    groups: list[set[int]],
+    covered: int
+) -> tuple[Optional[list[int]], bool]:
+    """Pick the closest nodes of each uncovered group with one search from the source.
+
+    Returns the candidates in order of distance, or None if a group has
+    none reachable, and whether any group had more nodes than were kept.
+    """
+    wanted = {bit for bit in range(len(groups)) if not covered & (1 << bit)}
+    found = [0] * len(groups)
+    candidates: list[int] = []
+    parents = new_parents(graph)
+    codes = bytearray(len(graph))
+    for layer in expand_from(graph, source, parents, codes):
+        for node in layer:
+            useful = False
+            for bit in list(wanted):
+                if node in groups[bit]:
+                    useful = True
+                    found[bit] += 1
+                    if found[bit] == CANDIDATES_PER_GROUP:
+                        wanted.discard(bit)
+            if useful and node != source:
+                candidates.append(node)
+        if not wanted:
+            break
+
+    reachable = all(found[bit] or covered & (1 << bit) for bit in range(len(groups)))
+    if not reachable:
+        return None, False
+    pruned = any(
+        found[bit] == CANDIDATES_PER_GROUP and len(group) > found[bit]
+        for bit, group in enumerate(groups)
+    )
+    return candidates, pruned
+
+def distance_table(graph: LocationGraph, nodes: list[int], max_cost: float = UNREACHABLE) -> list[list[float]]:
+    """Get the travel cost between every ordered pair of nodes, one search per row.
+
+    Searches stop beyond max_cost, leaving further nodes ``UNREACHABLE``.
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    weights = graph.weights
+    table = []
+    for node in nodes:
+        row = [UNREACHABLE] * len(nodes)
+        remaining = len(nodes)
+        parents = new_parents(graph)
+        codes = bytearray(len(graph))
+        costs = {node: 0}
+        for layer in expand_from(graph, node, parents, codes):
+            first = layer[0]
+            if first != node:
+                parent = parents[first]
+                costs[first] = costs[parent] + weights[parent * DEGREE + codes[first]]
+            distance = costs[first]
+            if distance > max_cost:
+                break
+            for reached in layer:
+                costs[reached] = distance
+                if reached in index:
+                    row[index[reached]] = distance
+                    remaining -= 1
+            if not remaining:
+                break
+        table.append(row)
+    return table
+
+def _exact(
+    table: list[list[float]],
+    covers: list[int],
+    full: int,
+    return_to_source: bool
+) -> Optional[tuple[list[int], int]]:
+    """Find the cheapest tour over all candidates, as (stop indexes, cost)."""
+    size = len(covers)
+    costs: dict[tuple[int, int], float] = {(covers[0], 0): 0}
+    previous: dict[tuple[int, int], tuple[int, int]] = {}
+    # Every move covers a new group, so states only ever go to larger masks
+    for mask in range(covers[0], full + 1):
+        for last in range(size):
+            cost = costs.get((mask, last))
+            if cost is None or mask == full:
+                continue
+            row = table[last]
+            for stop in range(1, size):
+                if not covers[stop] & ~mask or row[stop] == UNREACHABLE:
+                    continue
+                state = (mask | covers[stop], stop)
+                next_cost = cost + row[stop]
+                if next_cost < costs.get(state, UNREACHABLE):
+                    costs[state] = next_cost
+                    previous[state] = (mask, last)
+
+    best: Optional[tuple[int, int]] = None
+    best_cost = UNREACHABLE
+    for last in range(size):
+        cost = costs.get((full, last))
+        if cost is None:
+            continue
+        if return_to_source:
+            cost += table[last][0]
+        if cost < best_cost:
+            best, best_cost = (full, last), cost
+    if best is None:
+        return None
+
+    order = []
+    state = best
+    while state in previous:
+        order.append(state[1])
+        state = previous[state]
+    order.reverse()
+    return order, int(best_cost)
+
+def _greedy(table: list[list[float]], covers: list[int], full: int) -> Optional[list[int]]:
+    """Build a tour by always moving to the closest candidate that covers a new group."""
+    order: list[int] = []
+    mask = covers[0]
+    last = 0
+    while mask != full:
+        options = [
+            (table[last][stop], -bin(covers[stop] & ~mask).count("1"), stop)
+            for stop in range(1, len(covers))
+            if covers[stop] & ~mask and table[last][stop] != UNREACHABLE
+        ]
+        if not options:
+            return None
+        _, _, last = min(options)
+        order.append(last)
+        mask |= covers[last]
+    return order
+
+def _search(
+    table: list[list[float]],
+    covers: list[int],
+    full: int,
+    order: list[int],
+    return_to_source: bool,
+    deadline: float
+) -> list[int]:
+    """Improve a tour, then keep perturbing and improving the best one found.
+
+    Stops at the deadline or after ``RESTARTS`` perturbations in a row
+    bring nothing better. The perturbations are seeded, so the same map
+    gives the same route.
+    """
+    rng = random.Random(0)
+    best = _improve(table, covers, full, order, return_to_source, deadline)
+    best_cost = _tour_cost(table, best, return_to_source)
+    failures = 0
+    while failures < RESTARTS and time.monotonic() < deadline:
+        tour = _perturb(best, len(covers), rng)
+        if not _covers_all(covers, tour, full):
+            continue
+        tour = _improve(table, covers, full, tour, return_to_source, deadline)
+        cost = _tour_cost(table, tour, return_to_source)
+        if cost < best_cost:
+            best, best_cost = tour, cost
+            failures = 0
+        else:
+            failures += 1
+    return best
+
+def _perturb(order: list[int], size: int, rng: random.Random) -> list[int]:
+    """Shuffle a random segment of a tour and swap one stop for a random candidate."""
+    tour = list(order)
+    i, j = sorted(rng.sample(range(len(tour) + 1), 2)) if len(tour) > 1 else (0, len(tour))
+    segment = tour[i:j]
+    rng.shuffle(segment)
+    tour[i:j] = segment
+    unused = [stop for stop in range(1, size) if stop not in tour]
+    if tour and unused:
+        tour[rng.randrange(len(tour))] = rng.choice(unused)
+    return tour
+
+def _improve(
+    table: list[list[float]],
+    covers: list[int],
+    full: int,
+    order: list[int],
+    return_to_source: bool,
+    deadline: float
+) -> list[int]:
+    """Take improving neighbouring tours until none is left or time runs out."""
+    best = _tour_cost(table, order, return_to_source)
+    improved = True
+    while improved:
+        improved = False
+        for tour in _neighbors(order, len(covers)):
+            if time.monotonic() >= deadline:
+                return order
+            if not _covers_all(covers, tour, full):
+                continue
+            cost = _tour_cost(table, tour, return_to_source)
+            if cost < best:
+                order, best = tour, cost
+                improved = True
+                break
+    return order
+
+def _neighbors(order: list[int], size: int) -> Iterator[list[int]]:
+    """Yield the tours one move away: a stop dropped, a segment reversed,
+    a stop moved elsewhere or a stop replaced by another candidate."""
+    for i in range(len(order)):
+        yield order[:i] + order[i + 1:]
+    for i in range(len(order)):
+        for j in range(i + 1, len(order)):
+            yield order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+    for i in range(len(order)):
+        rest = order[:i] + order[i + 1:]
+        for j in range(len(rest) + 1):
+            if j != i:
+                yield rest[:j] + [order[i]] + rest[j:]
+    unused = [stop for stop in range(1, size) if stop not in order]
+    for i in range(len(order)):
+        for stop in unused:
+            yield order[:i] + [stop] + order[i + 1:]
+
+def _covers_all(covers: list[int], order: list[int], full: int) -> bool:
+    """Check whether the source and the stops together cover every group."""
+    mask = covers[0]
+    for stop in order:
+        mask |= covers[stop]
+    return mask == full
+
+def _tour_cost(table: list[list[float]], order: list[int], return_to_source: bool) -> float:
+    """Add up the legs of a tour starting at the source."""
+    cost = 0.0
+    last = 0
+    for stop in order:
+        cost += table[last][stop]
+        last = stop
+    if return_to_source:
+        cost += table[last][0]
+    return cost
@@ -0,0 +1,80 @@
+import itertools
+import pytest
+from src.domain.entities.location import Location
+from src.domain.entities.direction import Direction
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding import tour
+from src.application.pathfinding.tour import plan_tour
+from src.application.pathfinding.astar_test import grid_locations
+
+class TestPlanTour:
+    """Test cases for the multi-group tour planner."""
+
+    @pytest.fixture
+    def graph(self) -> LocationGraph:
+        """Create a grid with a wall, a costly connection and an island."""
+        locations = grid_locations(6, 6, {(3, y) for y in range(1, 6)})
+        locations["0,0"].connection_costs[Direction.EAST] = 4
+        locations["Island"] = Location("Island")
+        return LocationGraph.from_locations(locations)
+
+    def ids(self, graph: LocationGraph, *names: str) -> set[int]:
+        return {graph.id_of(name) or 0 for name in names}
+
+    def tour_cost(self, graph: LocationGraph, stops: list[int], source: int, return_to_source: bool) -> int:
+        """Add up the shortest legs between consecutive stops with the planner's own table."""
+        nodes = [source] + stops + ([source] if return_to_source else [])
+        table = tour.distance_table(graph, nodes)
+        return int(sum(table[i][i + 1] for i in range(len(nodes) - 1)))
+
+    def brute_force(self, graph: LocationGraph, source: int, groups: list[set[int]], return_to_source: bool) -> int:
+        """Try every order of every choice of one node per group."""
+        best = None
+        for choice in itertools.product(*groups):
+            for order in itertools.permutations(set(choice) - {source}):
+                cost = self.tour_cost(graph, list(order), source, return_to_source)
+                best = cost if best is None else min(best, cost)
+        return best or 0
+
+    def test_exact_tours(self, graph: LocationGraph) -> None:
+        """Test that small sets get the cheapest tour, with and without returning."""
+        source = graph.id_of("0,0") or 0
+        groups = [
+            self.ids(graph, "5,5", "2,2"),
+            self.ids(graph, "4,0", "0,5"),
+            self.ids(graph, "2,2", "5,1")
+        ]
+        for return_to_source in (False, True):
+            planned = plan_tour(graph, source, groups, return_to_source)
+            assert planned is not None and planned.exact
+            assert planned.cost == self.brute_force(graph, source, groups, return_to_source)
+            assert planned.cost == self.tour_cost(graph, list(planned.stops), source, return_to_source)
+
+    def test_groups_at_source_and_unreachable(self, graph: LocationGraph) -> None:
+        """Test that groups held at the source cost nothing and unreachable ones fail."""
+        source = graph.id_of("0,0") or 0
+        assert plan_tour(graph, source, [{source}]) == tour.Tour((), 0, True)
+        assert plan_tour(graph, source, [{source}, self.ids(graph, "Island")]) is None
+
+    def test_candidates_pruned(self, graph: LocationGraph, monkeypatch) -> None:
+        """Test that a tour over a subset of a group's nodes is not marked exact."""
+        monkeypatch.setattr(tour, "CANDIDATES_PER_GROUP", 1)
+        planned = plan_tour(graph, graph.id_of("0,0") or 0, [self.ids(graph, "1,0", "5,5")])
+        assert planned is not None
+        assert planned.stops == tuple(self.ids(graph, "1,0"))
+        assert not planned.exact
+
+    def test_heuristic_tours(self, graph: LocationGraph, monkeypatch) -> None:
+        """Test that larger sets still get a complete, consistently costed tour in time."""
+        monkeypatch.setattr(tour, "EXACT_GROUPS", 0)
+        source = graph.id_of("0,0") or 0
+        groups = [
+            self.ids(graph, "5,5", "2,2"),
+            self.ids(graph, "4,0", "0,5"),
+            self.ids(graph, "2,2", "5,1")
+        ]
+        planned = plan_tour(graph, source, groups, True, time_limit=0.5)
+        assert planned is not None and not planned.exact
+        assert all(set(planned.stops) & group for group in groups)
+        assert planned.cost == self.tour_cost(graph, list(planned.stops), source, True)
+        assert planned.cost == self.brute_force(graph, source, groups, True)
@@ -24,8 +24,8 @@ class LocationManagement:
         location = Location(name, resources)
         self._repository.add_location(location)
 
-    def add_connection(self, from_loc: str, to_loc: str, direction: Direction) -> None:
-        """Add a bidirectional connection between two locations."""
+    def add_connection(self, from_loc: str, to_loc: str, direction: Direction, cost: int = 1) -> None:
+        """Add a bidirectional connection between two locations with a travel cost."""
         source = self._repository.get_location(from_loc)
         target = self._repository.get_location(to_loc)
 
@@ -33,12 +33,12 @@ class LocationManagement:
             raise ValueError("One or both locations do not exist")
 
         # Add connection in specified direction
-        source.add_connection(direction, to_loc)
+        source.add_connection(direction, to_loc, cost)
         self._repository.update_location(source)
 
         # Add reciprocal connection
         opposite = Direction.get_opposite(direction)
-        target.add_connection(opposite, from_loc)
+        target.add_connection(opposite, from_loc, cost)
         self._repository.update_location(target)
 
     def get_current_location(self) -> Optional[Location]:
@@ -9,7 +9,7 @@ class LocationProvider(Protocol):
     def set_current_location(self, location_name: Optional[str]) -> None: ...
     def clear_locations(self) -> None: ...
     def add_location(self, location: Location) -> None: ...
-    def add_connection(self, from_loc: str, to_loc: str, direction: str) -> None: ...
+    def add_connection(self, from_loc: str, to_loc: str, direction: str, cost: int = 1) -> None: ...
 
 class MapManagement:
     """Use case for managing map persistence."""
@@ -46,6 +46,24 @@ class MapManagement:
         except Exception as e:
             raise RuntimeError(f"Failed to load map: {str(e)}") from e
 
+    def save_sidecar(self, filename: str, suffix: str, data: bytes) -> None:
+        """Save data derived from the map next to its file."""
+        try:
+            self._repository.save_sidecar(filename, suffix, data)
+        except Exception as e:
+            raise RuntimeError(f"Failed to save {suffix}: {str(e)}") from e
+
+    def load_sidecar(self, filename: str, suffix: str) -> Optional[bytes]:
+        """Load data saved next to a map file, or None if it is missing or unreadable."""
+        try:
+            return self._repository.load_sidecar(filename, suffix)
+        except OSError:
+            return None
+
+    def sidecar_path(self, filename: str, suffix: str) -> Optional[str]:
+        """Get the path of a file saved next to a map, if the repository uses files."""
+        return self._repository.sidecar_path(filename, suffix)
+
     def list_available_maps(self) -> list[tuple[str, float, str]]:
         """List all available map files."""
         try:
@@ -1,21 +1,103 @@
-from typing import Optional, Protocol
-from collections import defaultdict
-import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Protocol
 from ...domain.entities.location import Location
 from ...domain.entities.direction import Direction
+from ..pathfinding import astar, bidirectional, breadth_first, landmarks
+from ..pathfinding.location_graph import LocationGraph, DEGREE
+from ..pathfinding.shortest_path_tree import ShortestPathTree
+from ..pathfinding.path_cache import PathCache
+from ..pathfinding.strategy import PathStrategy
+from ..pathfinding.grid_embedding import GridEmbedding
+from ..pathfinding.avoidance import Avoidance
+from ..pathfinding.hierarchy import RegionHierarchy
+from ..pathfinding.landmarks import LandmarkTable, DEFAULT_LANDMARKS
+from ..pathfinding.distance_matrix import DistanceMatrix
+from ..pathfinding.distance_field import DistanceField, DistanceFields, DEFAULT_FIELDS
+from ..pathfinding.tour import plan_tour, DEFAULT_TIME_LIMIT
+from ..pathfinding.forage import plan_forage
+from .resource_query import ResourceQuery, QueryPlan, INDEX, choose_plan
 
 class ResourceRepository(Protocol):
     """Protocol for resource tracking operations."""
     def get_location(self, name: str) -> Optional[Location]: ...
     def list_locations(self) -> dict[str, Location]: ...
     def update_location(self, location: Location) -> None: ...
+    def get_map_version(self) -> int: ...
+
+    def get_resource_locations(self, resource: str) -> list[str]:
+        """Get the locations holding a resource.
+
+        Repositories that keep a resource index answer from it; this
+        default scans every location.
+        """
+        return [name for name, location in self.list_locations().items() if resource in location.resources]
+
+    def count_resource_locations(self, resource: str) -> int:
+        """Count the locations holding a resource."""
+        return len(self.get_resource_locations(resource))
+
+    def list_resources(self) -> dict[str, list[str]]:
+        """Get every resource, in name order, with the locations holding it."""
+        resources: dict[str, list[str]] = {}
+        for name, location in self.list_locations().items():
+            for resource in location.resources:
+                resources.setdefault(resource, []).append(name)
+        return dict(sorted(resources.items()))
+
+    def match_resources(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> list[str]:
+        """Get the locations holding every resource of all_of, at least one
+        of any_of unless it is empty, and none of none_of.
+
+        Repositories that keep resource bitmaps answer from them; this
+        default checks every location.
+        """
+        all_of, any_of, none_of = set(all_of), set(any_of), set(none_of)
+        return [
+            name for name, location in self.list_locations().items()
+            if all_of <= set(location.resources)
+            and (not any_of or any_of & set(location.resources))
+            and not none_of & set(location.resources)
+        ]
+
+@dataclass
+class RoutePlan:
+    """A planned gathering route.
+
+    Each leg is (location, resources collected there, directions from the
+    previous stop). ``exact`` tells whether the route is known to be the
+    shortest one.
+    """
+    legs: list[tuple[str, list[str], list[Direction]]]
+    cost: int
+    exact: bool
 
 class ResourceManagement:
     """Use case for managing resources and finding paths to resources."""
 
-    def __init__(self, resource_repository: ResourceRepository):
+    def __init__(
+        self,
+        resource_repository: ResourceRepository,
+        location_graph: Optional[LocationGraph] = None,
+        cache_size: int = 1024,
+        field_capacity: int = DEFAULT_FIELDS
+    ):
         self._repository = resource_repository
-        self._resource_locations: dict[str, list[str]] = defaultdict(list)
+        self.path_strategy = PathStrategy.BREADTH_FIRST
+        self.landmark_count = DEFAULT_LANDMARKS
+        self._location_graph = location_graph
+        self._path_cache = PathCache(cache_size)
+        self._fields = DistanceFields(field_capacity)
+        self._tree_root: Optional[str] = None
+        self._tree: Optional[ShortestPathTree] = None
+        self._embedding: Optional[GridEmbedding] = None
+        self._hierarchy: Optional[RegionHierarchy] = None
+        self._landmarks: Optional[LandmarkTable] = None
+        self._matrix: Optional[DistanceMatrix] = None
 
     def add_resource(self, location_name: str, resource: str) -> None:
         """Add a resource to a location."""
@@ -25,91 +107,670 @@ class ResourceManagement:
 
         if resource not in location.resources:
             location.add_resource(resource)
-            self._resource_locations[resource].append(location_name)
             self._repository.update_location(location)
+            node = self._location_graph.id_of(location_name) if self._location_graph is not None else None
+            if node is not None:
+                self._fields.add_holder(resource, node)
 
     def find_resource(self, resource: str) -> list[str]:
         """Find all locations containing a specific resource."""
-        locations = []
-        for loc_name, location in self._repository.list_locations().items():
-            if resource in location.resources:
-                locations.append(loc_name)
-        return locations
-
-    def find_path(self, start: str, end: str) -> Optional[list[Direction]]:
-        """Find shortest path between two locations using Dijkstra's algorithm."""
+        return self._repository.get_resource_locations(resource)
+
+    def list_resources(self) -> dict[str, list[str]]:
+        """List every resource with the locations containing it."""
+        return self._repository.list_resources()
+
+    def find_locations_matching(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> list[str]:
+        """Find the locations holding all of, any of and none of some resources.
+
+        An empty any_of places no condition. Locations come in insertion
+        order.
+        """
+        return self._repository.match_resources(all_of, any_of, none_of)
+
+    def plan_query(self, query: ResourceQuery, start: Optional[str] = None) -> QueryPlan:
+        """Decide how to answer a query, measuring distances from its origin or start.
+
+        The resource index gives the number of holders of each resource, so
+        the cheaper of reading matches from the index and walking outward
+        from the origin can be chosen before any location is visited.
+        """
+        origin = query.origin or start
+        if query.needs_distances:
+            if not origin:
+                raise ValueError("A distance query needs a location to measure from")
+            if self._repository.get_location(origin) is None:
+                raise ValueError(f"Location {origin} does not exist")
+        resources = [*query.all_of, *(resource for group in query.any_of for resource in group)]
+        counts = {resource: self._repository.count_resource_locations(resource) for resource in resources}
+        known_distances = query.needs_distances and (
+            self.distance_matrix() is not None or self._tree_from(origin or "") is not None
+        )
+        total = len(self._repository.list_locations())
+        return choose_plan(query, origin, total, counts, known_distances)
+
+    def run_query(self, plan: QueryPlan) -> Iterator[tuple[str, Optional[int]]]:
+        """Yield (location, distance) for the matches of a planned query.
+
+        Distances are None when the query does not need them. Matches
+        ordered by distance stream out as they are found; ordering by name
+        needs every match first. The map must not be edited while
+        iterating.
+        """
+        query = plan.query
+        if plan.strategy == INDEX:
+            rows = self._query_index(plan)
+        else:
+            rows = self._query_traversal(plan)
+        if query.order == "name":
+            rows = iter(sorted(rows))
+        for count, row in enumerate(rows, 1):
+            yield row
+            if count == query.limit:
+                return
+
+    def _query_index(self, plan: QueryPlan) -> Iterator[tuple[str, Optional[int]]]:
+        """Answer a query from the resource index, measuring each match if needed."""
+        query = plan.query
+        first, *rest = query.any_of or ((),)
+        names = self._repository.match_resources(query.all_of, first, query.none_of)
+        if rest:
+            check = ResourceQuery(any_of=tuple(rest))
+            names = [name for name in names if check.matches(self._location_resources(name))]
+        if not query.needs_distances:
+            yield from ((name, None) for name in names)
+            return
+
+        distances = self._distances_to(plan.origin or "", names, query.within)
+        rows = [(name, distances[name]) for name in names if name in distances]
+        if query.order == "distance":
+            rows.sort(key=lambda row: (row[1], row[0]))
+        yield from rows
+
+    def _query_traversal(self, plan: QueryPlan) -> Iterator[tuple[str, Optional[int]]]:
+        """Answer a query by checking locations outward from its origin, closest first."""
+        query = plan.query
+        origin = plan.origin or ""
+        graph = self._graph()
+        source = graph.id_of(origin)
+        if source is None:
+            return
+        names = graph.names
+        layers, _ = self._expand_from(origin, source)
+        for distance, layer in layers:
+            if query.within is not None and distance > query.within:
+                return
+            for node in layer:
+                if query.matches(self._location_resources(names[node])):
+                    yield (names[node], distance)
+
+    def _location_resources(self, name: str) -> list[str]:
+        """Get the resources of a location, or none if it does not exist."""
+        location = self._repository.get_location(name)
+        return location.resources if location is not None else []
+
+    def _distances_to(self, start: str, names: list[str], max_cost: Optional[int]) -> dict[str, int]:
+        """Get the travel cost from start to each location reachable within max_cost.
+
+        The distance matrix or the tracked root's tree are looked up
+        directly; otherwise one search from start runs until every location
+        is found or max_cost is passed.
+        """
+        graph = self._graph()
+        source = graph.id_of(start)
+        if source is None or not names:
+            return {}
+        targets: dict[int, str] = {}
+        for name in names:
+            node = graph.id_of(name)
+            if node is not None:
+                targets[node] = name
+        found: dict[str, int] = {}
+        matrix = self.distance_matrix()
+        tree = None if matrix is not None else self._tree_from(start)
+        if matrix is not None or tree is not None:
+            for node, name in targets.items():
+                distance: Optional[int] = None
+                if matrix is not None:
+                    distance = matrix.distance(source, node)
+                elif tree is not None and tree.costs[node] >= 0:
+                    distance = tree.costs[node]
+                if distance is not None and (max_cost is None or distance <= max_cost):
+                    found[name] = distance
+            return found
+
+        layers, _ = self._expand_from(start, source)
+        for distance, layer in layers:
+            if max_cost is not None and distance > max_cost:
+                break
+            for node in layer:
+                if node in targets:
+                    found[targets.pop(node)] = distance
+            if not targets:
+                break
+        return found
+
+    def find_path(
+        self,
+        start: str,
+        end: str,
+        avoid_locations: Iterable[str] = (),
+        avoid_edges: Iterable[tuple[str, str]] = ()
+    ) -> Optional[list[Direction]]:
+        """Find the cheapest path between two locations.
+
+        Every step costs 1 unless a connection has a travel cost set. Routes
+        never pass through avoid_locations or use a connection between any
+        (from, to) pair in avoid_edges, in either direction.
+        """
         if not start or not end:
             return None
 
-        locations = self._repository.list_locations()
-        if start not in locations or end not in locations:
+        avoided = frozenset(avoid_locations)
+        blocked = frozenset((min(a, b), max(a, b)) for a, b in avoid_edges)
+        key = ("path", start, end, avoided, blocked)
+        found, cached = self._cache_get(key)
+        if found:
+            return None if cached is None else list(cached)
+
+        path = self._search_path(start, end, avoided, blocked)
+        self._cache_put(key, None if path is None else tuple(path))
+        return path
+
+    def _search_path(
+        self,
+        start: str,
+        end: str,
+        avoid_locations: frozenset[str],
+        avoid_edges: frozenset[tuple[str, str]]
+    ) -> Optional[list[Direction]]:
+        """Run the path search behind find_path."""
+        graph = self._graph()
+        source = graph.id_of(start)
+        target = graph.id_of(end)
+        if source is None or target is None:
+            return None
+
+        avoid = Avoidance.from_names(graph, avoid_locations, avoid_edges)
+        if not graph.component_index().connected(source, target) or target in avoid.nodes:
             return None
+        if avoid:
+            return breadth_first.find_path(graph, source, target, avoid)
+        matrix = self.distance_matrix()
+        if matrix is not None:
+            return matrix.path(source, target)
+
+        tree = self._tree_from(start)
+        if tree is not None:
+            return tree.path_to(target)
+        if self.path_strategy is PathStrategy.HIERARCHICAL:
+            return self.region_hierarchy().find_path(source, target)
+        if self.path_strategy is PathStrategy.LANDMARKS:
+            return landmarks.find_path(graph, self.landmark_table(), source, target)
+        if graph.one_way_edges == 0 and graph.weighted_edges == 0:
+            if self.path_strategy is PathStrategy.BIDIRECTIONAL:
+                return bidirectional.find_path(graph, source, target)
+            if self.path_strategy is PathStrategy.ASTAR:
+                embedding = self.grid_embedding()
+                if embedding.is_consistent(source):
+                    return astar.find_path(graph, embedding, source, target)
+        return breadth_first.find_path(graph, source, target)
+
+    def find_paths(self, start: str, targets: list[str]) -> dict[str, Optional[list[Direction]]]:
+        """Find shortest paths from one location to many with a single traversal.
+
+        Returns a mapping from each target to its directions, or None if the
+        target is unknown or unreachable.
+        """
+        results: dict[str, Optional[list[Direction]]] = {target: None for target in targets}
+        graph = self._graph()
+        source = graph.id_of(start) if start else None
+        if source is None:
+            return results
+
+        components = graph.component_index()
+        nodes = {}
+        for target in targets:
+            node = graph.id_of(target)
+            if node is not None and components.connected(source, node):
+                nodes[target] = node
+
+        tree = self._tree_from(start)
+        if tree is not None:
+            for target, node in nodes.items():
+                results[target] = tree.path_to(node)
+            return results
 
-        distances: dict[str, float] = {loc: float('inf') for loc in locations}
-        distances[start] = 0
-        previous: dict[str, Optional[str]] = {loc: None for loc in locations}
-        path_directions: dict[str, Optional[Direction]] = {loc: None for loc in locations}
-        pq = [(0, start)]
-        visited = set()
-
-        while pq:
-            current_distance, current = heapq.heappop(pq)
-
-            if current == end:
-                # Reconstruct path
-                path = []
-                while current != start:
-                    if current is None or previous[current] is None:
-                        return None
-                    if path_directions[current] is not None:
-                        path.append(path_directions[current])
-                    current = previous[current]
-                return list(reversed(path))
-
-            if current in visited:
-                continue
-            
-            visited.add(current)
-            location = locations[current]
-
-            for direction, neighbor in location.connections.items():
-                if neighbor in visited:
-                    continue
-                
-                distance = current_distance + 1
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous[neighbor] = current
-                    path_directions[neighbor] = direction
-                    heapq.heappush(pq, (distance, neighbor))
-
-        return None
-
-    def find_nearest_resource(self, resource: str, start: str) -> Optional[tuple[str, list[Direction]]]:
-        """Find nearest location containing the specified resource and path to it."""
+        paths = breadth_first.find_paths(graph, source, list(nodes.values()))
+        for target, node in nodes.items():
+            results[target] = paths[node]
+        return results
+
+    def find_nearest_resource(
+        self,
+        resource: str,
+        start: str,
+        avoid_locations: Iterable[str] = (),
+        avoid_edges: Iterable[tuple[str, str]] = ()
+    ) -> Optional[tuple[str, list[Direction]]]:
+        """Find nearest location containing the specified resource and path to it.
+
+        avoid_locations and avoid_edges restrict the route as in find_path;
+        holders among the avoided locations are skipped.
+        """
+        if not start:
+            return None
+
+        avoided = frozenset(avoid_locations)
+        blocked = frozenset((min(a, b), max(a, b)) for a, b in avoid_edges)
+        key = ("nearest", resource, start, avoided, blocked)
+        found, cached = self._cache_get(key)
+        if found:
+            return None if cached is None else (cached[0], list(cached[1]))
+
+        result = self._search_nearest_resource(resource, start, avoided, blocked)
+        self._cache_put(key, None if result is None else (result[0], tuple(result[1])))
+        return result
+
+    def find_k_nearest_resource(self, resource: str, start: str, k: int) -> list[tuple[str, int, list[Direction]]]:
+        """Find the k closest locations containing a resource.
+
+        Returns (location, distance, directions) tuples sorted by distance,
+        with equidistant locations in insertion order. Distances count
+        travel costs as in find_path. The traversal stops once k holders
+        have been found.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
         if not start:
+            return []
+        graph = self._graph()
+        source = graph.id_of(start)
+        if source is None:
+            return []
+        return [
+            (graph.names[node], graph.path_cost(source, path), path)
+            for node, path in self._nearest_holders(resource, start, k)
+        ]
+
+    def locations_within(self, start: str, max_steps: int) -> list[tuple[int, list[str], list[str]]]:
+        """Get every location within max_steps of start, grouped into distance rings.
+
+        Returns (distance, locations, resources) tuples by increasing
+        distance, with the locations of a ring in name order and resources
+        the sorted union of what they hold. Distances count travel costs as
+        in find_path. The search stops at the radius, so the rest of the
+        map is never visited.
+        """
+        if max_steps < 0:
+            raise ValueError("max_steps must not be negative")
+        graph = self._graph()
+        source = graph.id_of(start) if start else None
+        if source is None:
+            return []
+
+        rings = []
+        layers, _ = self._expand_from(start, source)
+        for distance, layer in layers:
+            if distance > max_steps:
+                break
+            names = [graph.names[node] for node in layer]
+            resources = set()
+            for name in names:
+                location = self._repository.get_location(name)
+                if location is not None:
+                    resources.update(location.resources)
+            rings.append((distance, names, sorted(resources)))
+        return rings
+
+    def iter_by_distance(self, start: str) -> Iterator[tuple[str, int, list[Direction]]]:
+        """Yield (location, distance, directions) for every reachable location, closest first.
+
+        Equidistant locations come in name order and distances count travel
+        costs as in find_path. The search only advances as items are
+        pulled, so a consumer that stops early never visits the rest of the
+        map. The map must not be edited while iterating.
+        """
+        graph = self._graph()
+        source = graph.id_of(start) if start else None
+        if source is None:
+            return
+        names = graph.names
+        layers, path_to = self._expand_from(start, source)
+        for distance, layer in layers:
+            for node in layer:
+                yield (names[node], distance, path_to(node))
+
+    def _expand_from(
+        self,
+        start: str,
+        source: int
+    ) -> tuple[Iterator[tuple[int, list[int]]], Callable[[int], list[Direction]]]:
+        """Get (distance, nodes) groups around a location, closest first, and a path lookup.
+
+        The tree of the tracked root answers without a search; otherwise the
+        search only advances as groups are consumed, and paths can be looked
+        up for nodes of the groups seen so far.
+        """
+        tree = self._tree_from(start)
+        if tree is not None:
+            groups = ((tree.costs[layer[0]], layer) for layer in tree.layers)
+            return groups, lambda node: tree.path_to(node) or []
+
+        graph = self._graph()
+        parents = breadth_first.new_parents(graph)
+        codes = bytearray(len(graph))
+
+        def layers() -> Iterator[tuple[int, list[int]]]:
+            weights = graph.weights
+            costs: dict[int, int] = {}
+            distance = 0
+            for layer in breadth_first.expand_from(graph, source, parents, codes):
+                first = layer[0]
+                if first != source:
+                    parent = parents[first]
+                    distance = costs[parent] + weights[parent * DEGREE + codes[first]]
+                costs.update(dict.fromkeys(layer, distance))
+                yield (distance, layer)
+
+        return layers(), lambda node: breadth_first.walk_back(parents, codes, source, node)
+
+    def _search_nearest_resource(
+        self,
+        resource: str,
+        start: str,
+        avoid_locations: frozenset[str],
+        avoid_edges: frozenset[tuple[str, str]]
+    ) -> Optional[tuple[str, list[Direction]]]:
+        """Run the search behind find_nearest_resource."""
+        graph = self._graph()
+        source = graph.id_of(start)
+        if source is None:
             return None
-            
-        locations_with_resource = self.find_resource(resource)
-        if not locations_with_resource:
+        avoid = Avoidance.from_names(graph, avoid_locations, avoid_edges)
+        # The matrix and the root's tree answer without a search; a field is
+        # only worth building for resources asked for from many places
+        field = None
+        if not avoid and self.distance_matrix() is None and self._tree_from(start) is None:
+            field = self.distance_field(resource)
+        if field is not None:
+            route = field.route(source)
+            return None if route is None else (graph.names[route[0]], route[1])
+        matches = self._nearest_holders(resource, start, 1, avoid)
+        if not matches:
             return None
+        node, path = matches[0]
+        return (self._graph().names[node], path)
+
+    def _nearest_holders(
+        self,
+        resource: str,
+        start: str,
+        k: int,
+        avoid: Avoidance = Avoidance()
+    ) -> list[tuple[int, list[Direction]]]:
+        """Find up to k closest holders of a resource as (id, directions) pairs.
+
+        Holders outside the start's component are dropped up front, so the
+        search ends as soon as every reachable holder has been seen, and
+        returns immediately when there is none.
+        """
+        graph = self._graph()
+        source = graph.id_of(start)
+        if source is None:
+            return []
+
+        components = graph.component_index()
+        holders = set()
+        for name in self.find_resource(resource):
+            node = graph.id_of(name)
+            if node is not None and node not in avoid.nodes and components.connected(source, node):
+                holders.add(node)
+        if not holders:
+            return []
+
+        limit = min(k, len(holders))
+        matrix = None if avoid else self.distance_matrix()
+        if matrix is not None:
+            return matrix.nearest_k(source, holders, limit)
+        tree = None if avoid else self._tree_from(start)
+        if tree is not None:
+            return tree.nearest_k(holders.__contains__, limit)
+        return breadth_first.find_k_nearest(graph, source, holders.__contains__, limit, avoid)
+
+    def plan_route(
+        self,
+        start: str,
+        resources: list[str],
+        return_to_start: bool = False,
+        time_limit: float = DEFAULT_TIME_LIMIT
+    ) -> RoutePlan:
+        """Plan a short route from start that collects every listed resource.
+
+        Each resource is collected at the first stop holding it; resources
+        available at start are collected there with an empty leg. With
+        return_to_start the last leg leads back. Larger resource lists are
+        planned heuristically within time_limit seconds.
+        """
+        graph = self._graph()
+        source = graph.id_of(start) if start else None
+        if source is None:
+            raise ValueError(f"Location {start} does not exist")
+        resources = list(dict.fromkeys(resources))
+        if not resources:
+            raise ValueError("No resources to collect")
+
+        groups = []
+        for resource in resources:
+            holders = {graph.id_of(name) for name in self.find_resource(resource)}
+            groups.append({node for node in holders if node is not None})
+        tour = plan_tour(graph, source, groups, return_to_start, time_limit)
+        if tour is None:
+            components = graph.component_index()
+            missing = [
+                resource for resource, group in zip(resources, groups)
+                if not any(components.connected(source, node) for node in group)
+            ]
+            if missing:
+                raise ValueError(f"No reachable location has {', '.join(missing)}")
+            raise ValueError("No route collects every resource")
+
+        return RoutePlan(self._route_legs(start, tour.stops, resources, return_to_start), tour.cost, tour.exact)
+
+    def plan_forage(
+        self,
+        start: str,
+        budget: int,
+        weights: Optional[dict[str, float]] = None,
+        time_limit: float = DEFAULT_TIME_LIMIT
+    ) -> RoutePlan:
+        """Plan a round trip of at most budget steps that collects the most.
+
+        Without weights every distinct resource counts once; with weights
+        each listed resource is worth its weight and others nothing. Only
+        locations within budget of start are searched. If time_limit
+        seconds run out the best trip found so far is returned, with
+        ``exact`` False.
+        """
+        if budget < 0:
+            raise ValueError("budget must not be negative")
+        if weights is not None and any(weight < 0 for weight in weights.values()):
+            raise ValueError("Resource weights must not be negative")
+        graph = self._graph()
+        source = graph.id_of(start) if start else None
+        if source is None:
+            raise ValueError(f"Location {start} does not exist")
+
+        holders: dict[str, set[int]] = {}
+        for resource, names in self._repository.list_resources().items():
+            if weights is None or weights.get(resource, 0) > 0:
+                holders[resource] = {node for node in map(graph.id_of, names) if node is not None}
+        resources = sorted(holders)
+        values = [1.0 if weights is None else weights[resource] for resource in resources]
+        tour = plan_forage(graph, source, [holders[resource] for resource in resources], values, budget, time_limit)
+        return RoutePlan(self._route_legs(start, tour.stops, resources, bool(tour.stops)), tour.cost, tour.exact)
+
+    def _route_legs(
+        self,
+        start: str,
+        stops: tuple[int, ...],
+        resources: list[str],
+        return_to_start: bool
+    ) -> list[tuple[str, list[str], list[Direction]]]:
+        """Describe a route as (location, resources collected, directions) legs.
+
+        Each resource is collected at the first stop holding it, starting
+        with start itself, which only gets a leg if something is collected
+        there.
+        """
+        remaining = list(resources)
 
-        # Check if current location has the resource
-        if start in locations_with_resource:
-            return (start, [])
+        def collect(name: str) -> list[str]:
+            nonlocal remaining
+            location = self._repository.get_location(name)
+            collected = [resource for resource in remaining if location and resource in location.resources]
+            remaining = [resource for resource in remaining if resource not in collected]
+            return collected
 
-        shortest_path = None
-        nearest_location = None
-        shortest_length = float('inf')
+        collected = collect(start)
+        legs: list[tuple[str, list[str], list[Direction]]] = [(start, collected, [])] if collected else []
+        previous = start
+        for node in stops:
+            name = self._graph().names[node]
+            legs.append((name, collect(name), self.find_path(previous, name) or []))
+            previous = name
+        if return_to_start and previous != start:
+            legs.append((start, [], self.find_path(previous, start) or []))
+        return legs
 
-        for location in locations_with_resource:
-            path = self.find_path(start, location)
-            if path and len(path) < shortest_length:
-                shortest_path = path
-                nearest_location = location
-                shortest_length = len(path)
+    def cache_stats(self) -> dict[str, int]:
+        """Get hit, miss and eviction counters of the path cache."""
+        return self._path_cache.stats()
 
-        if nearest_location is None or shortest_path is None:
+    def distance_field(self, resource: str) -> Optional[DistanceField]:
+        """Get the distance field of a resource, keeping it for later queries.
+
+        Fields are built once a resource has been asked for a few times,
+        kept for the most recently queried resources and patched as holders
+        and connections are added. Returns None without a maintained graph,
+        before then or when fields are disabled.
+        """
+        graph = self._location_graph
+        if graph is None:
             return None
-            
-        return (nearest_location, shortest_path)
+
+        def holders() -> list[int]:
+            return [node for node in map(graph.id_of, self.find_resource(resource)) if node is not None]
+
+        def holds(node: int) -> bool:
+            location = self._repository.get_location(graph.names[node])
+            return location is not None and resource in location.resources
+
+        return self._fields.get(graph, resource, holders, holds)
+
+    def distance_field_stats(self) -> dict[str, int]:
+        """Get build, update and eviction counters of the distance fields."""
+        return self._fields.stats()
+
+    def _cache_get(self, key: tuple) -> tuple[bool, Any]:
+        """Look up a cached result for the current map version."""
+        if self._location_graph is None:
+            return (False, None)
+        return self._path_cache.get(self._repository.get_map_version(), key)
+
+    def _cache_put(self, key: tuple, value: Any) -> None:
+        """Cache a result against the current map version.
+
+        Caching needs a maintained graph; a repository without one may be
+        edited behind our back, so its results are never cached.
+        """
+        if self._location_graph is not None:
+            self._path_cache.put(self._repository.get_map_version(), key, value)
+
+    def grid_embedding(self) -> GridEmbedding:
+        """Get grid coordinates for the current map, laying it out again after edits."""
+        graph = self._graph()
+        if self._embedding is None or self._embedding.graph is not graph or not self._embedding.is_current:
+            self._embedding = GridEmbedding(graph)
+        return self._embedding
+
+    def region_hierarchy(self) -> RegionHierarchy:
+        """Get the cluster hierarchy for the current map, updating it after edits."""
+        graph = self._graph()
+        if self._hierarchy is None or self._hierarchy.graph is not graph:
+            self._hierarchy = RegionHierarchy(graph)
+        self._hierarchy.refresh()
+        return self._hierarchy
+
+    def landmark_table(self) -> LandmarkTable:
+        """Get landmark distances for the current map, recomputing them after edits."""
+        graph = self._graph()
+        table = self._landmarks
+        if (
+            table is None
+            or table.graph is not graph
+            or not table.is_current
+            or len(table.landmarks) > self.landmark_count
+        ):
+            table = self._landmarks = LandmarkTable.build(graph, self.landmark_count)
+        return table
+
+    def restore_landmarks(self, data: Optional[bytes]) -> bool:
+        """Reuse saved landmark distances if they were computed for the current map."""
+        table = LandmarkTable.from_bytes(self._graph(), data) if data else None
+        if table is None or len(table.landmarks) > self.landmark_count:
+            return False
+        self._landmarks = table
+        return True
+
+    def use_distance_matrix(self, matrix: Optional[DistanceMatrix]) -> None:
+        """Answer paths and nearest queries from an all-pairs matrix, or stop doing so."""
+        self._matrix = matrix
+
+    def distance_matrix(self) -> Optional[DistanceMatrix]:
+        """Get the all-pairs matrix in use, if it still matches the map.
+
+        After an edit the matrix is left alone and queries go back to graph
+        searches until a new one is supplied.
+        """
+        matrix = self._matrix
+        if matrix is None or matrix.graph is not self._location_graph or not matrix.is_current:
+            return None
+        return matrix
+
+    def set_tree_root(self, location_name: Optional[str]) -> None:
+        """Keep a shortest-path tree rooted at a location for repeated queries.
+
+        Paths from the root are then answered from the tree until the root
+        changes. After a map edit the next query repairs the tree if
+        connections were only added, and rebuilds it otherwise.
+        """
+        self._tree_root = location_name
+        self._tree = None
+        if location_name is not None:
+            self._tree_from(location_name)
+
+    def _tree_from(self, start: str) -> Optional[ShortestPathTree]:
+        """Get an up-to-date shortest-path tree if start is the tracked root."""
+        if start != self._tree_root or self._location_graph is None:
+            return None
+        if self._tree is None or not self._tree.is_current:
+            root = self._location_graph.id_of(start)
+            if root is None:
+                self._tree = None
+                return None
+            # Connections added since the tree was built are patched in
+            if self._tree is None or self._tree.root != root or not self._tree.repair():
+                self._tree = ShortestPathTree(self._location_graph, root)
+        return self._tree
+
+    def _graph(self) -> LocationGraph:
+        """Get the maintained location graph, or build one from the repository."""
+        if self._location_graph is not None:
+            return self._location_graph
+        return LocationGraph.from_locations(self._repository.list_locations())
@@ -1,8 +1,13 @@
+import dataclasses
+import random
 import pytest
 from typing import Protocol, Optional
 from src.domain.entities.location import Location
 from src.domain.entities.direction import Direction
 from src.application.usecases.resource_management import ResourceManagement, ResourceRepository
+from src.application.usecases.resource_query import parse_query, INDEX, TRAVERSAL
+from src.application.pathfinding.location_graph import LocationGraph
+from src.application.pathfinding.astar_test import grid_locations
 
 class MockResourceRepository(ResourceRepository):
     """Mock repository for testing resource management."""
@@ -95,6 +100,16 @@ class TestResourceManagement:
         assert manager.find_path("Forest", "NonExistent") is None
         assert manager.find_path("NonExistent", "Forest") is None
 
+    def test_find_paths(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test finding paths to several locations at once."""
+        paths = manager.find_paths("Forest", ["Mountain", "Beach", "NonExistent"])
+        assert paths == {
+            "Mountain": [Direction.SOUTH, Direction.EAST],
+            "Beach": [Direction.SOUTH],
+            "NonExistent": None
+        }
+        assert manager.find_paths("NonExistent", ["Beach"]) == {"Beach": None}
+
     def test_find_nearest_resource(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
         """Test finding nearest location with specific resource."""
         # Test from Forest to nearest stone (in Mountain)
@@ -113,6 +128,136 @@ class TestResourceManagement:
         assert location == "Forest"
         assert len(path) == 0
 
+    def test_nearest_equal_routes(self, resource_repo: MockResourceRepository) -> None:
+        """Test that nearest queries answered from a field take the same route as find_path."""
+        locations = grid_locations(3, 3, set())
+        locations["0,0"].resources = ["ore"]
+        resource_repo.locations.update(locations)
+        manager = ResourceManagement(resource_repo, LocationGraph.from_locations(locations))
+
+        for name in locations:
+            result = manager.find_nearest_resource("ore", name)
+            assert result is not None
+            assert result == ("0,0", manager.find_path(name, "0,0"))
+        assert manager.distance_field_stats()["builds"] == 1
+        # Two equally short routes lead back to the corner; find_path goes west first
+        assert manager.find_nearest_resource("ore", "1,1") == ("0,0", [Direction.WEST, Direction.SOUTH])
+
+    def test_find_k_nearest_resource(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test listing the k closest locations with a resource."""
+        manager.add_resource("Mountain", "wood")
+        manager.add_resource("Beach", "wood")
+        results = manager.find_k_nearest_resource("wood", "Forest", 2)
+        assert results == [
+            ("Forest", 0, []),
+            ("Beach", 1, [Direction.SOUTH])
+        ]
+        assert len(manager.find_k_nearest_resource("wood", "Forest", 10)) == 3
+        assert manager.find_k_nearest_resource("gold", "Forest", 3) == []
+
+        with pytest.raises(ValueError):
+            manager.find_k_nearest_resource("wood", "Forest", 0)
+
+    def test_find_k_nearest_resource_weighted(self, manager: ResourceManagement, resource_repo: MockResourceRepository) -> None:
+        """Test that the k closest locations are ranked and reported by travel cost."""
+        camp, a, b, c = Location("Camp"), Location("A", ["water"]), Location("B"), Location("C", ["water"])
+        camp.add_connection(Direction.EAST, "A", 10)
+        a.add_connection(Direction.WEST, "Camp", 10)
+        camp.add_connection(Direction.NORTH, "B")
+        b.add_connection(Direction.SOUTH, "Camp")
+        b.add_connection(Direction.NORTH, "C")
+        c.add_connection(Direction.SOUTH, "B")
+        resource_repo.locations.update({location.name: location for location in (camp, a, b, c)})
+
+        assert manager.find_k_nearest_resource("water", "Camp", 2) == [
+            ("C", 2, [Direction.NORTH, Direction.NORTH]),
+            ("A", 10, [Direction.EAST])
+        ]
+
+    def test_locations_within(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test grouping nearby locations into distance rings with their resources."""
+        assert manager.locations_within("Forest", 1) == [
+            (0, ["Forest"], ["berries", "wood"]),
+            (1, ["Beach"], ["coconuts", "sand"])
+        ]
+        assert len(manager.locations_within("Beach", 5)) == 2
+        assert manager.locations_within("Beach", 0) == [(0, ["Beach"], ["coconuts", "sand"])]
+        assert manager.locations_within("Nowhere", 3) == []
+
+        with pytest.raises(ValueError):
+            manager.locations_within("Forest", -1)
+
+    def test_iter_by_distance(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test streaming locations closest first with directions to each."""
+        iterator = manager.iter_by_distance("Forest")
+        assert next(iterator) == ("Forest", 0, [])
+        assert next(iterator) == ("Beach", 1, [Direction.SOUTH])
+        assert list(iterator) == [("Mountain", 2, [Direction.SOUTH, Direction.EAST])]
+        assert list(manager.iter_by_distance("Nowhere")) == []
+
+        first_with_iron = next(
+            name for name, _, _ in manager.iter_by_distance("Forest")
+            if "iron" in (populated_repo.locations[name].resources)
+        )
+        assert first_with_iron == "Mountain"
+
+    def test_list_resources(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test listing resources from a repository without its own index."""
+        manager.add_resource("Mountain", "wood")
+        resources = manager.list_resources()
+        assert list(resources) == ["berries", "coconuts", "iron", "sand", "stone", "wood"]
+        assert resources["wood"] == ["Forest", "Mountain"]
+
+    def test_find_locations_matching(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test boolean resource queries on a repository without bitmaps."""
+        manager.add_resource("Mountain", "wood")
+        assert manager.find_locations_matching(["wood"]) == ["Forest", "Mountain"]
+        assert manager.find_locations_matching(["wood"], none_of=["iron"]) == ["Forest"]
+        assert manager.find_locations_matching(any_of=["sand", "iron"]) == ["Beach", "Mountain"]
+        assert manager.find_locations_matching(["wood", "gold"]) == []
+        assert manager.find_locations_matching(none_of=["wood"]) == ["Beach"]
+
+    def test_run_query(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
+        """Test conditions, radius, ordering and limit of resource queries."""
+        manager.add_resource("Mountain", "wood")
+
+        def run(text: str, start: Optional[str] = None) -> list[tuple[str, Optional[int]]]:
+            return list(manager.run_query(manager.plan_query(parse_query(text), start)))
+
+        assert run("wood within 1 of Beach") == [("Forest", 1), ("Mountain", 1)]
+        assert run("wood and not iron") == [("Forest", None)]
+        assert run("wood or sand order by name limit 2") == [("Beach", None), ("Forest", None)]
+        assert run("wood order by distance", "Mountain") == [("Mountain", 0), ("Forest", 2)]
+        assert run("gold within 5 of Forest") == []
+        with pytest.raises(ValueError):
+            run("wood within 2")
+        with pytest.raises(ValueError):
+            run("wood within 2 of Nowhere")
+
+    def test_query_strategies_agree(self, resource_repo: MockResourceRepository) -> None:
+        """Test that index and traversal plans give the same rows on a weighted map."""
+        rng = random.Random(0)
+        locations = grid_locations(7, 7, {(3, y) for y in range(1, 7)})
+        locations["0,0"].connection_costs[Direction.EAST] = 3
+        for location in locations.values():
+            location.resources = rng.sample(["iron", "water", "wood", "lava"], rng.randrange(3))
+        resource_repo.locations.update(locations)
+        manager = ResourceManagement(resource_repo, LocationGraph.from_locations(locations))
+
+        queries = [
+            "iron within 4 of 0,0",
+            "iron and water within 6 of 2,2 limit 3",
+            "wood or water and not lava order by distance limit 5",
+            "not iron within 3 order by name"
+        ]
+        for tree_root in (None, "1,1"):
+            manager.set_tree_root(tree_root)
+            for text in queries:
+                plan = manager.plan_query(parse_query(text), "1,1")
+                rows = [list(manager.run_query(dataclasses.replace(plan, strategy=strategy))) for strategy in (INDEX, TRAVERSAL)]
+                assert rows[0] == rows[1]
+                assert rows[0]
+
     def test_find_nearest_nonexistent_resource(self, manager: ResourceManagement, populated_repo: MockResourceRepository) -> None:
         """Test finding nearest location with non-existent resource."""
         result = manager.find_nearest_resource("gold", "Forest")
@@ -0,0 +1,210 @@
+import shlex
+from dataclasses import dataclass
+from typing import Optional
+
+INDEX = "index"
+TRAVERSAL = "traversal"
+ORDERS = ("distance", "name")
+CLAUSES = ("within", "order", "limit")
+# Locations covered by one step of a bitset operation
+BITSET_WIDTH = 64
+# Checking a location's resources, relative to visiting it in a search
+CHECK_COST = 1.0
+
+@dataclass(frozen=True)
+class ResourceQuery:
+    """A parsed resource query.
+
+    A location matches if it holds every resource of all_of, at least one
+    resource of each any_of group and none of none_of. within limits
+    matches to that many steps of origin, or of the current location when
+    origin is None. Without order_by, results come closest first when a
+    radius is given and in map order otherwise.
+    """
+    all_of: tuple[str, ...] = ()
+    any_of: tuple[tuple[str, ...], ...] = ()
+    none_of: tuple[str, ...] = ()
+    within: Optional[int] = None
+    origin: Optional[str] = None
+    order_by: Optional[str] = None
+    limit: Optional[int] = None
+
+    @property
+    def order(self) -> Optional[str]:
+        """Get the effective ordering of the results."""
+        if self.order_by is None and self.within is not None:
+            return "distance"
+        return self.order_by
+
+    @property
+    def needs_distances(self) -> bool:
+        """Check whether results depend on the distance from a location."""
+        return self.within is not None or self.order == "distance"
+
+    def matches(self, resources: list[str]) -> bool:
+        """Check whether a location holding resources satisfies the condition."""
+        held = set(resources)
+        return (
+            held.issuperset(self.all_of)
+            and all(not held.isdisjoint(group) for group in self.any_of)
+            and held.isdisjoint(self.none_of)
+        )
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """How a query will be answered.
+
+    With the ``INDEX`` strategy matches are read from the resource index
+    and then measured from origin if needed; with ``TRAVERSAL`` locations
+    are visited outward from origin and checked one by one. The estimates
+    are the expected number of matching locations and the work units the
+    chosen strategy was costed at.
+    """
+    query: ResourceQuery
+    origin: Optional[str]
+    strategy: str
+    estimated_matches: int
+    estimated_cost: float
+
+def parse_query(text: str) -> ResourceQuery:
+    """Parse a query such as ``iron and water within 6 of Camp order by distance limit 5``.
+
+    Resources are combined with ``and``, ``or`` (binding tighter) and a
+    ``not`` prefix, optionally after a leading ``find``. The ``within N
+    [of location]``, ``order by distance|name`` and ``limit K`` clauses
+    may follow in any order. Keywords are case-insensitive and names with
+    spaces can be quoted. Raises ValueError describing the first problem.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid query: {e}") from None
+    if tokens and tokens[0].lower() == "find":
+        tokens.pop(0)
+
+    position = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position].lower() if position < len(tokens) else None
+
+    def take(what: str) -> str:
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError(f"Expected {what} at the end of the query")
+        token = tokens[position]
+        position += 1
+        return token
+
+    def take_name(what: str) -> str:
+        if peek() in CLAUSES or peek() in ("and", "or", "not"):
+            raise ValueError(f"Expected {what}, got '{tokens[position]}'")
+        return take(what)
+
+    def take_number(clause: str, minimum: int) -> int:
+        token = take(f"a number after '{clause}'")
+        if not token.isdigit() or int(token) < minimum:
+            raise ValueError(f"'{clause}' needs a whole number of at least {minimum}, got '{token}'")
+        return int(token)
+
+    all_of: list[str] = []
+    any_of: list[tuple[str, ...]] = []
+    none_of: list[str] = []
+    while True:
+        if peek() == "not":
+            take("not")
+            none_of.append(take_name("a resource after 'not'"))
+        else:
+            group = [take_name("a resource")]
+            while peek() == "or":
+                take("or")
+                group.append(take_name("a resource after 'or'"))
+            if len(group) == 1:
+                all_of.append(group[0])
+            else:
+                any_of.append(tuple(group))
+        if peek() != "and":
+            break
+        take("and")
+
+    within: Optional[int] = None
+    origin: Optional[str] = None
+    order_by: Optional[str] = None
+    limit: Optional[int] = None
+    seen: set[str] = set()
+    while position < len(tokens):
+        keyword = take("a clause").lower()
+        if keyword not in CLAUSES:
+            raise ValueError(f"Unexpected '{tokens[position - 1]}', expected 'and', 'or' or a clause")
+        if keyword in seen:
+            raise ValueError(f"'{keyword}' is given twice")
+        seen.add(keyword)
+        if keyword == "within":
+            within = take_number("within", 0)
+            if peek() == "of":
+                take("of")
+                origin = take_name("a location after 'of'")
+        elif keyword == "order":
+            if take("'by' after 'order'").lower() != "by":
+                raise ValueError("Expected 'by' after 'order'")
+            order_by = take("'distance' or 'name' after 'order by'").lower()
+            if order_by not in ORDERS:
+                raise ValueError(f"Cannot order by '{order_by}', use 'distance' or 'name'")
+        else:
+            limit = take_number("limit", 1)
+
+    return ResourceQuery(tuple(all_of), tuple(any_of), tuple(none_of), within, origin, order_by, limit)
+
+def estimated_ball(radius: Optional[int], total: int) -> int:
+    """Estimate how many locations lie within radius steps of one.
+
+    Maps are assumed to be grid-like, with about 4r locations at distance
+    r, and never hold more than total locations.
+    """
+    if radius is None:
+        return total
+    return min(total, 2 * radius * (radius + 1) + 1)
+
+def choose_plan(
+    query: ResourceQuery,
+    origin: Optional[str],
+    total: int,
+    counts: dict[str, int],
+    known_distances: bool
+) -> QueryPlan:
+    """Pick the cheaper of the index and traversal strategies for a query.
+
+    counts holds how many locations hold each resource of the query, and
+    known_distances tells whether distances from origin can be looked up
+    (a shortest-path tree or distance matrix) instead of searched for.
+
+    Costs are counted in locations visited. The index strategy pays a pass
+    over the bitsets, then measures the matches with one search from
+    origin, which is skipped when nothing matches. A traversal also checks
+    the resources of every location it visits, but stops as soon as limit
+    matches are found when results come closest first.
+    """
+    matches = total
+    for resource in query.all_of:
+        matches = min(matches, counts.get(resource, 0))
+    for group in query.any_of:
+        matches = min(matches, sum(counts.get(resource, 0) for resource in group))
+
+    index_cost = total / BITSET_WIDTH
+    if not query.needs_distances:
+        return QueryPlan(query, origin, INDEX, matches, index_cost)
+
+    ball = estimated_ball(query.within, total)
+    if known_distances:
+        index_cost += matches
+    elif matches:
+        index_cost += ball
+
+    visited = float(ball)
+    if query.limit is not None and query.order == "distance":
+        # Matches are assumed to be spread evenly over the map
+        visited = min(visited, query.limit * total / max(matches, 1))
+    traversal_cost = visited * (1 + CHECK_COST)
+
+    if traversal_cost < index_cost:
+        return QueryPlan(query, origin, TRAVERSAL, matches, traversal_cost)
+    return QueryPlan(query, origin, INDEX, matches, index_cost)
@@ -0,0 +1,68 @@
+import pytest
+from src.application.usecases.resource_query import (
+    ResourceQuery, parse_query, choose_plan, estimated_ball, INDEX, TRAVERSAL
+)
+
+class TestResourceQuery:
+    """Test cases for parsing and planning resource queries."""
+
+    def test_parse(self) -> None:
+        """Test conditions and clauses in any order, with quoting and a leading find."""
+        assert parse_query("find iron and water within 6 of Camp order by distance limit 5") == ResourceQuery(
+            all_of=("iron", "water"), within=6, origin="Camp", order_by="distance", limit=5
+        )
+        assert parse_query("wood OR stone and not lava LIMIT 2 within 3") == ResourceQuery(
+            any_of=(("wood", "stone"),), none_of=("lava",), within=3, limit=2
+        )
+        assert parse_query('iron within 2 of "Old Camp" order by name').origin == "Old Camp"
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "iron and",
+        "iron water",
+        "not within 3",
+        "iron within",
+        "iron within -1",
+        "iron order distance",
+        "iron order by size",
+        "iron limit 0",
+        "iron limit 2 limit 3",
+        "iron within 2 of",
+        'iron within 2 of "Camp'
+    ])
+    def test_parse_errors(self, text: str) -> None:
+        """Test that malformed queries are rejected."""
+        with pytest.raises(ValueError):
+            parse_query(text)
+
+    def test_order_and_matches(self) -> None:
+        """Test the default ordering and the condition check."""
+        assert parse_query("iron within 3").order == "distance"
+        assert parse_query("iron").order is None
+        assert not parse_query("iron limit 3").needs_distances
+
+        query = parse_query("iron and water or sand and not lava")
+        assert query.matches(["iron", "sand"])
+        assert not query.matches(["iron"])
+        assert not query.matches(["iron", "water", "lava"])
+
+    def test_choose_plan(self) -> None:
+        """Test that selective conditions use the index and broad ones a traversal."""
+        total = 100_000
+        counts = {"gold": 3, "water": 40_000, "sand": 30_000}
+
+        plan = choose_plan(parse_query("gold within 50"), "Camp", total, counts, False)
+        assert plan.strategy == INDEX
+        assert plan.estimated_matches == 3
+
+        plan = choose_plan(parse_query("water within 3"), "Camp", total, counts, False)
+        assert plan.strategy == TRAVERSAL
+        assert estimated_ball(3, total) == 25
+        assert plan.estimated_cost == 25 * 2
+
+        plan = choose_plan(parse_query("water or sand order by distance limit 5"), "Camp", total, counts, True)
+        assert plan.strategy == TRAVERSAL
+
+        # Known distances make measuring every match cheap
+        assert choose_plan(parse_query("water within 300"), "Camp", total, counts, True).strategy == INDEX
+        assert choose_plan(parse_query("water"), None, total, counts, False).strategy == INDEX
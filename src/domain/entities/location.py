@@ -8,12 +8,14 @@ class Location:
     name: str
     resources: list[str]
     connections: dict[Direction, str]  # Direction -> Location name
+    connection_costs: dict[Direction, int]  # Direction -> travel cost, only when not 1
 
     def __init__(self, name: str, resources: Optional[list[str]] = None) -> None:
         """Initialize a location with a name and optional resources."""
         self.name = name
         self.resources = resources or []
         self.connections = {}
+        self.connection_costs = {}
 
     def add_resource(self, resource: str) -> None:
         """Add a resource to the location if it doesn't already exist."""
@@ -25,16 +27,26 @@ class Location:
         if resource in self.resources:
             self.resources.remove(resource)
 
-    def add_connection(self, direction: Direction, target_location: str) -> None:
-        """Add a directional connection to another location."""
+    def add_connection(self, direction: Direction, target_location: str, cost: int = 1) -> None:
+        """Add a directional connection to another location with an optional travel cost."""
         if not direction or not target_location:
             raise ValueError("Direction and target location must be provided")
+        if isinstance(cost, bool) or not isinstance(cost, int) or cost < 1:
+            raise ValueError("Travel cost must be a positive integer")
         self.connections[direction] = target_location
+        if cost == 1:
+            self.connection_costs.pop(direction, None)
+        else:
+            self.connection_costs[direction] = cost
 
     def get_connection(self, direction: Direction) -> Optional[str]:
         """Get the connected location in the specified direction."""
         return self.connections.get(direction)
 
+    def get_connection_cost(self, direction: Direction) -> int:
+        """Get the travel cost of the connection in the specified direction."""
+        return self.connection_costs.get(direction, 1)
+
     def has_resource(self, resource: str) -> bool:
         """Check if the location has a specific resource."""
         return resource in self.resources
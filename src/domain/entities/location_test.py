@@ -88,6 +88,25 @@ class TestLocation:
         with pytest.raises(ValueError):
             forest.add_connection(None, "Beach")  # type: ignore
 
+    def test_connection_cost(self, forest: Location) -> None:
+        """Test storing travel costs on connections."""
+        forest.add_connection(Direction.SOUTH, "Beach")
+        forest.add_connection(Direction.EAST, "River", 3)
+        assert forest.get_connection_cost(Direction.SOUTH) == 1
+        assert forest.get_connection_cost(Direction.EAST) == 3
+        assert forest.connection_costs == {Direction.EAST: 3}
+
+        # Resetting to the default cost drops the stored value
+        forest.add_connection(Direction.EAST, "River")
+        assert forest.connection_costs == {}
+
+    def test_invalid_connection_cost(self, forest: Location) -> None:
+        """Test that travel costs must be positive integers."""
+        for cost in [0, -2, 1.5, True]:
+            with pytest.raises(ValueError):
+                forest.add_connection(Direction.EAST, "River", cost)  # type: ignore
+        assert forest.connections == {}
+
     def test_connection_overwrite(self, forest: Location) -> None:
         """Test that connections can be overwritten."""
         forest.add_connection(Direction.SOUTH, "Beach")
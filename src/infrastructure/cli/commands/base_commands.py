@@ -1,8 +1,11 @@
-from typing import Optional, Protocol, Any
+from typing import Optional, Protocol, Any, Callable
 from colorama import Fore, Style
 from src.domain.entities.direction import Direction
 from src.application.game_map_service import GameMapService
 
+# Most names offered for one tab completion
+COMPLETION_LIMIT = 200
+
 class BaseCommands(Protocol):
     """Protocol defining base functionality for CLI commands."""
     game_map: GameMapService
@@ -51,6 +54,52 @@ class CommandMixin:
             return []
         return [r.strip() for r in resources_str.split(",") if r.strip()]
 
+    def pop_option(self, arg: str, option: str) -> tuple[str, Optional[str]]:
+        """Remove an option and its value from the arguments.
+
+        Returns the remaining arguments and the option value, or None when
+        the option is absent. A missing value is returned as an empty string.
+        """
+        parts = arg.split()
+        if option not in parts:
+            return arg, None
+        index = parts.index(option)
+        value = parts[index + 1] if index + 1 < len(parts) else ""
+        del parts[index:index + 2]
+        return " ".join(parts), value
+
+    def pop_flag(self, arg: str, flag: str) -> tuple[str, bool]:
+        """Remove a flag from the arguments, returning whether it was given."""
+        parts = arg.split()
+        if flag not in parts:
+            return arg, False
+        parts.remove(flag)
+        return " ".join(parts), True
+
+    def parse_avoid(self, avoid_str: str) -> tuple[list[str], list[tuple[str, str]]]:
+        """Split an --avoid list into locations and A:B connections."""
+        locations = []
+        edges = []
+        for item in self.parse_resources(avoid_str):
+            if ":" in item:
+                a, _, b = item.partition(":")
+                edges.append((a.strip(), b.strip()))
+            else:
+                locations.append(item)
+        return locations, edges
+
+    def avoid_kwargs(self, avoid_str: Optional[str]) -> dict[str, Any]:
+        """Build the avoid_locations/avoid_edges arguments for a search."""
+        if not avoid_str:
+            return {}
+        locations, edges = self.parse_avoid(avoid_str)
+        kwargs: dict[str, Any] = {}
+        if locations:
+            kwargs["avoid_locations"] = locations
+        if edges:
+            kwargs["avoid_edges"] = edges
+        return kwargs
+
     def show_location_info(self, name: str) -> None:
         """Display information about a location."""
         try:
@@ -58,11 +107,46 @@ class CommandMixin:
             print(f"\n{Fore.CYAN}Location: {info['name']}{Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Resources: {', '.join(info['resources']) or 'None'}")
             print(f"Connections:")
+            costs = info.get('costs', {})
             for direction, target in info['connections'].items():
-                print(f"  {direction}: {target}{Style.RESET_ALL}")
+                cost = f" (cost {costs[direction]})" if direction in costs else ""
+                print(f"  {direction}: {target}{cost}{Style.RESET_ALL}")
         except ValueError as e:
             self.error(str(e))
 
+    def argument_index(self, line: str, begidx: int) -> int:
+        """Get the position of the argument being completed, 0 for the first one."""
+        return len(line[:begidx].split()) - 1
+
+    def previous_word(self, line: str, begidx: int) -> str:
+        """Get the word before the one being completed."""
+        words = line[:begidx].split()
+        return words[-1] if words else ""
+
+    def complete_items(self, text: str, complete: Callable[[str], list[str]]) -> list[str]:
+        """Complete the last item of a comma-separated list."""
+        head, separator, tail = text.rpartition(",")
+        return [head + separator + name for name in complete(tail)]
+
+    def location_completions(self, text: str) -> list[str]:
+        """Get the location names starting with text."""
+        return self.game_map.complete_locations(text, COMPLETION_LIMIT)
+
+    def resource_completions(self, text: str) -> list[str]:
+        """Get the resource names starting with text."""
+        return self.game_map.complete_resources(text, COMPLETION_LIMIT)
+
+    def direction_completions(self, text: str) -> list[str]:
+        """Get the directions starting with text."""
+        return [d.value for d in Direction if d.value.startswith(text.lower())]
+
+    def did_you_mean(self, suggestions: list[str]) -> str:
+        """Format close names as a hint to append to a not-found message."""
+        suggestions = list(suggestions)
+        if not suggestions:
+            return ""
+        return f" Did you mean: {', '.join(suggestions)}?"
+
     def require_current_location(self) -> bool:
         """Check if there is a current location set."""
         if not self.game_map.get_current_location():
@@ -87,3 +87,21 @@ class TestCommandMixin:
         assert "Success message" in captured.out
         assert "Info message" in captured.out
         assert "Warning message" in captured.out
+
+    def test_pop_flag(self, command_mixin):
+        """Test removing a value-less flag from the arguments."""
+        assert command_mixin.pop_flag("wood,stone --return", "--return") == ("wood,stone", True)
+        assert command_mixin.pop_flag("wood,stone", "--return") == ("wood,stone", False)
+
+    def test_did_you_mean(self, command_mixin):
+        """Test formatting name suggestions."""
+        assert command_mixin.did_you_mean(["Forest", "Forge"]) == " Did you mean: Forest, Forge?"
+        assert command_mixin.did_you_mean([]) == ""
+
+    def test_completion_helpers(self, command_mixin):
+        """Test argument positions, list items and direction completions."""
+        assert command_mixin.argument_index("goto ", 5) == 0
+        assert command_mixin.argument_index("add_connection Forest Be", 22) == 1
+        assert command_mixin.previous_word("path Lake --avoid Ca", 18) == "--avoid"
+        assert command_mixin.complete_items("wood,mu", lambda text: [text + "shrooms"]) == ["wood,mushrooms"]
+        assert command_mixin.direction_completions("S") == ["south"]
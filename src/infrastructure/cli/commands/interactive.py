@@ -1,7 +1,7 @@
 """Interactive prompting utilities for CLI commands."""
-from typing import Optional, TypeVar, Sequence, Any, Callable
-from difflib import get_close_matches
+from typing import Optional, TypeVar, Sequence, Any, Callable, Union
 from colorama import Fore, Style
+from ....application.indexes.trigram_index import TrigramIndex
 
 T = TypeVar('T')
 
@@ -16,18 +16,36 @@ class InteractivePrompt:
         return "\n".join(f"{i+1}. {formatter(item)}" for i, item in enumerate(items))
 
     @staticmethod
-    def get_close_matches(word: str, possibilities: list[str], n: int = 3, cutoff: float = 0.6) -> list[str]:
-        """Get list of close matches for a word."""
-        return get_close_matches(word.lower(), [p.lower() for p in possibilities], n=n, cutoff=cutoff)
+    def get_close_matches(
+        word: str,
+        possibilities: Union[list[str], TrigramIndex],
+        n: int = 3,
+        cutoff: float = 0.6
+    ) -> list[str]:
+        """Get list of close matches for a word, ignoring case.
+
+        Pass a prebuilt TrigramIndex to avoid indexing the possibilities on
+        every call.
+        """
+        if not isinstance(possibilities, TrigramIndex):
+            possibilities = TrigramIndex(possibilities)
+        return possibilities.search(word, n=n, cutoff=cutoff)
 
     @staticmethod
     def prompt_selection(
         items: Sequence[T],
         prompt: str,
         formatter: Optional[Callable[[T], str]] = None,
-        error_handler: Optional[Callable[[str], None]] = None
+        error_handler: Optional[Callable[[str], None]] = None,
+        index: Optional[TrigramIndex] = None
     ) -> Optional[T]:
-        """Prompt user to select from a list of items."""
+        """Prompt user to select from a list of items.
+
+        Misspelled names are matched against index, a TrigramIndex of the
+        item names maintained by the caller; suggestions it holds that are
+        not among the items are skipped. Without one, the item names are
+        indexed on the first miss.
+        """
         if not items:
             if error_handler:
                 error_handler("No items available")
@@ -41,6 +59,11 @@ class InteractivePrompt:
         for i, item in enumerate(items):
             print(f"{Fore.GREEN}{i+1}. {formatter(item)}{Style.RESET_ALL}")
 
+        names = [formatter(item) for item in items]
+        positions: dict[str, int] = {}
+        for i, name in enumerate(names):
+            positions.setdefault(name.lower(), i)
+
         while True:
             try:
                 choice = input(f"\n{prompt} (Enter number, name, or press Enter to cancel): ").strip()
@@ -50,21 +73,25 @@ class InteractivePrompt:
 
                 # Try as number first
                 try:
-                    index = int(choice) - 1
-                    if 0 <= index < len(items):
-                        return items[index]
+                    index_choice = int(choice) - 1
+                    if 0 <= index_choice < len(items):
+                        return items[index_choice]
                     raise ValueError("Invalid number")
                 except ValueError:
                     # Try as name
                     lower_choice = choice.lower()
-                    lower_names = [formatter(item).lower() for item in items]
-                    
+
                     # Exact match
-                    if lower_choice in lower_names:
-                        return items[lower_names.index(lower_choice)]
-                    
+                    if lower_choice in positions:
+                        return items[positions[lower_choice]]
+
                     # Close matches
-                    close_matches = get_close_matches(lower_choice, lower_names, n=3, cutoff=0.6)
+                    if index is None:
+                        index = TrigramIndex(names)
+                    close_matches = [
+                        match for match in index.search(choice, n=3 + max(0, len(index) - len(names)))
+                        if match.lower() in positions
+                    ][:3]
                     if close_matches:
                         print(f"\n{Fore.YELLOW}Did you mean:{Style.RESET_ALL}")
                         for i, match in enumerate(close_matches):
@@ -72,10 +99,9 @@ class InteractivePrompt:
                         
                         sub_choice = input("\nEnter number or press Enter to try again: ").strip()
                         if sub_choice.isdigit():
-                            index = int(sub_choice) - 1
-                            if 0 <= index < len(close_matches):
-                                match_index = lower_names.index(close_matches[index])
-                                return items[match_index]
+                            match_choice = int(sub_choice) - 1
+                            if 0 <= match_choice < len(close_matches):
+                                return items[positions[close_matches[match_choice].lower()]]
 
                 if error_handler:
                     error_handler(f"Invalid selection: {choice}")
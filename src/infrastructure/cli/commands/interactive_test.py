@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch
 from src.infrastructure.cli.commands.interactive import InteractivePrompt
+from src.application.indexes.trigram_index import TrigramIndex
 
 class TestInteractivePrompt:
     """Test cases for InteractivePrompt class."""
@@ -86,6 +87,20 @@ class TestInteractivePrompt:
         )
         assert result == "forest"
 
+    @patch('builtins.input')
+    def test_prompt_selection_with_index(self, mock_input) -> None:
+        """Test fuzzy matching through a prebuilt index holding more names than the items."""
+        index = TrigramIndex(["Forest", "Forests", "Beach", "Mountain"])
+        mock_input.side_effect = ["forsts", "1"]
+
+        result = InteractivePrompt.prompt_selection(
+            ["Forest", "Beach", "Mountain"],
+            "Select location",
+            error_handler=lambda msg: None,
+            index=index
+        )
+        assert result == "Forest"
+
     @patch('builtins.input')
     def test_prompt_selection_cancel(self, mock_input) -> None:
         """Test cancelling selection."""
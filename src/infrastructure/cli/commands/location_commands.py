@@ -26,8 +26,10 @@ class LocationCommands(CommandMixin):
             self.error(str(e))
 
     def do_add_connection(self, arg: str) -> None:
-        """Add a connection between locations: add_connection <from_loc> <to_loc> <direction>
-        Example: add_connection Forest Beach south"""
+        """Add a connection between locations: add_connection <from_loc> <to_loc> <direction> [cost]
+        Example: add_connection Forest Beach south
+        Example: add_connection Forest River east 3"""
+        cost: Optional[int] = None
         if not arg:
             # Interactive mode
             locations = list(self.game_map.list_locations().keys())
@@ -39,7 +41,8 @@ class LocationCommands(CommandMixin):
             from_loc = InteractivePrompt.prompt_selection(
                 locations,
                 "Select source location",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.location_names
             )
             if not from_loc:
                 return
@@ -54,7 +57,8 @@ class LocationCommands(CommandMixin):
             to_loc = InteractivePrompt.prompt_selection(
                 to_locations,
                 "Select destination location",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.location_names
             )
             if not to_loc:
                 return
@@ -70,17 +74,32 @@ class LocationCommands(CommandMixin):
                 return
         else:
             # Argument-based mode
-            parts = self.require_args(arg, 3, "add_connection <from_loc> <to_loc> <direction>")
-            if not parts:
+            parts = arg.split()
+            if len(parts) not in (3, 4) or (len(parts) == 4 and not parts[3].isdigit()):
+                self.error("Required format: add_connection <from_loc> <to_loc> <direction> [cost]")
                 return
-            from_loc, to_loc, direction_str = parts
+            from_loc, to_loc, direction_str = parts[:3]
+            if len(parts) == 4:
+                cost = int(parts[3])
 
         try:
-            self.game_map.add_connection(from_loc, to_loc, direction_str)
+            if cost is None:
+                self.game_map.add_connection(from_loc, to_loc, direction_str)
+            else:
+                self.game_map.add_connection(from_loc, to_loc, direction_str, cost)
             self.success(f"Connection added from '{from_loc}' to '{to_loc}' in direction '{direction_str}'")
         except (ValueError, KeyError) as e:
             self.error(str(e))
 
+    def complete_add_connection(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the two locations, then the direction."""
+        position = self.argument_index(line, begidx)
+        if position in (0, 1):
+            return self.location_completions(text)
+        if position == 2:
+            return self.direction_completions(text)
+        return []
+
     def do_goto(self, arg: str) -> None:
         """Set current location: goto <location_name>
         Example: goto Forest"""
@@ -89,21 +108,36 @@ class LocationCommands(CommandMixin):
             location_name = InteractivePrompt.prompt_selection(
                 locations,
                 "Go to location",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.location_names
             )
             if not location_name:
                 return
         else:
             location_name = arg
+            if self.game_map.get_location(location_name) is None:
+                self.error(
+                    f"Location '{location_name}' not found."
+                    + self.did_you_mean(self.game_map.suggest_locations(location_name))
+                )
+                return
         try:
             self.game_map.set_current_location(location_name)
             self.do_look("")
         except ValueError as e:
             self.error(str(e))
 
-    def do_look(self, _: str) -> None:
-        """Show information about current location
-        Example: look"""
+    def complete_goto(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the location to go to."""
+        return self.location_completions(text) if self.argument_index(line, begidx) == 0 else []
+
+    def do_look(self, arg: str) -> None:
+        """Show information about current location, or another one by name
+        Example: look
+        Example: look Forest"""
+        if arg:
+            self.show_location_info(arg)
+            return
         current = cast(str, self.game_map.get_current_location())
         if not current:
             self.warning("You are not at any location. Use 'goto' to set your location.")
@@ -111,6 +145,10 @@ class LocationCommands(CommandMixin):
         
         self.show_location_info(current)
 
+    def complete_look(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the location to look at."""
+        return self.location_completions(text) if self.argument_index(line, begidx) == 0 else []
+
     def do_list_locations(self, _: str) -> None:
         """List all available locations and their resources
         Example: list_locations"""
@@ -127,13 +165,34 @@ class LocationCommands(CommandMixin):
             for direction, target in location.connections.items():
                 print(f"  {direction.value}: {target}{Style.RESET_ALL}")
 
+    def do_components(self, _: str) -> None:
+        """List the connected regions of the map
+        Example: components"""
+        components = self.game_map.get_components()
+        if not components:
+            self.warning("No locations available")
+            return
+
+        current = self.game_map.get_current_location()
+        self.info(f"Map has {len(components)} connected region(s):")
+        for i, names in enumerate(components):
+            marker = " (current)" if current in names else ""
+            shown = ", ".join(names[:10])
+            if len(names) > 10:
+                shown += f", ... ({len(names) - 10} more)"
+            self.success(f"{i+1}. {len(names)} location(s){marker}: {shown}")
+
     def do_path(self, arg: str) -> None:
         """Find path between current location and target location
-        Example: path Mountain"""
+        Use --avoid to route around locations or A:B connections
+        Example: path Mountain
+        Example: path Lake --avoid Cave,Forest:Mountain"""
         if not self.require_current_location():
             return
 
-        if not self.require_current_location():
+        arg, avoid = self.pop_option(arg, "--avoid")
+        if avoid == "":
+            self.error("Required format: path <location> [--avoid A,B,C:D]")
             return
 
         current = cast(str, self.game_map.get_current_location())
@@ -144,15 +203,24 @@ class LocationCommands(CommandMixin):
             destination = InteractivePrompt.prompt_selection(
                 locations,
                 "Find path to",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.location_names
             )
             if not destination:
                 return
         else:
             destination = arg
-        
+            if self.game_map.get_location(destination) is None:
+                self.error(
+                    f"Location '{destination}' not found."
+                    + self.did_you_mean(self.game_map.suggest_locations(destination))
+                )
+                return
+
         try:
-            path = self.game_map.resource_management.find_path(current, destination)
+            path = self.game_map.resource_management.find_path(
+                current, destination, **self.avoid_kwargs(avoid)
+            )
             if not path:
                 self.warning(f"No path found to {destination}")
                 return
@@ -162,3 +230,39 @@ class LocationCommands(CommandMixin):
             self.info("Directions: " + self.format_directions(path))
         except ValueError as e:
             self.error(str(e))
+
+    def complete_path(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the destination, or the locations after --avoid."""
+        if self.previous_word(line, begidx) == "--avoid":
+            return self.complete_items(text, self.location_completions)
+        return self.location_completions(text) if self.argument_index(line, begidx) == 0 else []
+
+    def do_paths(self, arg: str) -> None:
+        """Find paths from current location to several destinations at once
+        Example: paths Mountain,Lake,Cave"""
+        if not self.require_current_location():
+            return
+
+        destinations = self.parse_resources(arg)
+        if not destinations:
+            self.error("Required format: paths <dest1,dest2,...>")
+            return
+
+        try:
+            paths = self.game_map.find_paths_to_locations(destinations)
+        except ValueError as e:
+            self.error(str(e))
+            return
+
+        for destination in destinations:
+            path = paths.get(destination)
+            if path is None:
+                self.warning(f"{destination}: no path found")
+            else:
+                self.success(f"{destination}: {len(path)} steps")
+                if path:
+                    self.info("  Directions: " + self.format_directions(path))
+
+    def complete_paths(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the last of the comma-separated destinations."""
+        return self.complete_items(text, self.location_completions) if self.argument_index(line, begidx) == 0 else []
@@ -109,6 +109,30 @@ class TestLocationCommands:
         captured = capsys.readouterr()
         assert "Connection added from 'Forest' to 'Beach' in direction 'south'" in captured.out
 
+    def test_add_connection_with_cost(self, location_commands, capsys):
+        """Test connection addition with a travel cost."""
+        location_commands.do_add_connection("Forest River east 3")
+
+        location_commands.game_map.add_connection.assert_called_with("Forest", "River", "east", 3)
+        captured = capsys.readouterr()
+        assert "Connection added from 'Forest' to 'River'" in captured.out
+
+    def test_add_connection_with_default_cost(self, location_commands, capsys):
+        """Test that a cost given explicitly is passed on even when it is the default."""
+        location_commands.do_add_connection("Forest Beach south 1")
+
+        location_commands.game_map.add_connection.assert_called_with("Forest", "Beach", "south", 1)
+        captured = capsys.readouterr()
+        assert "Connection added from 'Forest' to 'Beach'" in captured.out
+
+    def test_add_connection_invalid_cost(self, location_commands, capsys):
+        """Test connection addition with a malformed cost."""
+        location_commands.do_add_connection("Forest River east far")
+
+        location_commands.game_map.add_connection.assert_not_called()
+        captured = capsys.readouterr()
+        assert "Required format: add_connection" in captured.out
+
     def test_add_connection_error(self, location_commands, capsys):
         """Test connection addition with error."""
         location_commands.game_map.add_connection.side_effect = ValueError("Invalid location")
@@ -166,6 +190,54 @@ class TestLocationCommands:
         assert "Forest:" in captured.out
         assert "Resources: wood" in captured.out
 
+    def test_goto_unknown_location(self, location_commands, capsys):
+        """Test that goto suggests close names for an unknown location."""
+        location_commands.game_map.get_location.return_value = None
+        location_commands.game_map.suggest_locations.return_value = ["Forest"]
+
+        location_commands.do_goto("Forst")
+
+        location_commands.game_map.suggest_locations.assert_called_with("Forst")
+        location_commands.game_map.set_current_location.assert_not_called()
+        captured = capsys.readouterr()
+        assert "Location 'Forst' not found. Did you mean: Forest?" in captured.out
+
+    def test_path_unknown_location(self, location_commands, capsys):
+        """Test that path suggests close names for an unknown destination."""
+        location_commands.game_map.get_current_location.return_value = "Forest"
+        location_commands.game_map.get_location.return_value = None
+        location_commands.game_map.suggest_locations.return_value = []
+
+        location_commands.do_path("Atlantis")
+
+        location_commands.game_map.resource_management.find_path.assert_not_called()
+        captured = capsys.readouterr()
+        assert "Location 'Atlantis' not found." in captured.out
+        assert "Did you mean" not in captured.out
+
+    def test_look_named_location(self, location_commands, capsys):
+        """Test looking at a location other than the current one."""
+        location_commands.game_map.get_location_info.return_value = {
+            "name": "Beach", "resources": ["sand"], "connections": {}
+        }
+        location_commands.do_look("Beach")
+        location_commands.game_map.get_location_info.assert_called_with("Beach")
+        assert "Location: Beach" in capsys.readouterr().out
+
+    def test_complete_locations(self, location_commands):
+        """Test completing locations and directions by argument position."""
+        location_commands.game_map.complete_locations.side_effect = lambda text, limit: [
+            name for name in ["Beach", "Forest", "Forge"] if name.lower().startswith(text.lower())
+        ]
+        assert location_commands.complete_goto("Fo", "goto Fo", 5, 7) == ["Forest", "Forge"]
+        assert location_commands.complete_look("", "look ", 5, 5) == ["Beach", "Forest", "Forge"]
+        assert location_commands.complete_add_connection("b", "add_connection Forest b", 22, 23) == ["Beach"]
+        assert location_commands.complete_add_connection("we", "add_connection Forest Beach we", 28, 30) == ["west"]
+        assert location_commands.complete_add_connection("", "add_connection Forest Beach west ", 33, 33) == []
+        assert location_commands.complete_path("Be", "path Lake --avoid Be", 18, 20) == ["Beach"]
+        assert location_commands.complete_path("Be", "path Lake Be", 10, 12) == []
+        assert location_commands.complete_paths("Beach,F", "paths Beach,F", 6, 13) == ["Beach,Forest", "Beach,Forge"]
+
     def test_path_success(self, location_commands, capsys):
         """Test successful path finding."""
         location_commands.game_map.get_current_location.return_value = "Forest"
@@ -177,6 +249,29 @@ class TestLocationCommands:
         assert "Steps: 2" in captured.out
         assert "north → east" in captured.out
 
+    def test_path_avoid(self, location_commands, capsys):
+        """Test path finding with an avoid-list of locations and connections."""
+        location_commands.game_map.get_current_location.return_value = "Forest"
+        location_commands.game_map.resource_management.find_path.return_value = [Direction.WEST]
+
+        location_commands.do_path("Lake --avoid Cave,Hill:Mountain")
+
+        location_commands.game_map.resource_management.find_path.assert_called_with(
+            "Forest", "Lake", avoid_locations=["Cave"], avoid_edges=[("Hill", "Mountain")]
+        )
+        captured = capsys.readouterr()
+        assert "Steps: 1" in captured.out
+
+    def test_path_avoid_missing_value(self, location_commands, capsys):
+        """Test that --avoid requires a list."""
+        location_commands.game_map.get_current_location.return_value = "Forest"
+
+        location_commands.do_path("Lake --avoid")
+
+        captured = capsys.readouterr()
+        assert "Required format: path <location> [--avoid A,B,C:D]" in captured.out
+        location_commands.game_map.resource_management.find_path.assert_not_called()
+
     def test_path_not_found(self, location_commands, capsys):
         """Test path finding when no path exists."""
         location_commands.game_map.get_current_location.return_value = "Forest"
@@ -198,3 +293,49 @@ class TestLocationCommands:
         
         mock_prompt.assert_called_once()
         location_commands.game_map.resource_management.find_path.assert_called_with("Forest", "Mountain")
+
+    def test_paths_success(self, location_commands, capsys):
+        """Test finding paths to several destinations."""
+        location_commands.game_map.get_current_location.return_value = "Forest"
+        location_commands.game_map.find_paths_to_locations.return_value = {
+            "Mountain": [Direction.SOUTH, Direction.EAST],
+            "Lake": None
+        }
+
+        location_commands.do_paths("Mountain, Lake")
+
+        location_commands.game_map.find_paths_to_locations.assert_called_with(["Mountain", "Lake"])
+        captured = capsys.readouterr()
+        assert "Mountain: 2 steps" in captured.out
+        assert "south → east" in captured.out
+        assert "Lake: no path found" in captured.out
+
+    def test_paths_no_destinations(self, location_commands, capsys):
+        """Test paths command without destinations."""
+        location_commands.game_map.get_current_location.return_value = "Forest"
+
+        location_commands.do_paths("")
+
+        captured = capsys.readouterr()
+        assert "Required format: paths" in captured.out
+
+    def test_components(self, location_commands, capsys):
+        """Test listing connected regions."""
+        location_commands.game_map.get_current_location.return_value = "Forest"
+        location_commands.game_map.get_components.return_value = [["Forest", "Beach"], ["Island"]]
+
+        location_commands.do_components("")
+
+        captured = capsys.readouterr()
+        assert "Map has 2 connected region(s):" in captured.out
+        assert "1. 2 location(s) (current): Forest, Beach" in captured.out
+        assert "2. 1 location(s): Island" in captured.out
+
+    def test_components_empty(self, location_commands, capsys):
+        """Test listing regions of an empty map."""
+        location_commands.game_map.get_components.return_value = []
+
+        location_commands.do_components("")
+
+        captured = capsys.readouterr()
+        assert "No locations available" in captured.out
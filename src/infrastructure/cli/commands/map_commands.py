@@ -42,6 +42,22 @@ class MapCommands(CommandMixin):
             self.error(f"Failed to load map: {str(e)}")
             self.do_list_maps("")
 
+    def complete_save(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the map file to save to."""
+        return self.map_completions(text) if self.argument_index(line, begidx) == 0 else []
+
+    def complete_load(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the map file to load."""
+        return self.map_completions(text) if self.argument_index(line, begidx) == 0 else []
+
+    def map_completions(self, text: str) -> list[str]:
+        """Get the map filenames starting with text."""
+        try:
+            map_files = self.game_map.get_available_maps()
+        except OSError:
+            return []
+        return sorted(filename for filename, _, _ in map_files if filename.startswith(text))
+
     def do_list_maps(self, _: str) -> None:
         """List all available map files that can be loaded
         Example: list_maps"""
@@ -102,20 +118,30 @@ class MapCommands(CommandMixin):
     def help_navigation(self) -> None:
         self.info("\nNavigation Commands:")
         self.success("goto <location> - Move to a specific location")
-        self.success("look          - Show information about current location")
+        self.success("look [loc]    - Show information about current or named location")
         self.success("path <dest>   - Find path to target location")
+        self.success("path <dest> --avoid A,B:C - Find path avoiding locations or connections")
+        self.success("paths <d1,d2> - Find paths to several locations at once")
         self.success("nearest <res> - Find nearest location with specified resource")
+        self.success("nearest <res> --k N - List the N nearest locations with resource")
+        self.success("nearest <res> --avoid A,B:C - Find nearest resource avoiding locations")
 
     def help_locations(self) -> None:
         self.info("\nLocation Management Commands:")
         self.success("add_location <name> [res1,res2,...] - Create a new location")
-        self.success("add_connection <from> <to> <dir>    - Connect two locations")
+        self.success("add_connection <from> <to> <dir> [cost] - Connect two locations")
         self.success("list_locations                      - Show all locations")
+        self.success("components                          - Show connected regions of the map")
 
     def help_resources(self) -> None:
         self.info("\nResource Management Commands:")
         self.success("add_resource <loc> <res1,res2,...> - Add resources to location")
         self.success("find <resource>                    - Find resource locations")
+        self.success("query <res,...> [--any ...] [--none ...] - Find locations by the resources they hold")
+        self.success("search <query>                     - Query e.g. iron and water within 6 of Camp limit 5")
+        self.success("nearby <N>                         - List locations and resources within N steps")
+        self.success("plan <res1,res2,...> [--return]    - Plan a route collecting several resources")
+        self.success("forage <N> [--value res=w,...]     - Plan a round trip of N steps collecting the most")
         self.success("list_resources                     - Show all resources")
 
     def help_maps(self) -> None:
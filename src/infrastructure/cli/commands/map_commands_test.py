@@ -115,3 +115,13 @@ class TestMapCommands:
         map_commands.do_help("invalid_command")
         captured = capsys.readouterr()
         assert "No help available" in captured.out
+
+    def test_complete_map_filenames(self, map_commands):
+        """Test completing map filenames for load and save."""
+        map_commands.game_map.get_available_maps.return_value = [
+            ("world.json", 1.0, "2024-01-01"),
+            ("example_map.json", 2.0, "2024-01-01")
+        ]
+        assert map_commands.complete_load("ex", "load ex", 5, 7) == ["example_map.json"]
+        assert map_commands.complete_save("", "save ", 5, 5) == ["example_map.json", "world.json"]
+        assert map_commands.complete_load("", "load world.json ", 16, 16) == []
@@ -3,17 +3,14 @@ from colorama import Fore, Style
 from .base_commands import CommandMixin, BaseCommands
 from .interactive import InteractivePrompt
 from ....domain.entities.direction import Direction
+from ....application.usecases.resource_query import parse_query, INDEX
 
 class ResourceCommands(CommandMixin):
     """Commands for managing and finding resources."""
 
     def _get_all_resources(self) -> list[str]:
         """Get all unique resources from all locations."""
-        return sorted(set(
-            resource
-            for location in self.game_map.list_locations().values()
-            for resource in location.resources
-        ))
+        return list(self.game_map.list_resources())
 
     def do_add_resource(self, arg: str) -> None:
         """Add resources to an existing location: add_resource <location> <resource1,resource2,...>
@@ -28,7 +25,8 @@ class ResourceCommands(CommandMixin):
             location_name = InteractivePrompt.prompt_selection(
                 locations,
                 "Select location",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.location_names
             )
             if not location_name:
                 return
@@ -56,6 +54,15 @@ class ResourceCommands(CommandMixin):
         except ValueError as e:
             self.error(str(e))
 
+    def complete_add_resource(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the location, then the comma-separated resources."""
+        position = self.argument_index(line, begidx)
+        if position == 0:
+            return self.location_completions(text)
+        if position == 1:
+            return self.complete_items(text, self.resource_completions)
+        return []
+
     def do_find(self, arg: str) -> None:
         """Find all locations containing a specific resource
         Example: find wood"""
@@ -64,7 +71,8 @@ class ResourceCommands(CommandMixin):
             resource = InteractivePrompt.prompt_selection(
                 resources,
                 "Find resource",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.resource_names
             )
             if not resource:
                 return
@@ -73,31 +81,107 @@ class ResourceCommands(CommandMixin):
             
         locations = self.game_map.resource_management.find_resource(resource)
         if not locations:
-            self.warning(f"Resource '{resource}' not found in any location")
+            self.warning(
+                f"Resource '{resource}' not found in any location."
+                + self.did_you_mean(self.game_map.suggest_resources(resource))
+            )
             return
 
         self.success(f"Found '{resource}' in: {', '.join(locations)}")
 
+    def complete_find(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the resource to find."""
+        return self.resource_completions(text) if self.argument_index(line, begidx) == 0 else []
+
+    def do_query(self, arg: str) -> None:
+        """Find locations by the resources they hold
+        Use --any to require at least one of several resources
+        Use --none to exclude locations holding any of several resources
+        Example: query iron,water
+        Example: query iron --any wood,stone --none lava"""
+        arg, any_str = self.pop_option(arg, "--any")
+        arg, none_str = self.pop_option(arg, "--none")
+        all_of = self.parse_resources(arg)
+        any_of = self.parse_resources(any_str or "")
+        none_of = self.parse_resources(none_str or "")
+        if any_str == "" or none_str == "" or len(arg.split()) > 1 or not (all_of or any_of):
+            self.error("Required format: query <res1,res2,...> [--any res1,res2,...] [--none res1,res2,...]")
+            return
+
+        locations = self.game_map.resource_management.find_locations_matching(all_of, any_of, none_of)
+        if not locations:
+            self.warning("No location matches the query")
+            return
+
+        self.success(f"Found {len(locations)} locations: {', '.join(locations)}")
+
+    def do_search(self, arg: str) -> None:
+        """Search locations with a query: <resources> [within N [of location]] [order by distance|name] [limit K]
+        Resources combine with and, or and not; distances default to the current location
+        Example: search iron and water within 6 of Camp order by distance limit 5
+        Example: search wood or stone and not lava order by name"""
+        try:
+            query = parse_query(arg)
+            plan = self.game_map.plan_query(query)
+        except ValueError as e:
+            self.error(str(e))
+            return
+
+        if plan.strategy == INDEX:
+            self.info(f"Reading the resource index (about {plan.estimated_matches} matches)")
+        else:
+            self.info(f"Searching outward from {plan.origin} (about {int(plan.estimated_cost)} locations)")
+        found = 0
+        for location, distance in self.game_map.resource_management.run_query(plan):
+            found += 1
+            self.success(location if distance is None else f"{location} - {distance} steps")
+        if not found:
+            self.warning("No location matches the query")
+            return
+        self.info(f"{found} locations found")
+
     def do_nearest(self, arg: str) -> None:
         """Find nearest location with specified resource and path to it
-        Example: nearest wood"""
+        Use --k N to list the N nearest locations instead
+        Use --avoid to route around locations or A:B connections
+        Example: nearest wood
+        Example: nearest wood --k 3
+        Example: nearest wood --avoid Cave,Forest:Mountain"""
         if not self.require_current_location():
             return
 
+        arg, k_value = self.pop_option(arg, "--k")
+        arg, avoid = self.pop_option(arg, "--avoid")
+        k = None
+        if k_value is not None:
+            try:
+                k = int(k_value)
+            except ValueError:
+                self.error("Required format: nearest <resource> [--k N]")
+                return
+        if avoid == "" or (k is not None and avoid):
+            self.error("Required format: nearest <resource> [--avoid A,B,C:D]")
+            return
+
         if not arg:
             resources = self._get_all_resources()
             resource = InteractivePrompt.prompt_selection(
                 resources,
                 "Find nearest resource",
-                error_handler=self.error
+                error_handler=self.error,
+                index=self.game_map.resource_names
             )
             if not resource:
                 return
         else:
             resource = arg
 
+        if k is not None:
+            self._show_k_nearest(resource, k)
+            return
+
         try:
-            result = self.game_map.find_path_to_resource(resource)
+            result = self.game_map.find_path_to_resource(resource, **self.avoid_kwargs(avoid))
             if not result:
                 self.warning(f"No location found containing '{resource}'")
                 return
@@ -114,20 +198,137 @@ class ResourceCommands(CommandMixin):
         except ValueError as e:
             self.error(str(e))
 
+    def complete_nearest(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
+        """Complete the resource, or the locations after --avoid."""
+        if self.previous_word(line, begidx) == "--avoid":
+            return self.complete_items(text, self.location_completions)
+        return self.resource_completions(text) if self.argument_index(line, begidx) == 0 else []
+
+    def _show_k_nearest(self, resource: str, k: int) -> None:
+        """Display the k nearest locations with a resource."""
+        try:
+            results = self.game_map.find_paths_to_resource(resource, k)
+        except ValueError as e:
+            self.error(str(e))
+            return
+
+        if not results:
+            self.warning(f"No location found containing '{resource}'")
+            return
+
+        self.info(f"Nearest locations with '{resource}':")
+        for i, (location, distance, path) in enumerate(results):
+            if not path:
+                self.success(f"{i+1}. {location} - current location")
+            else:
+                self.success(f"{i+1}. {location} - {distance} steps: {self.format_directions(path)}")
+
+    def do_nearby(self, arg: str) -> None:
+        """List locations within N steps of the current location, ring by ring
+        Example: nearby 3"""
+        if not self.require_current_location():
+            return
+        try:
+            max_steps = int(arg)
+        except ValueError:
+            self.error("Required format: nearby <N>")
+            return
+
+        try:
+            rings = self.game_map.find_locations_within(max_steps)
+        except ValueError as e:
+            self.error(str(e))
+            return
+
+        self.info(f"Locations within {max_steps} steps:")
+        for distance, locations, resources in rings:
+            self.success(f"{distance} steps: {', '.join(locations)}")
+            if resources:
+                self.info(f"  Resources: {', '.join(resources)}")
+
+    def do_plan(self, arg: str) -> None:
+        """Plan a short route that collects several resources
+        Use --return to come back to the current location at the end
+        Example: plan wood,stone,water
+        Example: plan wood,stone --return"""
+        if not self.require_current_location():
+            return
+        arg, return_to_start = self.pop_flag(arg, "--return")
+        resources = self.parse_resources(arg)
+        if not resources:
+            self.error("Required format: plan <resource1,resource2,...> [--return]")
+            return
+
+        try:
+            plan = self.game_map.plan_expedition(resources, return_to_start)
+        except ValueError as e:
+            self.error(str(e))
+            return
+
+        quality = "shortest" if plan.exact else "best found"
+        self.info(f"Route collecting {', '.join(resources)} ({plan.cost} steps, {quality}):")
+        self._show_legs(plan.legs)
+
+    def do_forage(self, arg: str) -> None:
+        """Plan a round trip of at most N steps that collects the most resources
+        Use --value to weigh resources; unlisted ones are then ignored
+        Example: forage 10
+        Example: forage 10 --value iron=5,wood=1"""
+        if not self.require_current_location():
+            return
+        arg, value_str = self.pop_option(arg, "--value")
+        weights: Optional[dict[str, float]] = None
+        try:
+            budget = int(arg)
+            if value_str is not None:
+                weights = {}
+                for item in self.parse_resources(value_str):
+                    resource, _, weight = item.partition("=")
+                    weights[resource.strip()] = float(weight)
+                if not weights:
+                    raise ValueError
+        except ValueError:
+            self.error("Required format: forage <N> [--value resource=weight,...]")
+            return
+
+        try:
+            plan = self.game_map.plan_forage(budget, weights)
+        except ValueError as e:
+            self.error(str(e))
+            return
+
+        collected = [resource for _, resources, _ in plan.legs for resource in resources]
+        if not collected:
+            self.warning(f"Nothing to collect within {budget} steps")
+            return
+        quality = "best possible" if plan.exact else "best found"
+        if weights is None:
+            self.info(f"Round trip collecting {len(collected)} resources in {plan.cost} steps ({quality}):")
+        else:
+            value = sum(weights[resource] for resource in collected)
+            self.info(f"Round trip worth {value:g} in {plan.cost} steps ({quality}):")
+        self._show_legs(plan.legs)
+
+    def _show_legs(self, legs: list[tuple[str, list[str], list[Direction]]]) -> None:
+        """Display the legs of a planned route."""
+        for i, (location, collected, path) in enumerate(legs):
+            if not path:
+                self.success(f"{i+1}. {location} - collect {', '.join(collected)} here")
+                continue
+            if collected:
+                gather = f" - collect {', '.join(collected)}"
+            else:
+                gather = " - back to start" if location == self.game_map.get_current_location() else ""
+            self.success(f"{i+1}. {location}{gather}: {self.format_directions(path)}")
+
     def do_list_resources(self, _: str) -> None:
         """List all resources and their locations
         Example: list_resources"""
-        resource_locations = {}
-        for location in self.game_map.list_locations().values():
-            for resource in location.resources:
-                if resource not in resource_locations:
-                    resource_locations[resource] = []
-                resource_locations[resource].append(location.name)
-
+        resource_locations = self.game_map.list_resources()
         if not resource_locations:
             self.warning("No resources available")
             return
 
         self.info("Available Resources:")
-        for resource, locations in sorted(resource_locations.items()):
+        for resource, locations in resource_locations.items():
             self.success(f"{resource}: {', '.join(locations)}")
@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 from src.infrastructure.cli.commands.resource_commands import ResourceCommands
 from src.domain.entities.direction import Direction
 from src.domain.entities.location import Location
+from src.application.usecases.resource_management import RoutePlan, ResourceRepository
+from src.application.usecases.resource_query import QueryPlan, parse_query, INDEX, TRAVERSAL
 
 class TestResourceCommands:
     @pytest.fixture
@@ -10,6 +12,8 @@ class TestResourceCommands:
         """Create ResourceCommands instance with mocked game_map."""
         commands = ResourceCommands()
         commands.game_map = MagicMock()
+        # Index whatever locations a test sets up, as the service would
+        commands.game_map.list_resources.side_effect = lambda: ResourceRepository.list_resources(commands.game_map)
         return commands
 
     @pytest.fixture
@@ -43,7 +47,8 @@ class TestResourceCommands:
         mock_prompt.assert_called_once_with(
             list(sample_locations.keys()),
             "Select location",
-            error_handler=resource_commands.error
+            error_handler=resource_commands.error,
+            index=resource_commands.game_map.location_names
         )
         
         # Verify resources were added
@@ -116,6 +121,29 @@ class TestResourceCommands:
         captured = capsys.readouterr()
         assert "not found in any location" in captured.out
 
+    def test_find_suggestions(self, resource_commands, capsys):
+        """Test that find suggests close resource names."""
+        resource_commands.game_map.resource_management.find_resource.return_value = []
+        resource_commands.game_map.suggest_resources.return_value = ["wood", "wool"]
+
+        resource_commands.do_find("wod")
+
+        captured = capsys.readouterr()
+        assert "Resource 'wod' not found in any location. Did you mean: wood, wool?" in captured.out
+
+    def test_complete_resources(self, resource_commands):
+        """Test completing locations and resources by argument position."""
+        resource_commands.game_map.complete_locations.return_value = ["Forest"]
+        resource_commands.game_map.complete_resources.side_effect = lambda text, limit: [
+            name for name in ["mushrooms", "wood", "wool"] if name.startswith(text)
+        ]
+        assert resource_commands.complete_add_resource("Fo", "add_resource Fo", 13, 15) == ["Forest"]
+        assert resource_commands.complete_add_resource("wood,m", "add_resource Forest wood,m", 20, 26) == ["wood,mushrooms"]
+        assert resource_commands.complete_find("wo", "find wo", 5, 7) == ["wood", "wool"]
+        assert resource_commands.complete_nearest("woo", "nearest woo", 8, 11) == ["wood", "wool"]
+        assert resource_commands.complete_nearest("Fo", "nearest wood --avoid Fo", 21, 23) == ["Forest"]
+        assert resource_commands.complete_nearest("3", "nearest wood --k 3", 17, 18) == []
+
     def test_nearest_success(self, resource_commands, capsys):
         """Test finding nearest resource location."""
         resource_commands.game_map.get_current_location.return_value = "Beach"
@@ -151,6 +179,184 @@ class TestResourceCommands:
         captured = capsys.readouterr()
         assert "No location found containing 'gold'" in captured.out
 
+    def test_nearest_k(self, resource_commands, capsys):
+        """Test listing the k nearest resource locations."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        resource_commands.game_map.find_paths_to_resource.return_value = [
+            ("Beach", 0, []),
+            ("Forest", 2, [Direction.NORTH, Direction.EAST])
+        ]
+
+        resource_commands.do_nearest("wood --k 2")
+
+        resource_commands.game_map.find_paths_to_resource.assert_called_with("wood", 2)
+        captured = capsys.readouterr()
+        assert "1. Beach - current location" in captured.out
+        assert "2. Forest - 2 steps: north → east" in captured.out
+
+    def test_query(self, resource_commands, capsys):
+        """Test finding locations with all, any and none of some resources."""
+        resource_commands.game_map.resource_management.find_locations_matching.return_value = ["Forest", "Mountain"]
+
+        resource_commands.do_query("wood --any berries,stone --none fish")
+
+        resource_commands.game_map.resource_management.find_locations_matching.assert_called_with(
+            ["wood"], ["berries", "stone"], ["fish"]
+        )
+        captured = capsys.readouterr()
+        assert "Found 2 locations: Forest, Mountain" in captured.out
+
+    def test_query_no_match_or_invalid(self, resource_commands, capsys):
+        """Test query with no matching location and with malformed arguments."""
+        resource_commands.game_map.resource_management.find_locations_matching.return_value = []
+        resource_commands.do_query("gold")
+        assert "No location matches the query" in capsys.readouterr().out
+
+        resource_commands.game_map.resource_management.find_locations_matching.reset_mock()
+        for arg in ["", "--none fish", "wood --any", "wood stone"]:
+            resource_commands.do_query(arg)
+            assert "Required format: query" in capsys.readouterr().out
+        resource_commands.game_map.resource_management.find_locations_matching.assert_not_called()
+
+    def test_search(self, resource_commands, capsys):
+        """Test streaming the results of a planned query."""
+        query = parse_query("iron and water within 6 of Camp limit 5")
+        resource_commands.game_map.plan_query.return_value = QueryPlan(query, "Camp", TRAVERSAL, 2, 50)
+        resource_commands.game_map.resource_management.run_query.return_value = iter([("Camp", 0), ("Mine", 4)])
+
+        resource_commands.do_search("iron and water within 6 of Camp limit 5")
+
+        resource_commands.game_map.plan_query.assert_called_with(query)
+        captured = capsys.readouterr()
+        assert "Searching outward from Camp (about 50 locations)" in captured.out
+        assert "Camp - 0 steps" in captured.out
+        assert "Mine - 4 steps" in captured.out
+        assert "2 locations found" in captured.out
+
+    def test_search_errors(self, resource_commands, capsys):
+        """Test malformed queries and queries without matches."""
+        resource_commands.do_search("iron within")
+        assert "Error: Expected a number after 'within'" in capsys.readouterr().out
+        resource_commands.game_map.plan_query.assert_not_called()
+
+        resource_commands.game_map.plan_query.return_value = QueryPlan(parse_query("gold"), None, INDEX, 0, 1)
+        resource_commands.game_map.resource_management.run_query.return_value = iter([])
+        resource_commands.do_search("gold")
+        captured = capsys.readouterr()
+        assert "Reading the resource index (about 0 matches)" in captured.out
+        assert "No location matches the query" in captured.out
+
+    def test_nearby(self, resource_commands, capsys):
+        """Test listing locations ring by ring."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        resource_commands.game_map.find_locations_within.return_value = [
+            (0, ["Beach"], ["sand"]),
+            (1, ["Forest", "Mountain"], [])
+        ]
+
+        resource_commands.do_nearby("1")
+
+        resource_commands.game_map.find_locations_within.assert_called_with(1)
+        captured = capsys.readouterr()
+        assert "Locations within 1 steps:" in captured.out
+        assert "0 steps: Beach" in captured.out
+        assert "Resources: sand" in captured.out
+        assert "1 steps: Forest, Mountain" in captured.out
+
+    def test_nearby_invalid(self, resource_commands, capsys):
+        """Test nearby with a missing or malformed radius."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+
+        resource_commands.do_nearby("far")
+
+        captured = capsys.readouterr()
+        assert "Required format: nearby <N>" in captured.out
+        resource_commands.game_map.find_locations_within.assert_not_called()
+
+    def test_plan(self, resource_commands, capsys):
+        """Test printing a planned gathering route."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        resource_commands.game_map.plan_expedition.return_value = RoutePlan(
+            [
+                ("Beach", ["sand"], []),
+                ("Forest", ["wood"], [Direction.NORTH]),
+                ("Beach", [], [Direction.SOUTH])
+            ],
+            2,
+            True
+        )
+
+        resource_commands.do_plan("sand, wood --return")
+
+        resource_commands.game_map.plan_expedition.assert_called_with(["sand", "wood"], True)
+        captured = capsys.readouterr()
+        assert "Route collecting sand, wood (2 steps, shortest):" in captured.out
+        assert "1. Beach - collect sand here" in captured.out
+        assert "2. Forest - collect wood: north" in captured.out
+        assert "3. Beach - back to start: south" in captured.out
+
+    def test_plan_errors(self, resource_commands, capsys):
+        """Test plan without resources and with an unreachable one."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        resource_commands.do_plan("--return")
+        assert "Required format: plan <resource1,resource2,...> [--return]" in capsys.readouterr().out
+
+        resource_commands.game_map.plan_expedition.side_effect = ValueError("No reachable location has gold")
+        resource_commands.do_plan("gold")
+        assert "No reachable location has gold" in capsys.readouterr().out
+
+    def test_forage(self, resource_commands, capsys):
+        """Test printing a foraging round trip, counted and weighted."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        resource_commands.game_map.plan_forage.return_value = RoutePlan(
+            [("Forest", ["wood", "berries"], [Direction.NORTH]), ("Beach", [], [Direction.SOUTH])],
+            2,
+            False
+        )
+
+        resource_commands.do_forage("4")
+        resource_commands.game_map.plan_forage.assert_called_with(4, None)
+        captured = capsys.readouterr()
+        assert "Round trip collecting 2 resources in 2 steps (best found):" in captured.out
+        assert "1. Forest - collect wood, berries: north" in captured.out
+
+        resource_commands.do_forage("4 --value wood=2.5,berries=1")
+        resource_commands.game_map.plan_forage.assert_called_with(4, {"wood": 2.5, "berries": 1.0})
+        assert "Round trip worth 3.5 in 2 steps" in capsys.readouterr().out
+
+    def test_forage_invalid(self, resource_commands, capsys):
+        """Test forage with a malformed budget or weights, and with nothing in reach."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        for arg in ["far", "4 --value wood", "4 --value"]:
+            resource_commands.do_forage(arg)
+            assert "Required format: forage <N> [--value resource=weight,...]" in capsys.readouterr().out
+        resource_commands.game_map.plan_forage.assert_not_called()
+
+        resource_commands.game_map.plan_forage.return_value = RoutePlan([], 0, True)
+        resource_commands.do_forage("1")
+        assert "Nothing to collect within 1 steps" in capsys.readouterr().out
+
+    def test_nearest_k_invalid(self, resource_commands, capsys):
+        """Test nearest with a malformed --k option."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+
+        resource_commands.do_nearest("wood --k many")
+
+        captured = capsys.readouterr()
+        assert "Required format: nearest <resource> [--k N]" in captured.out
+        resource_commands.game_map.find_paths_to_resource.assert_not_called()
+
+    def test_nearest_avoid(self, resource_commands, capsys):
+        """Test finding the nearest resource around avoided locations."""
+        resource_commands.game_map.get_current_location.return_value = "Beach"
+        resource_commands.game_map.find_path_to_resource.return_value = ("Forest", [Direction.NORTH])
+
+        resource_commands.do_nearest("wood --avoid Cave")
+
+        resource_commands.game_map.find_path_to_resource.assert_called_with("wood", avoid_locations=["Cave"])
+        captured = capsys.readouterr()
+        assert "Forest" in captured.out
+
     def test_list_resources(self, resource_commands, sample_locations, capsys):
         """Test listing all resources."""
         resource_commands.game_map.list_locations.return_value = sample_locations
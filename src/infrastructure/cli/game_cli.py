@@ -26,6 +26,14 @@ class GameCLI(cmd.Cmd, LocationCommands, ResourceCommands, MapCommands):
         self.do_list_maps("")
         self.info("Type 'load <filename>' to load a map, or start creating a new one.\n")
 
+    def preloop(self) -> None:
+        """Complete whole words, so names with dashes and comma-separated lists are kept together."""
+        try:
+            import readline
+        except ImportError:
+            return
+        readline.set_completer_delims(" \t\n")
+
     def get_prompt(self) -> str:
         """Generate the prompt string based on current location"""
         if not self.game_map.get_current_location():
@@ -55,6 +55,12 @@ class TestGameCLI:
         cli.do_save("test_map.json")
         cli.game_map.save_map_to_file.assert_called_once_with("test_map.json")
 
+    def test_integrated_completion(self, cli):
+        """Test that commands complete names from the service's prefix index."""
+        cli.game_map.complete_locations.return_value = ["Forest"]
+        assert cli.complete_goto("Fo", "goto Fo", 5, 7) == ["Forest"]
+        cli.game_map.complete_locations.assert_called_with("Fo", 200)
+
     @patch('builtins.print')
     def test_keyboard_interrupt_handling(self, mock_print):
         """Test handling of keyboard interrupt."""
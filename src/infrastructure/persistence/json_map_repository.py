@@ -13,11 +13,7 @@ class JsonMapRepository(MapRepository):
         """Save the map state to a JSON file."""
         data = {
             "locations": {
-                name: {
-                    "name": loc.name,
-                    "resources": loc.resources,
-                    "connections": {d.value: loc_name for d, loc_name in loc.connections.items()}
-                }
+                name: self._location_to_dict(loc)
                 for name, loc in locations.items()
             },
             "current_location": current_location
@@ -41,13 +37,43 @@ class JsonMapRepository(MapRepository):
         # Second pass: Set up connections
         for name, loc_data in data["locations"].items():
             location = locations[name]
+            costs = loc_data.get("costs", {})
             for direction_str, target in loc_data["connections"].items():
                 direction = Direction(direction_str)
-                location.add_connection(direction, target)
+                location.add_connection(direction, target, costs.get(direction_str, 1))
 
         current_location = data.get("current_location")
         return locations, current_location
 
+    def _location_to_dict(self, location: Location) -> dict:
+        """Convert a location to its JSON representation."""
+        data = {
+            "name": location.name,
+            "resources": location.resources,
+            "connections": {d.value: loc_name for d, loc_name in location.connections.items()}
+        }
+        # Costs are only written when set, so unweighted maps keep their format
+        if location.connection_costs:
+            data["costs"] = {d.value: cost for d, cost in location.connection_costs.items()}
+        return data
+
+    def save_sidecar(self, filename: str, suffix: str, data: bytes) -> None:
+        """Write derived data to a file beside the map, e.g. map.landmarks."""
+        with open(self.sidecar_path(filename, suffix), 'wb') as f:
+            f.write(data)
+
+    def load_sidecar(self, filename: str, suffix: str) -> Optional[bytes]:
+        """Read derived data from beside the map, if it was saved."""
+        path = self.sidecar_path(filename, suffix)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def sidecar_path(self, filename: str, suffix: str) -> str:
+        """Get the path of a sidecar file for a map."""
+        return f"{os.path.splitext(filename)[0]}.{suffix}"
+
     def list_available_maps(self) -> list[tuple[str, float, str]]:
         """List all available JSON map files in the current directory."""
         map_files = []
@@ -84,6 +84,21 @@ class TestJsonMapRepository:
         assert "sand" in beach.resources
         assert beach.get_connection(Direction.NORTH) == "Forest"
 
+    def test_connection_costs_round_trip(self, repo: JsonMapRepository, sample_locations: dict[str, Location]) -> None:
+        """Test that travel costs are saved only when set and loaded back."""
+        forest = sample_locations["Forest"]
+        forest.add_connection(Direction.EAST, "River", 4)
+        repo.save_map("costs.json", sample_locations, None)
+
+        with open("costs.json", 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert data["locations"]["Forest"]["costs"] == {"east": 4}
+        assert "costs" not in data["locations"]["Beach"]
+
+        loaded_locations, _ = repo.load_map("costs.json")
+        assert loaded_locations["Forest"].get_connection_cost(Direction.EAST) == 4
+        assert loaded_locations["Forest"].get_connection_cost(Direction.SOUTH) == 1
+
     def test_load_nonexistent_map(self, repo: JsonMapRepository) -> None:
         """Test error handling when loading non-existent file."""
         with pytest.raises(FileNotFoundError):
@@ -133,3 +148,13 @@ class TestJsonMapRepository:
         loaded_locations, loaded_current = repo.load_map(filename)
         assert loaded_current is None
         assert len(loaded_locations) == len(sample_locations)
+
+    def test_sidecar_round_trip(self, repo: JsonMapRepository, tmp_path) -> None:
+        """Test storing derived data next to a map file."""
+        assert repo.load_sidecar("test_map.json", "landmarks") is None
+
+        repo.save_sidecar("test_map.json", "landmarks", b"\x00\x01data")
+
+        assert (tmp_path / "test_map.landmarks").read_bytes() == b"\x00\x01data"
+        assert repo.load_sidecar("test_map.json", "landmarks") == b"\x00\x01data"
+        assert all(name.endswith(".json") for name, _, _ in repo.list_available_maps())